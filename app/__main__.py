@@ -2,7 +2,18 @@ import asyncio
 from os import environ
 from aiogram import Bot, Dispatcher
 from app.config.init import initialize_app
+from app.config.webhook import run_webhook
+from app.database.pool import close_async_pool
 from app.handlers import get_router
+from app.states.storage import get_storage, start_fsm_purger, stop_fsm_purger
+from app.utils.assignment import start_question_queue, stop_question_queue
+from app.utils.client import start_client, stop_client
+from app.utils.info import load_content
+from app.utils.mailing import start_mailing_worker, stop_mailing_worker
+from app.utils.notify import start_notifications, stop_notifications
+from app.utils.participation import stop_participation_flusher
+from app.utils.ranks import start_ranks_watcher, stop_ranks_watcher
+from app.utils.users import stop_users_flusher
 
 initialize_app()
 
@@ -13,8 +24,33 @@ except KeyError:
 except Exception as e:
     raise e
 
-dp = Dispatcher()
+dp = Dispatcher(storage=get_storage())
 
 dp.include_router(get_router())
 
-asyncio.new_event_loop().run_until_complete(dp.start_polling(bot))
+dp.startup.register(start_notifications)
+dp.startup.register(start_client)
+dp.startup.register(load_content)
+dp.startup.register(start_fsm_purger)
+dp.startup.register(start_ranks_watcher)
+dp.startup.register(start_mailing_worker)
+dp.startup.register(start_question_queue)
+dp.shutdown.register(stop_question_queue)
+dp.shutdown.register(stop_mailing_worker)
+dp.shutdown.register(stop_ranks_watcher)
+dp.shutdown.register(stop_client)
+dp.shutdown.register(stop_participation_flusher)
+dp.shutdown.register(stop_users_flusher)
+dp.shutdown.register(stop_fsm_purger)
+dp.shutdown.register(close_async_pool)
+dp.shutdown.register(stop_notifications)
+
+# Режим получения обновлений: polling (по умолчанию) или webhook.
+# Несколько процессов (WORKERS) поддерживаются только в режиме webhook.
+if environ.get("BOT_MODE", "polling") == "webhook":
+    run_webhook(dp, bot)
+else:
+    loop = asyncio.new_event_loop()
+    # Telegram не отдает обновления через getUpdates, пока установлен webhook
+    loop.run_until_complete(bot.delete_webhook())
+    loop.run_until_complete(dp.start_polling(bot))
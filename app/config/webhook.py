@@ -0,0 +1,84 @@
+from os import environ
+
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+
+from app.config.workers import WORKERS, is_primary_worker, run_workers
+from app.states.storage import FSM_STORAGE
+from app.utils.notify import REDIS_URL
+
+
+# Публичный адрес бота, например https://bot.example.com
+WEBHOOK_URL = environ.get("WEBHOOK_URL", "")
+WEBHOOK_PATH = environ.get("WEBHOOK_PATH", "/webhook")
+# Секрет, который Telegram присылает в заголовке X-Telegram-Bot-Api-Secret-Token
+WEBHOOK_SECRET = environ.get("WEBHOOK_SECRET") or None
+WEBAPP_HOST = environ.get("WEBAPP_HOST", "0.0.0.0")  # Адрес, который слушает сервер
+WEBAPP_PORT = int(environ.get("WEBAPP_PORT", 8080))
+# Обрабатывать обновления в фоне и сразу отвечать Telegram
+WEBHOOK_BACKGROUND = environ.get("WEBHOOK_BACKGROUND", "1") != "0"
+
+
+async def set_webhook(bot: Bot, dispatcher: Dispatcher) -> None:
+    """
+    Регистрирует webhook в Telegram. Вызывается при старте диспетчера.
+    """
+    await bot.set_webhook(
+        f"{WEBHOOK_URL.rstrip('/')}{WEBHOOK_PATH}",
+        secret_token=WEBHOOK_SECRET,
+        allowed_updates=dispatcher.resolve_used_update_types(),
+    )
+
+
+def create_app(dp: Dispatcher, bot: Bot) -> web.Application:
+    """
+    Создает aiohttp-приложение, которое принимает обновления от Telegram
+    по адресу WEBHOOK_PATH.
+
+    Запросы без правильного секрета (WEBHOOK_SECRET) отклоняются.
+    Если включен WEBHOOK_BACKGROUND, обновление обрабатывается в фоновой задаче,
+    а Telegram сразу получает ответ, не дожидаясь медленных обработчиков.
+    """
+    app = web.Application()
+    SimpleRequestHandler(
+        dispatcher=dp,
+        bot=bot,
+        handle_in_background=WEBHOOK_BACKGROUND,
+        secret_token=WEBHOOK_SECRET,
+    ).register(app, path=WEBHOOK_PATH)
+    # Связывает запуск и остановку приложения с dp.startup и dp.shutdown
+    setup_application(app, dp, bot=bot)
+    return app
+
+
+def _serve(dp: Dispatcher, bot: Bot) -> None:
+    if is_primary_worker():
+        dp.startup.register(set_webhook)
+    web.run_app(
+        create_app(dp, bot),
+        host=WEBAPP_HOST,
+        port=WEBAPP_PORT,
+        # Процессы слушают один порт, соединения между ними распределяет ядро
+        reuse_port=WORKERS > 1,
+    )
+
+
+def run_webhook(dp: Dispatcher, bot: Bot) -> None:
+    """
+    Запускает бота в режиме webhook на WEBAPP_HOST:WEBAPP_PORT
+    в WORKERS процессах.
+
+    Для нескольких процессов нужен REDIS_URL: через Redis процессы уведомляют
+    друг друга об изменении рангов и контента. Состояния FSM они делят через
+    хранилище FSM_STORAGE (redis или mysql).
+    """
+    if not WEBHOOK_URL:
+        raise Exception("Переменная окружения 'WEBHOOK_URL' не найдена")
+    if not WEBHOOK_SECRET:
+        raise Exception("Переменная окружения 'WEBHOOK_SECRET' не найдена")
+    if WORKERS > 1 and not REDIS_URL:
+        raise Exception("Для WORKERS > 1 нужна переменная окружения 'REDIS_URL'")
+    if WORKERS > 1 and FSM_STORAGE == "memory":
+        raise Exception("Для WORKERS > 1 нужно FSM_STORAGE=redis или FSM_STORAGE=mysql")
+    run_workers(lambda: _serve(dp, bot))
@@ -0,0 +1,67 @@
+import multiprocessing
+import signal
+from os import environ
+from typing import Callable
+
+
+# Сколько процессов обрабатывают обновления (только в режиме webhook)
+WORKERS = int(environ.get("WORKERS", 1))
+
+_worker_id = 0
+
+
+def get_worker_id() -> int:
+    """
+    Возвращает номер текущего процесса-обработчика, начиная с 0.
+    """
+    return _worker_id
+
+
+def is_primary_worker() -> bool:
+    """
+    Проверяет, что текущий процесс - основной. Фоновые задачи, которые
+    должны выполняться в одном экземпляре (например, рассылки),
+    запускаются только в нем.
+    """
+    return _worker_id == 0
+
+
+def _run_worker(worker_id: int, target: Callable[[], None]) -> None:
+    global _worker_id
+    _worker_id = worker_id
+    target()
+
+
+def run_workers(target: Callable[[], None]) -> None:
+    """
+    Запускает target в WORKERS дочерних процессах и ждет их завершения.
+    При WORKERS = 1 target выполняется в текущем процессе.
+
+    Процессы создаются через fork, поэтому получают уже инициализированное
+    приложение; каждый из них создает собственный цикл событий.
+    """
+    if WORKERS <= 1:
+        target()
+        return
+
+    context = multiprocessing.get_context("fork")
+    processes = [
+        context.Process(target=_run_worker, args=(worker_id, target))
+        for worker_id in range(WORKERS)
+    ]
+    for process in processes:
+        process.start()
+
+    def stop(signum, frame) -> None:
+        # aiohttp в дочерних процессах корректно завершается по SIGTERM
+        for process in processes:
+            process.terminate()
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        # SIGINT уже получили все процессы группы, ждем их завершения
+        for process in processes:
+            process.join()
@@ -1,11 +1,18 @@
-from typing import List, Tuple
-from mysql.connector import connect, Error
+from typing import AsyncIterator, List, Optional, Set, Tuple
+from aiomysql import Error
 from os import environ
 
+from app.database.pool import get_async_connection
 
-def update_user(id: int, username: str) -> bool:
+
+USERS_CHUNK = int(environ.get("USERS_CHUNK", 1000))  # Размер страницы id пользователей
+# Сколько участников рассылки с подтверждением показывать на одной странице
+CONFIRM_PAGE_SIZE = int(environ.get("CONFIRM_PAGE_SIZE", 50))
+
+
+async def update_user(id: int, username: str) -> bool:
     """
-    Создает пользователя с id и никнеймом
+    Создает пользователя с id и никнеймом или обновляет его никнейм
 
     Args:
         id: int - id пользователя
@@ -13,72 +20,89 @@ def update_user(id: int, username: str) -> bool:
     Returns:
         bool: True, если пользователь успешно создан, False - в противном случае
     """
-    try:
-        with connect(
-            host=environ["DB_HOST"],
-            user=environ["DB_USER"],
-            password=environ["DB_PASSWORD"],
-            database=environ["DB_NAME"],
-        ) as connection:
-            with connection.cursor() as cursor:
-                # Проверяем, если пользователь уже зарегистрирован
-                check_query = "SELECT username FROM users WHERE id = %s"
-                cursor.execute(check_query, (id,))
-                result = cursor.fetchone()
-
-                if result:
-                    # Пользователь уже зарегистрирован, проверяем никнейм
-                    current_username = result[0]
-                    if current_username != username:
-                        # Обновляем никнейм если он изменился
-                        update_query = "UPDATE users SET username = %s WHERE id = %s"
-                        cursor.execute(update_query, (username, id))
-                        connection.commit()
-                    return True
-                else:
-                    # Пользователь не зарегистрирован, регистрируем
-                    insert_query = "INSERT INTO users (id, username) VALUES (%s, %s)"
-                    cursor.execute(insert_query, (id, username))
-                    connection.commit()
-                    return True
-    except Error as e:
-        print(e)
-        print(
-            "Не получилось создать пользователя с id =", id, "и никнеймом =", username
-        )
-        return False
+    return await save_users([(id, username)])
 
 
-def get_all_ids() -> List[int]:
+async def save_users(users: List[Tuple[int, Optional[str]]]) -> bool:
     """
-    Возвращает список id всех пользователей
-    или пустый список в случае ошибки
+    Создает или обновляет пачку пользователей одним запросом
 
+    Args:
+        users: List[Tuple[int, Optional[str]]] - (id пользователя, никнейм)
     Returns:
-        List[int]: - список id всех пользователей
+        bool: True, если пользователи сохранены, False - в противном случае
     """
+    if not users:
+        return True
     try:
-        with connect(
-            host=environ["DB_HOST"],
-            user=environ["DB_USER"],
-            password=environ["DB_PASSWORD"],
-            database=environ["DB_NAME"],
-        ) as connection:
+        async with get_async_connection() as connection:
+            values = ", ".join(["(%s, %s)"] * len(users))
             query: str = (
-                """
-                SELECT id FROM users;
+                f"""
+                INSERT INTO users (id, username)
+                VALUES {values}
+                ON DUPLICATE KEY UPDATE username = VALUES(username);
                 """
             )
-            with connection.cursor() as cursor:
-                cursor.execute(query)
-                return cursor.fetchall()
+            params = [value for user in users for value in user]
+            async with connection.cursor() as cursor:
+                await cursor.execute(query, params)
+                await connection.commit()
+                return True
     except Error as e:
         print(e)
-        print("Не получилось получить список пользователей")
-        return []
+        print("Не получилось сохранить пользователей:", len(users))
+        return False
 
 
-def is_user_registered(id: int) -> bool:
+async def iter_user_ids(
+    after_id: int = 0, chunk_size: int = USERS_CHUNK
+) -> AsyncIterator[int]:
+    """
+    Лениво перебирает id всех пользователей в порядке возрастания,
+    начиная с id больше after_id.
+
+    Id читаются страницами по chunk_size штук с keyset-пагинацией
+    (WHERE id > последний ORDER BY id LIMIT n), поэтому в памяти
+    одновременно находится не больше одной страницы, а каждая страница
+    читается по первичному ключу независимо от ее номера.
+    Ошибка БД пробрасывается вызывающему: обрыв перебора нельзя
+    принять за конец списка пользователей.
+
+    Args:
+        after_id: int - id, после которого начинается перебор
+        chunk_size: int - размер страницы
+    Yields:
+        int: - id пользователя
+    Raises:
+        Error: если страницу не удалось прочитать
+    """
+    query: str = (
+        """
+        SELECT id FROM users WHERE id > %s ORDER BY id LIMIT %s;
+        """
+    )
+    last_id = after_id
+    while True:
+        try:
+            async with get_async_connection() as connection:
+                async with connection.cursor() as cursor:
+                    await cursor.execute(query, (last_id, chunk_size))
+                    chunk = [row[0] for row in await cursor.fetchall()]
+        except Error as e:
+            print(e)
+            print("Не получилось получить список пользователей после id =", last_id)
+            raise
+
+        for id in chunk:
+            yield id
+
+        if len(chunk) < chunk_size:
+            return  # неполная страница, прочитанная без ошибки, - последняя
+        last_id = chunk[-1]
+
+
+async def is_user_registered(id: int) -> bool:
     """
     Проверяет, зарегистрирован ли пользователь
 
@@ -88,27 +112,22 @@ def is_user_registered(id: int) -> bool:
         bool: True, если пользователь зарегистрирован, False - в противном случае
     """
     try:
-        with connect(
-            host=environ["DB_HOST"],
-            user=environ["DB_USER"],
-            password=environ["DB_PASSWORD"],
-            database=environ["DB_NAME"],
-        ) as connection:
+        async with get_async_connection() as connection:
             query: str = (
                 """
                 SELECT id FROM users WHERE id = %s;
                 """
             )
-            with connection.cursor() as cursor:
-                cursor.execute(query, (id,))
-                return cursor.fetchone() is not None
+            async with connection.cursor() as cursor:
+                await cursor.execute(query, (id,))
+                return await cursor.fetchone() is not None
     except Error as e:
         print(e)
         print("Не получилось проверить наличие пользователя с id =", id)
         return False
 
 
-def add_confirm(text: str) -> int:
+async def add_confirm(text: str) -> int:
     """
     Добавляет рассылку с подтверждением
 
@@ -119,20 +138,15 @@ def add_confirm(text: str) -> int:
         int: id добавленной рассылки или 0 в случае ошибки
     """
     try:
-        with connect(
-            host=environ["DB_HOST"],
-            user=environ["DB_USER"],
-            password=environ["DB_PASSWORD"],
-            database=environ["DB_NAME"],
-        ) as connection:
+        async with get_async_connection() as connection:
             query: str = (
                 """
                 INSERT INTO confirms (text) VALUES (%s);
                 """
             )
-            with connection.cursor() as cursor:
-                cursor.execute(query, (text[:125] + "...",))
-                connection.commit()
+            async with connection.cursor() as cursor:
+                await cursor.execute(query, (text[:125] + "...",))
+                await connection.commit()
                 return cursor.lastrowid
     except Error as e:
         print(e)
@@ -140,7 +154,7 @@ def add_confirm(text: str) -> int:
         return 0
 
 
-def get_all_confirms() -> List[int]:
+async def get_all_confirms() -> List[int]:
     """
     Возвращает все рассылки
 
@@ -148,55 +162,89 @@ def get_all_confirms() -> List[int]:
         List[str]: все рассылки
     """
     try:
-        with connect(
-            host=environ["DB_HOST"],
-            user=environ["DB_USER"],
-            password=environ["DB_PASSWORD"],
-            database=environ["DB_NAME"],
-        ) as connection:
+        async with get_async_connection() as connection:
             query: str = (
                 """
                 SELECT id, text FROM confirms;
                 """
             )
-            with connection.cursor() as cursor:
-                cursor.execute(query)
-                return cursor.fetchall()
+            async with connection.cursor() as cursor:
+                await cursor.execute(query)
+                return await cursor.fetchall()
     except Error as e:
         print(e)
         print("Не получилось получить рассылки с подтверждением")
         return []
 
 
-def add_confirm_user_mailing(user_id, mailing_id):
+async def add_confirm_users(records: List[Tuple[int, int]]) -> bool:
     """
-    Добавляет подтверждение рассылки пользователю
+    Добавляет пачку подтверждений рассылок одним запросом.
+    Уже существующие подтверждения пропускаются
 
     Args:
-        user_id: int - id пользователя
-        mailing_id: int - id рассылки
+        records: List[Tuple[int, int]] - (id пользователя, id рассылки)
+    Returns:
+        bool: True, если подтверждения добавлены, False - в противном случае
     """
+    if not records:
+        return True
     try:
-        with connect(
-            host=environ["DB_HOST"],
-            user=environ["DB_USER"],
-            password=environ["DB_PASSWORD"],
-            database=environ["DB_NAME"],
-        ) as connection:
+        async with get_async_connection() as connection:
+            values = ", ".join(["(%s, %s)"] * len(records))
             query: str = (
+                f"""
+                INSERT IGNORE INTO users_confirms (user_id, confirm_id)
+                VALUES {values};
                 """
-                INSERT INTO users_confirms (user_id, confirm_id) VALUES (%s, %s);
+            )
+            params = [value for record in records for value in record]
+            async with connection.cursor() as cursor:
+                await cursor.execute(query, params)
+                await connection.commit()
+                return True
+    except Error as e:
+        print(e)
+        print("Не получилось добавить подтверждения рассылки:", len(records))
+        return False
+
+
+async def get_confirm_user_ids(id: int) -> Optional[Set[int]]:
+    """
+    Возвращает id пользователей, подтвердивших рассылку
+
+    Args:
+        id: int - id рассылки
+    Returns:
+        Optional[Set[int]]: id пользователей или None, если рассылки нет
+    Raises:
+        Error: если участников не удалось прочитать
+    """
+    try:
+        async with get_async_connection() as connection:
+            confirm_query: str = (
+                """
+                SELECT id FROM confirms WHERE id = %s;
+                """
+            )
+            users_query: str = (
+                """
+                SELECT user_id FROM users_confirms WHERE confirm_id = %s;
                 """
             )
-            with connection.cursor() as cursor:
-                cursor.execute(query, (user_id, mailing_id))
-                connection.commit()
+            async with connection.cursor() as cursor:
+                await cursor.execute(confirm_query, (id,))
+                if await cursor.fetchone() is None:
+                    return None
+                await cursor.execute(users_query, (id,))
+                return {row[0] for row in await cursor.fetchall()}
     except Error as e:
         print(e)
-        print("Не получилось добавить подтверждение рассылки пользователю")
+        print("Не получилось получить участников рассылки с id =", id)
+        raise
 
 
-def end_confirm(id: int) -> bool:
+async def end_confirm(id: int) -> bool:
     """
     Завершает рассылку с подтверждением
 
@@ -206,20 +254,15 @@ def end_confirm(id: int) -> bool:
         bool: True, если рассылка завершена, False - в противном случае
     """
     try:
-        with connect(
-            host=environ["DB_HOST"],
-            user=environ["DB_USER"],
-            password=environ["DB_PASSWORD"],
-            database=environ["DB_NAME"],
-        ) as connection:
+        async with get_async_connection() as connection:
             query: str = (
                 """
                 DELETE FROM confirms WHERE id = %s;
                 """
             )
-            with connection.cursor() as cursor:
-                cursor.execute(query, (id,))
-                connection.commit()
+            async with connection.cursor() as cursor:
+                await cursor.execute(query, (id,))
+                await connection.commit()
                 return True
     except Error as e:
         print(e)
@@ -227,29 +270,39 @@ def end_confirm(id: int) -> bool:
         return False
 
 
-def get_confirm(id: int) -> Tuple[str, List[Tuple[int, str]]]:
+async def get_confirm(
+    id: int, after: int = 0, before: int = 0, limit: int = CONFIRM_PAGE_SIZE
+) -> Tuple[str, List[Tuple[int, str]], bool]:
     """
-    Возвращает информацию о подтвержденных пользователях и текст рассылки
+    Возвращает текст рассылки и одну страницу подтвердивших ее пользователей.
+
+    Страницы выбираются по ключу (WHERE user_id > after или < before),
+    поэтому любая страница читается по первичному ключу users_confirms
+    за одинаковое время, сколько бы участников ни было
 
     Args:
         id: int - id рассылки
+        after: int - вернуть пользователей с id больше after
+        before: int - если не 0, вернуть последних пользователей с id меньше before
+        limit: int - размер страницы
     Returns:
-        Tuple[str,List[Tuple[int,str]]]: текст + тг id и username каждого пользователя, подтвердившего id конкурса
+        Tuple[str,List[Tuple[int,str]],bool]: текст + тг id и username пользователей
+            страницы по возрастанию id + есть ли еще пользователи в направлении
+            выборки; пустой список, если рассылка не найдена
     """
     try:
-        with connect(
-            host=environ["DB_HOST"],
-            user=environ["DB_USER"],
-            password=environ["DB_PASSWORD"],
-            database=environ["DB_NAME"],
-        ) as connection:
+        async with get_async_connection() as connection:
             text_query: str = (
                 """
                 SELECT text FROM confirms WHERE id = %s;
                 """
             )
+            if before:
+                condition, order, cursor_id = "<", "DESC", before
+            else:
+                condition, order, cursor_id = ">", "ASC", after
             users_query: str = (
-                """
+                f"""
                 SELECT 
                  user.id,
                  user.username
@@ -258,16 +311,439 @@ def get_confirm(id: int) -> Tuple[str, List[Tuple[int, str]]]:
                 JOIN 
                  users AS user ON user.id = confirmation.user_id
                 WHERE 
-                 confirmation.confirm_id = %s;
+                 confirmation.confirm_id = %s
+                 AND confirmation.user_id {condition} %s
+                ORDER BY confirmation.user_id {order}
+                LIMIT %s;
                 """
             )
-            with connection.cursor() as cursor:
-                cursor.execute(text_query, (id,))
-                text = cursor.fetchone()[0]
-                cursor.execute(users_query, (id,))
-                users = cursor.fetchall()
-                return text, [(user[0], user[1]) for user in users]
+            async with connection.cursor() as cursor:
+                await cursor.execute(text_query, (id,))
+                row = await cursor.fetchone()
+                if not row:
+                    return []
+                text = row[0]
+                # Лишняя строка показывает, есть ли следующая страница
+                await cursor.execute(users_query, (id, cursor_id, limit + 1))
+                users = [(user[0], user[1]) for user in await cursor.fetchall()]
+                has_more = len(users) > limit
+                users = users[:limit]
+                if before:
+                    users.reverse()
+                return text, users, has_more
     except Error as e:
         print(e)
         print("Не получилось получить подтвержденных пользователей")
         return []
+
+
+async def add_mailing_job(text: str, confirm_id: Optional[int] = None) -> int:
+    """
+    Сохраняет рассылку в очередь заданий
+
+    Args:
+        text: str - текст рассылки
+        confirm_id: int | None - id рассылки с подтверждением, если она есть
+    Returns:
+        int: id задания или 0 в случае ошибки
+    """
+    try:
+        async with get_async_connection() as connection:
+            query: str = (
+                """
+                INSERT INTO mailings (text, confirm_id) VALUES (%s, %s);
+                """
+            )
+            async with connection.cursor() as cursor:
+                await cursor.execute(query, (text, confirm_id))
+                await connection.commit()
+                return cursor.lastrowid
+    except Error as e:
+        print(e)
+        print("Не получилось сохранить рассылку в очередь")
+        return 0
+
+
+async def get_unfinished_mailing_jobs() -> List[
+    Tuple[int, str, Optional[int], int, int, int]
+]:
+    """
+    Возвращает незавершенные задания рассылок в порядке создания
+
+    Returns:
+        List[Tuple[int, str, int | None, int, int, int]]: id задания, текст,
+        id рассылки с подтверждением, id последнего обработанного пользователя,
+        количество доставленных и недоставленных сообщений
+    """
+    try:
+        async with get_async_connection() as connection:
+            query: str = (
+                """
+                SELECT id, text, confirm_id, last_user_id, sent, failed
+                FROM mailings
+                WHERE status != 'done'
+                ORDER BY id;
+                """
+            )
+            async with connection.cursor() as cursor:
+                await cursor.execute(query)
+                return await cursor.fetchall()
+    except Error as e:
+        print(e)
+        print("Не получилось получить очередь рассылок")
+        return []
+
+
+async def update_mailing_job(
+    id: int, last_user_id: int, sent: int, failed: int, status: str = "running"
+) -> bool:
+    """
+    Сохраняет прогресс задания рассылки
+
+    Args:
+        id: int - id задания
+        last_user_id: int - id, до которого включительно все пользователи обработаны
+        sent: int - количество доставленных сообщений
+        failed: int - количество недоставленных сообщений
+        status: str - статус задания (pending, running, done)
+    Returns:
+        bool: True, если прогресс сохранен, False - в противном случае
+    """
+    try:
+        async with get_async_connection() as connection:
+            query: str = (
+                """
+                UPDATE mailings
+                SET last_user_id = %s, sent = %s, failed = %s, status = %s
+                WHERE id = %s;
+                """
+            )
+            async with connection.cursor() as cursor:
+                await cursor.execute(query, (last_user_id, sent, failed, status, id))
+                await connection.commit()
+                return True
+    except Error as e:
+        print(e)
+        print("Не получилось сохранить прогресс рассылки с id =", id)
+        return False
+
+
+async def get_fsm_record(id: str) -> Optional[Tuple[Optional[str], Optional[str]]]:
+    """
+    Получает состояние FSM и его данные
+
+    Args:
+        id: str - ключ состояния
+    Returns:
+        Optional[Tuple[Optional[str], Optional[str]]]: (состояние, данные в JSON)
+            или None, если записи нет или ее срок истек
+    """
+    try:
+        async with get_async_connection() as connection:
+            query: str = (
+                """
+                SELECT state, data FROM fsm_states
+                WHERE id = %s AND expires_at > NOW();
+                """
+            )
+            async with connection.cursor() as cursor:
+                await cursor.execute(query, (id,))
+                return await cursor.fetchone()
+    except Error as e:
+        print(e)
+        print("Не получилось получить состояние с id =", id)
+        return None
+
+
+async def save_fsm_records(
+    records: List[Tuple[str, Optional[str], str]], ttl: int
+) -> bool:
+    """
+    Сохраняет пачку состояний FSM одним запросом
+
+    Args:
+        records: List[Tuple[str, Optional[str], str]] - (ключ, состояние, данные в JSON)
+        ttl: int - через сколько секунд без изменений запись считается устаревшей
+    Returns:
+        bool: True, если состояния сохранены, False - в противном случае
+    """
+    if not records:
+        return True
+    try:
+        async with get_async_connection() as connection:
+            values = ", ".join(
+                ["(%s, %s, %s, NOW() + INTERVAL %s SECOND)"] * len(records)
+            )
+            query: str = (
+                f"""
+                INSERT INTO fsm_states (id, state, data, expires_at)
+                VALUES {values}
+                ON DUPLICATE KEY UPDATE
+                    state = VALUES(state),
+                    data = VALUES(data),
+                    expires_at = VALUES(expires_at);
+                """
+            )
+            params = [value for record in records for value in (*record, ttl)]
+            async with connection.cursor() as cursor:
+                await cursor.execute(query, params)
+                await connection.commit()
+                return True
+    except Error as e:
+        print(e)
+        print("Не получилось сохранить состояния")
+        return False
+
+
+async def delete_expired_fsm_records(limit: int = 1000) -> int:
+    """
+    Удаляет устаревшие состояния FSM
+
+    Args:
+        limit: int - сколько записей удалять за один запрос
+    Returns:
+        int: количество удаленных записей
+    """
+    try:
+        async with get_async_connection() as connection:
+            query: str = (
+                """
+                DELETE FROM fsm_states WHERE expires_at <= NOW() LIMIT %s;
+                """
+            )
+            async with connection.cursor() as cursor:
+                await cursor.execute(query, (limit,))
+                await connection.commit()
+                return cursor.rowcount
+    except Error as e:
+        print(e)
+        print("Не получилось удалить устаревшие состояния")
+        return 0
+
+
+async def add_question(
+    support_chat_id: int,
+    support_message_id: int,
+    chat_id: int,
+    msg_id: int,
+    moder_id: Optional[int] = None,
+) -> bool:
+    """
+    Сохраняет вопрос, отправленный в чат поддержки
+
+    Args:
+        support_chat_id: int - id чата поддержки
+        support_message_id: int - id сообщения с вопросом в чате поддержки
+        chat_id: int - id чата пользователя
+        msg_id: int - id сообщения пользователя с вопросом
+        moder_id: Optional[int] - id назначенного модератора
+    Returns:
+        bool: True, если вопрос сохранен, False - в противном случае
+    """
+    try:
+        async with get_async_connection() as connection:
+            query: str = (
+                """
+                INSERT INTO questions
+                    (support_chat_id, support_message_id, user_chat_id,
+                     user_message_id, moder_id, assigned_at)
+                VALUES (%s, %s, %s, %s, %s, IF(%s IS NULL, NULL, CURRENT_TIMESTAMP));
+                """
+            )
+            async with connection.cursor() as cursor:
+                await cursor.execute(
+                    query,
+                    (
+                        support_chat_id,
+                        support_message_id,
+                        chat_id,
+                        msg_id,
+                        moder_id,
+                        moder_id,
+                    ),
+                )
+                await connection.commit()
+                return True
+    except Error as e:
+        print(e)
+        print("Не получилось сохранить вопрос с id сообщения =", support_message_id)
+        return False
+
+
+async def get_question(
+    support_chat_id: int, support_message_id: int
+) -> Optional[Tuple[int, int, str]]:
+    """
+    Получает вопрос по сообщению в чате поддержки
+
+    Args:
+        support_chat_id: int - id чата поддержки
+        support_message_id: int - id сообщения с вопросом в чате поддержки
+    Returns:
+        Optional[Tuple[int, int, str]]: (id чата пользователя, id сообщения
+            пользователя, статус) или None, если вопроса нет
+    Raises:
+        Error: если вопрос не удалось прочитать
+    """
+    try:
+        async with get_async_connection() as connection:
+            query: str = (
+                """
+                SELECT user_chat_id, user_message_id, status FROM questions
+                WHERE support_chat_id = %s AND support_message_id = %s;
+                """
+            )
+            async with connection.cursor() as cursor:
+                await cursor.execute(query, (support_chat_id, support_message_id))
+                return await cursor.fetchone()
+    except Error as e:
+        print(e)
+        print("Не получилось получить вопрос с id сообщения =", support_message_id)
+        raise
+
+
+async def set_question_status(
+    support_chat_id: int, support_message_id: int, status: str, expected: str
+) -> bool:
+    """
+    Меняет статус вопроса, если его текущий статус равен expected.
+    Так два модератора не могут одновременно закрыть один вопрос.
+
+    Args:
+        support_chat_id: int - id чата поддержки
+        support_message_id: int - id сообщения с вопросом в чате поддержки
+        status: str - новый статус
+        expected: str - статус, который должен быть у вопроса сейчас
+    Returns:
+        bool: True, если статус изменен, False - если у вопроса другой статус
+            или вопроса нет
+    Raises:
+        Error: если статус не удалось изменить
+    """
+    try:
+        async with get_async_connection() as connection:
+            query: str = (
+                """
+                UPDATE questions
+                SET status = %s,
+                    closed_at = IF(%s = 'open', NULL, CURRENT_TIMESTAMP)
+                WHERE support_chat_id = %s AND support_message_id = %s
+                    AND status = %s;
+                """
+            )
+            async with connection.cursor() as cursor:
+                await cursor.execute(
+                    query,
+                    (status, status, support_chat_id, support_message_id, expected),
+                )
+                await connection.commit()
+                return cursor.rowcount == 1
+    except Error as e:
+        print(e)
+        print(
+            "Не получилось изменить статус вопроса с id сообщения =",
+            support_message_id,
+        )
+        raise
+
+
+async def get_open_question_loads() -> List[Tuple[int, int]]:
+    """
+    Считает открытые вопросы каждого модератора
+
+    Returns:
+        List[Tuple[int, int]]: список (id модератора, количество открытых вопросов)
+    """
+    try:
+        async with get_async_connection() as connection:
+            query: str = (
+                """
+                SELECT moder_id, COUNT(*) FROM questions
+                WHERE status = 'open' AND moder_id IS NOT NULL
+                GROUP BY moder_id;
+                """
+            )
+            async with connection.cursor() as cursor:
+                await cursor.execute(query)
+                return await cursor.fetchall()
+    except Error as e:
+        print(e)
+        print("Не получилось посчитать открытые вопросы")
+        return []
+
+
+async def get_stale_questions(
+    age: int, limit: int = 100
+) -> List[Tuple[int, int, Optional[int]]]:
+    """
+    Получает открытые вопросы, которые не назначены или назначены
+    больше age секунд назад
+
+    Args:
+        age: int - сколько секунд вопрос может ждать ответа назначенного модератора
+        limit: int - максимальное количество вопросов
+    Returns:
+        List[Tuple[int, int, Optional[int]]]: список (id чата поддержки,
+            id сообщения с вопросом, id назначенного модератора или None)
+    """
+    try:
+        async with get_async_connection() as connection:
+            query: str = (
+                """
+                SELECT support_chat_id, support_message_id, moder_id
+                FROM questions
+                WHERE status = 'open' AND (
+                    assigned_at IS NULL
+                    OR assigned_at < CURRENT_TIMESTAMP - INTERVAL %s SECOND
+                )
+                ORDER BY assigned_at
+                LIMIT %s;
+                """
+            )
+            async with connection.cursor() as cursor:
+                await cursor.execute(query, (age, limit))
+                return await cursor.fetchall()
+    except Error as e:
+        print(e)
+        print("Не получилось получить неотвеченные вопросы")
+        return []
+
+
+async def assign_question(
+    support_chat_id: int,
+    support_message_id: int,
+    moder_id: int,
+    expected: Optional[int],
+) -> bool:
+    """
+    Назначает открытый вопрос модератору, если сейчас он назначен expected.
+    Так вопрос не переназначается дважды, если его уже забрал другой процесс.
+
+    Args:
+        support_chat_id: int - id чата поддержки
+        support_message_id: int - id сообщения с вопросом в чате поддержки
+        moder_id: int - id нового модератора
+        expected: Optional[int] - id модератора, которому вопрос назначен сейчас
+    Returns:
+        bool: True, если вопрос назначен, False - в противном случае
+    """
+    try:
+        async with get_async_connection() as connection:
+            query: str = (
+                """
+                UPDATE questions
+                SET moder_id = %s, assigned_at = CURRENT_TIMESTAMP
+                WHERE support_chat_id = %s AND support_message_id = %s
+                    AND status = 'open' AND moder_id <=> %s;
+                """
+            )
+            async with connection.cursor() as cursor:
+                await cursor.execute(
+                    query, (moder_id, support_chat_id, support_message_id, expected)
+                )
+                await connection.commit()
+                return cursor.rowcount == 1
+    except Error as e:
+        print(e)
+        print("Не получилось назначить вопрос с id сообщения =", support_message_id)
+        return False
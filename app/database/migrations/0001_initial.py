@@ -0,0 +1,88 @@
+"""
+Таблицы бота. Для БД, созданных до появления миграций, ничего не меняет:
+все таблицы создаются с IF NOT EXISTS, а отличия старой схемы
+исправляют следующие миграции.
+"""
+
+from mysql.connector.abstracts import MySQLConnectionAbstract
+
+
+def upgrade(connection: MySQLConnectionAbstract) -> None:
+    users_query: str = (
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            id BIGINT PRIMARY KEY,
+            username VARCHAR(255)
+        );
+        """
+    )
+    confirms_query: str = (
+        """
+        CREATE TABLE IF NOT EXISTS confirms (
+            id INT PRIMARY KEY AUTO_INCREMENT,
+            text VARCHAR(255)
+        );
+        """
+    )
+    users_confirms_query: str = (
+        """
+        CREATE TABLE IF NOT EXISTS users_confirms (
+            confirm_id INT NOT NULL,
+            user_id BIGINT NOT NULL,
+            PRIMARY KEY (confirm_id, user_id),
+            INDEX idx_users_confirms_user (user_id),
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+            FOREIGN KEY (confirm_id) REFERENCES confirms (id) ON DELETE CASCADE
+        );
+        """
+    )
+    mailings_query: str = (
+        """
+        CREATE TABLE IF NOT EXISTS mailings (
+            id INT PRIMARY KEY AUTO_INCREMENT,
+            text TEXT,
+            confirm_id INT NULL,
+            status VARCHAR(16) DEFAULT 'pending',
+            last_user_id BIGINT DEFAULT 0,
+            sent INT DEFAULT 0,
+            failed INT DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        """
+    )
+    fsm_states_query: str = (
+        """
+        CREATE TABLE IF NOT EXISTS fsm_states (
+            id VARCHAR(255) PRIMARY KEY,
+            state VARCHAR(255) NULL,
+            data TEXT,
+            expires_at DATETIME NOT NULL,
+            INDEX (expires_at)
+        );
+        """
+    )
+    questions_query: str = (
+        """
+        CREATE TABLE IF NOT EXISTS questions (
+            support_chat_id BIGINT,
+            support_message_id BIGINT,
+            user_chat_id BIGINT NOT NULL,
+            user_message_id BIGINT NOT NULL,
+            status VARCHAR(16) DEFAULT 'open',
+            moder_id BIGINT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            assigned_at TIMESTAMP NULL,
+            closed_at TIMESTAMP NULL,
+            PRIMARY KEY (support_chat_id, support_message_id),
+            INDEX idx_questions_status_assigned (status, assigned_at),
+            INDEX idx_questions_status_moder (status, moder_id)
+        );
+        """
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(users_query)
+        cursor.execute(confirms_query)
+        cursor.execute(users_confirms_query)
+        cursor.execute(mailings_query)
+        cursor.execute(fsm_states_query)
+        cursor.execute(questions_query)
@@ -0,0 +1,37 @@
+"""
+Переводит users_confirms со старой схемы, где user_id был UNIQUE
+и пользователь мог участвовать только в одном конкурсе, на первичный
+ключ (confirm_id, user_id) и индекс по user_id.
+"""
+
+from mysql.connector.abstracts import MySQLConnectionAbstract
+
+from app.database.migrations import has_primary_key, in_batches
+
+
+def upgrade(connection: MySQLConnectionAbstract) -> None:
+    if has_primary_key(connection, "users_confirms"):
+        return  # таблица создана уже с новой схемой
+
+    in_batches(
+        connection,
+        """
+        DELETE FROM users_confirms
+        WHERE user_id IS NULL OR confirm_id IS NULL
+        LIMIT %s;
+        """,
+    )
+    # Перестройка таблицы без блокировки записи: INSERT во время
+    # миграции не ждут ее окончания
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            ALTER TABLE users_confirms
+                MODIFY confirm_id INT NOT NULL,
+                MODIFY user_id BIGINT NOT NULL,
+                ADD PRIMARY KEY (confirm_id, user_id),
+                ADD INDEX idx_users_confirms_user (user_id),
+                DROP INDEX user_id,
+                ALGORITHM = INPLACE, LOCK = NONE;
+            """
+        )
@@ -0,0 +1,143 @@
+import re
+from importlib import import_module
+from os import environ, listdir, path
+from types import ModuleType
+from typing import List, Sequence, Tuple
+
+from mysql.connector.abstracts import MySQLConnectionAbstract
+
+
+# Сколько строк миграция изменяет за один запрос, чтобы не держать
+# долгих блокировок на больших таблицах
+MIGRATION_BATCH = int(environ.get("MIGRATION_BATCH", 1000))
+# Сколько секунд ждать, пока миграции выполняет другой экземпляр бота
+MIGRATION_LOCK_TIMEOUT = int(environ.get("MIGRATION_LOCK_TIMEOUT", 300))
+
+# Файлы миграций: 0001_initial.py, 0002_..., выполняются по возрастанию номера
+_MIGRATION_FILE = re.compile(r"^(\d{4})_(\w+)\.py$")
+
+
+def get_migrations() -> List[Tuple[int, str, ModuleType]]:
+    """
+    Находит миграции в этом пакете.
+
+    Каждая миграция - модуль с функцией upgrade(connection), которая
+    приводит схему от предыдущей версии к своей.
+
+    :return: Список (номер, имя, модуль) по возрастанию номера.
+    """
+    migrations = []
+    for file in sorted(listdir(path.dirname(__file__))):
+        match = _MIGRATION_FILE.match(file)
+        if match is None:
+            continue
+        name = file[: -len(".py")]
+        module = import_module(f"{__name__}.{name}")
+        migrations.append((int(match[1]), match[2], module))
+    return migrations
+
+
+def in_batches(
+    connection: MySQLConnectionAbstract,
+    query: str,
+    params: Sequence = (),
+    batch_size: int = MIGRATION_BATCH,
+) -> int:
+    """
+    Повторяет UPDATE или DELETE с LIMIT, пока он изменяет строки,
+    фиксируя каждую пачку отдельно. Запрос должен заканчиваться на
+    "LIMIT %s" и не изменять уже обработанные строки повторно.
+
+    :param connection: Соединение с БД.
+    :param query: Запрос с LIMIT %s последним параметром.
+    :param params: Остальные параметры запроса.
+    :param batch_size: Сколько строк изменять за один запрос.
+    :return: Сколько строк изменено всего.
+    """
+    total = 0
+    with connection.cursor() as cursor:
+        while True:
+            cursor.execute(query, (*params, batch_size))
+            connection.commit()
+            total += cursor.rowcount
+            if cursor.rowcount < batch_size:
+                return total
+
+
+def has_primary_key(connection: MySQLConnectionAbstract, table: str) -> bool:
+    """
+    Проверяет, есть ли у таблицы первичный ключ.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT COUNT(*) FROM information_schema.table_constraints
+            WHERE table_schema = DATABASE() AND table_name = %s
+                AND constraint_type = 'PRIMARY KEY';
+            """,
+            (table,),
+        )
+        return cursor.fetchone()[0] > 0
+
+
+def _applied_versions(connection: MySQLConnectionAbstract) -> List[int]:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INT PRIMARY KEY,
+                name VARCHAR(255) NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+            """
+        )
+        cursor.execute("SELECT version FROM schema_version ORDER BY version;")
+        return [row[0] for row in cursor.fetchall()]
+
+
+def run_migrations(connection: MySQLConnectionAbstract) -> int:
+    """
+    Выполняет еще не примененные миграции и записывает их в schema_version.
+
+    Пока миграции выполняются, держится именованная блокировка MySQL,
+    поэтому одновременно запущенные экземпляры бота не выполнят
+    одну миграцию дважды.
+
+    :param connection: Соединение с БД.
+    :return: Сколько миграций выполнено.
+    :raises RuntimeError: Если схема БД новее кода или блокировку
+        не удалось получить.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT GET_LOCK('schema_migrations', %s);", (MIGRATION_LOCK_TIMEOUT,)
+        )
+        if cursor.fetchone()[0] != 1:
+            raise RuntimeError("Не удалось получить блокировку миграций")
+    try:
+        applied = set(_applied_versions(connection))
+        migrations = get_migrations()
+        latest = migrations[-1][0] if migrations else 0
+        if applied and max(applied) > latest:
+            raise RuntimeError(
+                f"Версия схемы БД {max(applied)} новее последней миграции {latest}"
+            )
+
+        done = 0
+        for version, name, module in migrations:
+            if version in applied:
+                continue
+            print(f"Выполняется миграция {version:04d}_{name}")
+            module.upgrade(connection)
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "INSERT INTO schema_version (version, name) VALUES (%s, %s);",
+                    (version, name),
+                )
+            connection.commit()
+            done += 1
+        return done
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT RELEASE_LOCK('schema_migrations');")
+            cursor.fetchone()
@@ -1,6 +1,9 @@
 from mysql.connector import connect, Error
 from os import environ
 
+from app.database.migrations import run_migrations
+from app.database.pool import get_connection
+
 
 def init_db() -> None:
     try_db_connection()
@@ -34,45 +37,16 @@ def try_db_connection() -> None:
 
 
 def setup_models() -> None:
+    """
+    Приводит схему БД к последней версии, выполняя еще не примененные
+    миграции из app/database/migrations. Если схема БД новее кода,
+    бот не запускается.
+    """
     try:
-        with connect(
-            host=environ["DB_HOST"],
-            user=environ["DB_USER"],
-            password=environ["DB_PASSWORD"],
-            database=environ["DB_NAME"],
-        ) as connection:
-            users_query: str = (
-                """
-                CREATE TABLE IF NOT EXISTS users (
-                    id BIGINT PRIMARY KEY,
-                    username VARCHAR(255)
-                );
-                """
-            )
-            confirms_query: str = (
-                """
-                CREATE TABLE IF NOT EXISTS confirms (
-                    id INT PRIMARY KEY AUTO_INCREMENT,
-                    text VARCHAR(255)
-                );
-                """
-            )
-            users_confirms_query: str = (
-                """
-                CREATE TABLE IF NOT EXISTS users_confirms (
-                    user_id BIGINT UNIQUE,
-                    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
-                    confirm_id INT,
-                    FOREIGN KEY (confirm_id) REFERENCES confirms (id) ON DELETE CASCADE
-                );
-                """
-            )
-            with connection.cursor() as cursor:
-                cursor.execute(users_query)
-                cursor.execute(confirms_query)
-                cursor.execute(users_confirms_query)
-            print("Модели успешно инициализированы")
-    except Error as e:
+        with get_connection() as connection:
+            done = run_migrations(connection)
+            print("Модели успешно инициализированы, выполнено миграций:", done)
+    except (Error, RuntimeError) as e:
         print(e)
         print("Модели не получилось инициализировать")
         exit(code=403)
@@ -0,0 +1,119 @@
+import asyncio
+from contextlib import asynccontextmanager, contextmanager
+from os import environ
+from time import monotonic
+from typing import AsyncIterator, Iterator, Optional
+from weakref import WeakKeyDictionary
+
+import aiomysql
+from mysql.connector import connect
+from mysql.connector.abstracts import MySQLConnectionAbstract
+
+
+# Соединение, простоявшее в пуле дольше этого времени (в секундах),
+# проверяется ping'ом перед выдачей
+PING_AFTER = 30
+
+
+# Время возврата соединений в асинхронный пул
+_released: "WeakKeyDictionary[aiomysql.Connection, float]" = WeakKeyDictionary()
+_async_pool: Optional[aiomysql.Pool] = None
+_async_pool_lock = asyncio.Lock()
+
+
+@contextmanager
+def get_connection() -> Iterator[MySQLConnectionAbstract]:
+    """
+    Открывает отдельное синхронное соединение и закрывает его после использования:
+
+        with get_connection() as connection:
+            ...
+
+    Нужно только при запуске (миграции схемы), поэтому пула здесь нет:
+    обработчики работают через асинхронный пул get_async_connection().
+    Параметры подключения берутся из DB_HOST, DB_USER, DB_PASSWORD, DB_NAME.
+    """
+    connection = connect(
+        host=environ["DB_HOST"],
+        user=environ["DB_USER"],
+        password=environ["DB_PASSWORD"],
+        database=environ["DB_NAME"],
+    )
+    try:
+        yield connection
+    finally:
+        connection.close()
+
+
+async def get_async_pool() -> aiomysql.Pool:
+    """
+    Возвращает асинхронный пул соединений процесса,
+    создавая его при первом вызове.
+
+    Параметры подключения берутся из DB_HOST, DB_USER, DB_PASSWORD, DB_NAME;
+    DB_POOL_SIZE + DB_POOL_OVERFLOW - максимальное число соединений,
+    DB_POOL_RECYCLE - максимальный возраст соединения.
+    """
+    global _async_pool
+    if _async_pool is not None:
+        return _async_pool
+    async with _async_pool_lock:
+        if _async_pool is None:
+            size = int(environ.get("DB_POOL_SIZE", 5))
+            _async_pool = await aiomysql.create_pool(
+                minsize=size,
+                maxsize=size + int(environ.get("DB_POOL_OVERFLOW", 10)),
+                pool_recycle=float(environ.get("DB_POOL_RECYCLE", 3600)),
+                host=environ["DB_HOST"],
+                user=environ["DB_USER"],
+                password=environ["DB_PASSWORD"],
+                db=environ["DB_NAME"],
+                # Без autocommit aiomysql закрывает соединения,
+                # возвращенные в пул с открытой транзакцией
+                autocommit=True,
+            )
+    return _async_pool
+
+
+@asynccontextmanager
+async def get_async_connection() -> AsyncIterator[aiomysql.Connection]:
+    """
+    Выдает соединение из асинхронного пула:
+
+        async with get_async_connection() as connection:
+            ...
+
+    Соединение, простоявшее в пуле дольше PING_AFTER секунд, перед выдачей
+    проверяется ping'ом и при необходимости переподключается, поэтому
+    соединения, закрытые сервером (wait_timeout, перезапуск MySQL),
+    не доходят до запросов.
+
+    :raises aiomysql.Error: Если за DB_POOL_TIMEOUT секунд
+        не освободилось ни одного соединения или БД недоступна.
+    """
+    pool = await get_async_pool()
+    try:
+        connection = await asyncio.wait_for(
+            pool.acquire(), timeout=float(environ.get("DB_POOL_TIMEOUT", 30))
+        )
+    except asyncio.TimeoutError:
+        raise aiomysql.OperationalError("Нет свободных соединений с БД")
+    try:
+        if monotonic() - _released.get(connection, 0) > PING_AFTER:
+            await connection.ping(reconnect=True)
+        yield connection
+    finally:
+        _released[connection] = monotonic()
+        # Закрытое соединение пул не вернет в оборот, а откроет новое
+        pool.release(connection)
+
+
+async def close_async_pool() -> None:
+    """
+    Закрывает асинхронный пул соединений. Вызывается при остановке диспетчера.
+    """
+    global _async_pool
+    if _async_pool is not None:
+        _async_pool.close()
+        await _async_pool.wait_closed()
+        _async_pool = None
@@ -1,7 +1,7 @@
 from aiogram.filters import Filter
 from aiogram.types import Message, CallbackQuery
 
-from app.utils.ranks import get_admin
+from app.utils.ranks import ROLE_ADMIN
 
 
 class IsAdminMessage(Filter):
@@ -9,14 +9,13 @@ class IsAdminMessage(Filter):
     Фильтр, который проверяет, является ли автор сообщения администратором.
     """
 
-    async def __call__(self, message: Message) -> bool:
+    async def __call__(self, message: Message, role: str | None = None) -> bool:
         """
         :param message: Объект Message, представляющий сообщение.
+        :param role: Роль отправителя, определенная RoleMiddleware.
         :return: True, если автор сообщения является администратором, False в противном случае.
         """
-        if message.chat.type != "private":
-            return False
-        return (await get_admin()) == message.chat.id
+        return role == ROLE_ADMIN
 
 
 class IsAdminCallback(Filter):
@@ -24,11 +23,10 @@ class IsAdminCallback(Filter):
     Фильтр, который проверяет, является ли автор callback-queries администратором.
     """
 
-    async def __call__(self, callback: CallbackQuery) -> bool:
+    async def __call__(self, callback: CallbackQuery, role: str | None = None) -> bool:
         """
         :param callback: Объект CallbackQuery, представляющий callback-запрос.
+        :param role: Роль отправителя, определенная RoleMiddleware.
         :return: True, если автор callback-запроса является администратором, False в противном случае.
         """
-        if callback.message.chat.type != "private":
-            return False
-        return (await get_admin()) == callback.from_user.id
+        return role == ROLE_ADMIN
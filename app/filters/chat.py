@@ -1,7 +1,7 @@
 from aiogram.filters import Filter
 from aiogram.types import Message, CallbackQuery
 
-from app.utils.ranks import get_chat_id
+from app.utils.ranks import ROLE_CHAT
 
 
 class IsChatMessage(Filter):
@@ -9,14 +9,13 @@ class IsChatMessage(Filter):
     Фильтр, который проверяет, является ли сообщение сообщением из чата.
     """
 
-    async def __call__(self, message: Message) -> bool:
+    async def __call__(self, message: Message, role: str | None = None) -> bool:
         """
         :param message: Объект Message, представляющий сообщение.
+        :param role: Роль отправителя, определенная RoleMiddleware.
         :return: True, если сообщение является сообщением из чата, False в противном случае.
         """
-        if message.chat.type != "group" and message.chat.type != "supergroup":
-            return False
-        return (await get_chat_id()) == message.chat.id
+        return role == ROLE_CHAT
 
 
 class IsChatCallback(Filter):
@@ -24,14 +23,10 @@ class IsChatCallback(Filter):
     Фильтр, который проверяет, является ли callback-запрос callback-запросом из чата.
     """
 
-    async def __call__(self, callback: CallbackQuery) -> bool:
+    async def __call__(self, callback: CallbackQuery, role: str | None = None) -> bool:
         """
         :param callback: Объект CallbackQuery, представляющий callback-запрос.
+        :param role: Роль отправителя, определенная RoleMiddleware.
         :return: True, если callback-запрос является callback-запросом из чата, False в противном случае.
         """
-        if (
-            callback.message.chat.type != "group"
-            and callback.message.chat.type != "supergroup"
-        ):
-            return False
-        return (await get_chat_id()) == callback.message.chat.id
+        return role == ROLE_CHAT
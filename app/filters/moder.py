@@ -1,7 +1,7 @@
 from aiogram.filters import Filter
 from aiogram.types import Message, CallbackQuery
 
-from app.utils.ranks import is_moder
+from app.utils.ranks import ROLE_MODER
 
 
 class IsModerMessage(Filter):
@@ -9,14 +9,13 @@ class IsModerMessage(Filter):
     Фильтр, который проверяет, является ли автор сообщения модератором.
     """
 
-    async def __call__(self, message: Message) -> bool:
+    async def __call__(self, message: Message, role: str | None = None) -> bool:
         """
         :param message: Объект Message, представляющий сообщение.
+        :param role: Роль отправителя, определенная RoleMiddleware.
         :return: True, если автор сообщения является модератором, False в противном случае.
         """
-        if message.chat.type != "private":
-            return False
-        return await is_moder(message.chat.id)
+        return role == ROLE_MODER
 
 
 class IsModerCallback(Filter):
@@ -24,11 +23,10 @@ class IsModerCallback(Filter):
     Фильтр, который проверяет, является ли автор callback-запроса модератором.
     """
 
-    async def __call__(self, callback: CallbackQuery) -> bool:
+    async def __call__(self, callback: CallbackQuery, role: str | None = None) -> bool:
         """
         :param callback: Объект CallbackQuery, представляющий callback-запрос.
+        :param role: Роль отправителя, определенная RoleMiddleware.
         :return: True, если автор callback-запроса является модератором, False в противном случае.
         """
-        if callback.message.chat.type != "private":
-            return False
-        return await is_moder(callback.from_user.id)
+        return role == ROLE_MODER
@@ -1,7 +1,7 @@
 from aiogram.filters import Filter
 from aiogram.types import Message, CallbackQuery
 
-from app.utils.ranks import is_subadmin
+from app.utils.ranks import ROLE_SUBADMIN
 
 
 class IsSubAdminMessage(Filter):
@@ -9,14 +9,13 @@ class IsSubAdminMessage(Filter):
     Фильтр, который проверяет, является ли автор сообщения субадминистратором.
     """
 
-    async def __call__(self, message: Message) -> bool:
+    async def __call__(self, message: Message, role: str | None = None) -> bool:
         """
         :param message: Объект Message, представляющий сообщение.
+        :param role: Роль отправителя, определенная RoleMiddleware.
         :return: True, если автор сообщения является субадминистратором, False в противном случае.
         """
-        if message.chat.type != "private":
-            return False
-        return await is_subadmin(message.chat.id)
+        return role == ROLE_SUBADMIN
 
 
 class IsSubAdminCallback(Filter):
@@ -24,11 +23,10 @@ class IsSubAdminCallback(Filter):
     Фильтр, который проверяет, является ли автор callback-запроса субадминистратором.
     """
 
-    async def __call__(self, callback: CallbackQuery) -> bool:
+    async def __call__(self, callback: CallbackQuery, role: str | None = None) -> bool:
         """
         :param callback: Объект CallbackQuery, представляющий callback-запрос.
+        :param role: Роль отправителя, определенная RoleMiddleware.
         :return: True, если автор callback-запроса является субадминистратором, False в противном случае.
         """
-        if callback.message.chat.type != "private":
-            return False
-        return await is_subadmin(callback.from_user.id)
+        return role == ROLE_SUBADMIN
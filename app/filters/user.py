@@ -1,18 +1,21 @@
 from aiogram.filters import Filter
 from aiogram.types import Message, CallbackQuery
 
+from app.utils.ranks import PRIVATE_ROLES
+
 
 class IsUserMessage(Filter):
     """
     Фильтр, который проверяет, является ли сообщение private-сообщением.
     """
 
-    async def __call__(self, message: Message) -> bool:
+    async def __call__(self, message: Message, role: str | None = None) -> bool:
         """
         :param message: Объект Message, представляющий сообщение.
+        :param role: Роль отправителя, определенная RoleMiddleware.
         :return: True, если сообщение является private-сообщением, False в противном случае.
         """
-        return message.chat.type == "private"
+        return role in PRIVATE_ROLES
 
 
 class IsUserCallback(Filter):
@@ -20,9 +23,10 @@ class IsUserCallback(Filter):
     Фильтр, который проверяет, является ли callback-запрос private-callback-запросом.
     """
 
-    async def __call__(self, callback: CallbackQuery) -> bool:
+    async def __call__(self, callback: CallbackQuery, role: str | None = None) -> bool:
         """
         :param callback: Объект CallbackQuery, представляющий callback-запрос.
+        :param role: Роль отправителя, определенная RoleMiddleware.
         :return: True, если callback-запрос является private-callback-запросом, False в противном случае.
         """
-        return callback.message.chat.type == "private"
+        return role in PRIVATE_ROLES
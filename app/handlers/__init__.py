@@ -1,4 +1,7 @@
 from aiogram import Router
+
+from app.middlewares import RoleMiddleware, ThrottlingMiddleware
+
 from .root import get_root_router
 from .users import get_user_router
 from .moders import get_moder_router
@@ -14,7 +17,10 @@ def get_router() -> Router:
     :return: Router - Конфигурированный основной роутер.
 
     Внутренний процесс:
-    1. Создаем экземпляр роутера.
+    1. Создаем экземпляр роутера и подключаем RoleMiddleware, который один раз
+       определяет роль отправителя для фильтров всех вложенных роутеров,
+       и ThrottlingMiddleware, который отбрасывает слишком частые обновления
+       из личных чатов до обработчиков.
     2. Включаем в роутер маршрутизатор главного админа с помощью функции get_root_router().
     3. Включаем в роутер маршрутизатор субадминистратора с помощью функции get_subadmin_router().
     4. Включаем в роутер маршрутизатор пользователей с помощью функции get_user_router().
@@ -23,6 +29,12 @@ def get_router() -> Router:
     7. Возвращаем сконфигурированный роутер.
     """
     router = Router()
+    role_middleware = RoleMiddleware()
+    router.message.outer_middleware(role_middleware)
+    router.callback_query.outer_middleware(role_middleware)
+    throttling_middleware = ThrottlingMiddleware()
+    router.message.outer_middleware(throttling_middleware)
+    router.callback_query.outer_middleware(throttling_middleware)
     router.include_router(get_chat_router())
     router.include_router(get_root_router())
     router.include_router(get_subadmin_router())
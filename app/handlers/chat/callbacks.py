@@ -2,6 +2,13 @@ from aiogram import F, Bot, Router
 from aiogram.types import CallbackQuery
 
 from app.filters.chat import IsChatCallback
+from app.utils.assignment import release_question
+from app.utils.questions import (
+    QUESTION_DECLINED,
+    close_question,
+    find_question,
+    reopen_question,
+)
 from app.utils.ranks import is_able_to_answer
 
 router = Router(name="chat_callbacks")
@@ -22,23 +29,41 @@ async def decline_message(callback: CallbackQuery, bot: Bot):
     :return: None
 
     Внутренний процесс:
-    1. Извлекаем идентификаторы чата и сообщения из текста сообщения.
+    1. Находим вопрос по id сообщения в реестре вопросов.
     2. Проверяем, является ли пользователь модератором или администратором.
        Если нет, ничего не делаем.
-    3. Формируем текст ответа об отклонении вопроса.
+    3. Закрываем вопрос; если его уже закрыл другой модератор, ничего не делаем.
     4. Отправляем сообщение пользователю, чей вопрос был отклонён.
-    5. Удаляем сообщение с запросом на отклонение.
+       Если отправить не удалось, возвращаем вопрос в открытые.
+    5. Удаляем сообщение с вопросом.
     """
+    support_chat_id = callback.message.chat.id
+    support_message_id = callback.message.message_id
     try:
-        data = callback.message.text.split("]", maxsplit=1)[0]
-        data = data.split("[", maxsplit=1)[1]
-        chat_id, msg_id = data.split(", ")
+        question = await find_question(
+            support_chat_id, support_message_id, callback.message.text
+        )
+        if question is None:
+            return  # ничего не делать
         if not await is_able_to_answer(callback.from_user.id):
             return  # ничего не делать
+        if not await close_question(
+            support_chat_id, support_message_id, QUESTION_DECLINED
+        ):
+            return  # вопрос уже закрыт
 
         answer_text = "Ваш вопрос отклонён!"
 
-        await bot.send_message(chat_id, answer_text, reply_to_message_id=msg_id)
+        try:
+            await bot.send_message(
+                question.chat_id, answer_text, reply_to_message_id=question.msg_id
+            )
+        except Exception:
+            await reopen_question(
+                support_chat_id, support_message_id, QUESTION_DECLINED
+            )
+            raise
+        release_question(support_chat_id, support_message_id)
 
         await callback.message.delete()
 
@@ -3,6 +3,13 @@ from aiogram.types import Message
 from aiogram.filters import Command
 
 from app.filters.chat import IsChatMessage
+from app.utils.assignment import release_question
+from app.utils.questions import (
+    QUESTION_ANSWERED,
+    close_question,
+    find_question,
+    reopen_question,
+)
 from app.utils.ranks import get_chat_id, is_able_to_answer, set_chat_id
 
 router = Router(name="chat_messages")
@@ -18,27 +25,45 @@ async def answer_to_message(message: Message, bot: Bot):
     :return: None
 
     Внутренний процесс:
-    1. Получаем ID чата и ID сообщения, на которое отвечает пользователь.
+    1. Находим вопрос по id сообщения, на которое отвечает пользователь.
     2. Если пользователь не является модератором или администратором, удаляем его сообщение.
-    3. Отправляем ответ модератора пользователю в чат.
-    4. Удаляем ответ модератора.
+    3. Закрываем вопрос; если его уже закрыл другой модератор, удаляем ответ.
+    4. Отправляем ответ модератора пользователю в чат.
+       Если отправить не удалось, возвращаем вопрос в открытые.
+    5. Удаляем вопрос и ответ модератора.
     """
-
+    support_chat_id = message.chat.id
+    support_message_id = message.reply_to_message.message_id
     try:
-        data = message.reply_to_message.text.split("]", maxsplit=1)[0]
-        data = data.split("[", maxsplit=1)[1]
-        chat_id, msg_id = data.split(", ")
+        question = await find_question(
+            support_chat_id, support_message_id, message.reply_to_message.text
+        )
+        if question is None:
+            return  # ничего не делать
         if not await is_able_to_answer(message.from_user.id):
             await message.delete()
             return
+        if not await close_question(
+            support_chat_id, support_message_id, QUESTION_ANSWERED
+        ):
+            await message.delete()  # вопрос уже закрыт
+            return
 
         answer_text = f"{message.text}\n\nНа ваш вопрос ответила команда escape!"
 
-        await bot.send_message(chat_id, answer_text, reply_to_message_id=msg_id)
+        try:
+            await bot.send_message(
+                question.chat_id, answer_text, reply_to_message_id=question.msg_id
+            )
+        except Exception:
+            await reopen_question(
+                support_chat_id, support_message_id, QUESTION_ANSWERED
+            )
+            raise
+        release_question(support_chat_id, support_message_id)
 
         await message.reply_to_message.delete()
         await message.delete()
-        print("Дошёл")
     except Exception as e:
         print(e)
         return  # ничего не делать
@@ -1,22 +1,23 @@
-from typing import List, Tuple
 from aiogram import Bot, Router
 from aiogram.types import CallbackQuery
 from aiogram.fsm.context import FSMContext
 
 
+from app.utils.assignment import get_queue_depth, refresh_loads
+from app.utils.confirms import render_confirm_page
 from app.utils.info import (
     get_about_quiz,
     get_faq,
     get_news_admin,
     get_news_one,
-    get_news_user,
     get_quizzes_admin,
     del_quiz,
     get_quiz,
     del_news,
-    get_quizzes_user,
     get_rules,
 )
+from app.utils.pages import show_page
+from app.utils.participation import forget_confirm
 from app.utils.ranks import (
     del_moder,
     del_subadmin,
@@ -27,7 +28,7 @@ from app.utils.ranks import (
     reset_chat,
     get_chat_link,
 )
-from app.database.actions import get_all_confirms, get_confirm, end_confirm
+from app.database.actions import get_all_confirms, end_confirm
 
 from app.states.admin import Admin
 
@@ -94,20 +95,10 @@ async def about_quiz_user_callback(callback: CallbackQuery) -> None:
     :return: None
 
     Внутренний процесс:
-    1. Получаем информацию о викторине из базы данных с помощью функции get_about_quiz().
-    2. Если информация не найдена, отправляем сообщение о том, что информация не найдена.
-    3. Если информация найдена, формируем текст сообщения с ее данными.
-    4. Отправляем сообщение с данными викторины и клавиатурой с возможными действиями.
+    1. Показываем заранее отрисованную страницу о викторине с помощью функции show_page().
+    2. Если сообщение уже показывает ее текущую версию, оно не редактируется.
     """
-    about_quiz = await get_about_quiz()
-
-    if not about_quiz:
-        await callback.message.edit_text(
-            "Информация о викторине не найдена", reply_markup=get_back_user_kb()
-        )
-        return
-
-    await callback.message.edit_text(about_quiz, reply_markup=get_back_user_kb())
+    await show_page(callback, "quiz_info", get_back_user_kb())
 
 
 async def faq_user_callback(callback: CallbackQuery) -> None:
@@ -120,20 +111,10 @@ async def faq_user_callback(callback: CallbackQuery) -> None:
     :return: None
 
     Внутренний процесс:
-    1. Получаем информацию о частых вопросах из базы данных с помощью функции get_faq().
-    2. Если информация не найдена, отправляем сообщение о том, что информация не найдена.
-    3. Если информация найдена, формируем текст сообщения с ее данными.
-    4. Отправляем сообщение с данными частых вопросов и клавиатурой с возможными действиями.
+    1. Показываем заранее отрисованную страницу частых вопросов с помощью функции show_page().
+    2. Если сообщение уже показывает ее текущую версию, оно не редактируется.
     """
-    faq = await get_faq()
-
-    if not faq:
-        await callback.message.edit_text(
-            "Информация о частых вопросах не найдена", reply_markup=get_back_user_kb()
-        )
-        return
-
-    await callback.message.edit_text(faq, reply_markup=get_back_user_kb())
+    await show_page(callback, "faq", get_back_user_kb())
 
 
 async def quizzes_user_callback(callback: CallbackQuery) -> None:
@@ -146,22 +127,10 @@ async def quizzes_user_callback(callback: CallbackQuery) -> None:
     :return: None
 
     Внутренний процесс:
-    1. Получаем список предстоящих викторин из базы данных с помощью функции get_quizzes_user().
-    2. Если список викторин пуст, отправляем сообщение о том, что викторин нет.
-    3. Если викторины найдены, формируем текст сообщения с их ID и текстом.
-    4. Отправляем сообщение с данными викторин.
+    1. Показываем заранее отрисованную страницу предстоящих викторин с помощью функции show_page().
+    2. Если сообщение уже показывает ее текущую версию, оно не редактируется.
     """
-    quizzes = await get_quizzes_user()
-
-    if not quizzes:
-        await callback.message.edit_text(
-            "Нет предстоящих викторин", reply_markup=get_back_user_kb()
-        )
-        return
-
-    text = "\n".join(quizzes)
-
-    await callback.message.edit_text(text, reply_markup=get_back_user_kb())
+    await show_page(callback, "quizzes", get_back_user_kb())
 
 
 async def news_user_callback(callback: CallbackQuery) -> None:
@@ -174,22 +143,10 @@ async def news_user_callback(callback: CallbackQuery) -> None:
     :return: None
 
     Внутренний процесс:
-    1. Получаем список новостей из базы данных с помощью функции get_news_user().
-    2. Если список новостей пуст, отправляем сообщение о том, что новостей нет.
-    3. Если новости найдены, формируем текст сообщения с ними.
-    4. Отправляем сообщение с данными новостей.
+    1. Показываем заранее отрисованную страницу новостей с помощью функции show_page().
+    2. Если сообщение уже показывает ее текущую версию, оно не редактируется.
     """
-    news = await get_news_user()
-
-    if not news:
-        await callback.message.edit_text(
-            "Нет новостей", reply_markup=get_back_user_kb()
-        )
-        return
-
-    text = "\n".join(news)
-
-    await callback.message.edit_text(text, reply_markup=get_back_user_kb())
+    await show_page(callback, "news", get_back_user_kb())
 
 
 async def rules_user_callback(callback: CallbackQuery) -> None:
@@ -202,19 +159,10 @@ async def rules_user_callback(callback: CallbackQuery) -> None:
     :return: None
 
     Внутренний процесс:
-    1. Получаем текст правил из базы данных с помощью функции get_rules().
-    2. Если текст правил не найден, отправляем сообщение о том, что правил не найдены.
-    3. Если правила найдены, отправляем сообщение с данными правил.
+    1. Показываем заранее отрисованную страницу правил с помощью функции show_page().
+    2. Если сообщение уже показывает ее текущую версию, оно не редактируется.
     """
-    rules = await get_rules()
-
-    if not rules:
-        await callback.message.edit_text(
-            "Правила не выставлены", reply_markup=get_back_user_kb()
-        )
-        return
-
-    await callback.message.edit_text(rules, reply_markup=get_back_user_kb())
+    await show_page(callback, "rules", get_back_user_kb())
 
 
 async def ask_question_user_callback(
@@ -256,7 +204,8 @@ async def show_moders_callback(callback: CallbackQuery, state: FSMContext) -> No
     1. Очищаем текущее состояние машины состояний.
     2. Получаем список модераторов с помощью функции get_full_moders().
     3. Если список модераторов пуст, отправляем сообщение о том, что модераторов нет.
-    4. Если модераторы найдены, формируем текст сообщения с их ID и именами.
+    4. Если модераторы найдены, формируем текст сообщения с их именами
+       и количеством открытых вопросов в очереди.
     5. Отправляем сообщение с данными модераторов и клавиатурой с возможными действиями.
     """
     await state.clear()
@@ -268,8 +217,11 @@ async def show_moders_callback(callback: CallbackQuery, state: FSMContext) -> No
         )
         return
 
+    await refresh_loads()
     text = "Модераторы:\n\n"
-    text += "\n".join([f"@{moder[1]}" for moder in moders])
+    text += "\n".join(
+        [f"@{moder[1]} - вопросов: {get_queue_depth(moder[0])}" for moder in moders]
+    )
     await callback.message.edit_text(
         text, reply_markup=get_moders_kb([moder[0] for moder in moders])
     )
@@ -585,7 +537,7 @@ async def show_confirms_callback(callback: CallbackQuery, state: FSMContext) ->
        содержащее информацию о рассылках.
     """
     await state.clear()
-    confirms = get_all_confirms()
+    confirms = await get_all_confirms()
 
     if not confirms:
         await callback.message.edit_text(
@@ -601,7 +553,7 @@ async def show_confirms_callback(callback: CallbackQuery, state: FSMContext) ->
     )
 
 
-async def del_confirm_callback(callback: CallbackQuery, state: FSMContext) -> None:
+async def show_confirm_callback(callback: CallbackQuery, state: FSMContext) -> None:
     """
     Обрабатывает callback-запрос для отображения информации о рассылке с подтверждением.
     Она очищает текущее состояние, получает данные о рассылке из базы данных
@@ -616,26 +568,58 @@ async def del_confirm_callback(callback: CallbackQuery, state: FSMContext) -> No
     2. Извлекаем идентификатор рассылки из данных callback.
     3. Получаем данные о рассылке с подтверждением из базы данных.
     4. Если данные о рассылке не найдены, отправляем сообщение о том, что рассылка не найдена.
-    5. Если данные о рассылке найдены, форматируем сообщение с текстом рассылки и списком пользователей.
+    5. Если данные о рассылке найдены, форматируем сообщение с текстом рассылки
+       и первой страницей пользователей с кнопками перехода к следующим.
     6. Отправляем сообщение с информацией о рассылке и клавиатурой с возможными действиями.
     """
     await state.clear()
     _, _, id = callback.data.split("_")
 
-    data: Tuple[str, List[Tuple[str | int, str]]] = get_confirm(id)
+    page = await render_confirm_page(id)
 
-    if not data:
+    if not page:
         await callback.message.edit_text(
-            "Рассылка с подтверждением не найдена", reply_markup=get_confirm_kb()
+            "Рассылка с подтверждением не найдена", reply_markup=get_confirm_kb()
         )
         return
 
-    text, users = data
+    text, kb = page
+    await callback.message.edit_text(text, reply_markup=kb)
 
-    await callback.message.edit_text(
-        f"Рассылка с подтверждением:\n\n{text}\n\nПользователи:\n\n{users}\n.Выберите действие:",
-        reply_markup=get_confirm_kb(id),
-    )
+
+async def confirm_page_callback(callback: CallbackQuery, state: FSMContext) -> None:
+    """
+    Обрабатывает callback-запрос для перехода к соседней странице
+    участников рассылки с подтверждением.
+
+    :param callback: Объект CallbackQuery, представляющий callback-запрос.
+    :param state: Объект FSMContext, представляющий состояние машины состояний.
+    :return: None
+
+    Внутренний процесс:
+    1. Очищаем текущее состояние машины состояний.
+    2. Извлекаем из данных callback ID рассылки, направление и ID участника,
+       от которого начинается страница.
+    3. Получаем страницу участников с помощью функции render_confirm_page().
+    4. Если рассылка не найдена, отправляем сообщение об этом.
+    5. Иначе показываем страницу с кнопками перехода.
+    """
+    await state.clear()
+    _, _, id, direction, cursor = callback.data.split("_")
+
+    if direction == "p":
+        page = await render_confirm_page(id, before=int(cursor))
+    else:
+        page = await render_confirm_page(id, after=int(cursor))
+
+    if not page:
+        await callback.message.edit_text(
+            "Рассылка с подтверждением не найдена", reply_markup=get_confirm_kb()
+        )
+        return
+
+    text, kb = page
+    await callback.message.edit_text(text, reply_markup=kb)
 
 
 async def add_confirm_callback(callback: CallbackQuery, state: FSMContext) -> None:
@@ -681,7 +665,8 @@ async def del_confirm_callback(callback: CallbackQuery, state: FSMContext) -> No
     _, _, id = callback.data.split("_")
 
     try:
-        if end_confirm(id):
+        if await end_confirm(id):
+            await forget_confirm(int(id))
             await callback.message.edit_text(
                 "Рассылка с подтверждением удалена",
                 reply_markup=get_end_confirm_kb(),
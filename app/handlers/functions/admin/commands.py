@@ -1,10 +1,10 @@
-from typing import List, Tuple
 from aiogram import Bot
 from aiogram.filters import CommandObject
 from aiogram.types import Message
 
 
 from app.keyboards.admin import get_admin_kb
+from app.utils.assignment import get_queue_depth, refresh_loads
 from app.utils.ranks import (
     add_subadmin,
     del_subadmin,
@@ -15,7 +15,9 @@ from app.utils.ranks import (
     add_moder,
     del_moder,
 )
+from app.utils.confirms import render_confirm_page
 from app.utils.mailing import make_confirm_mailing, make_mailing
+from app.utils.participation import forget_confirm
 from app.utils.info import (
     add_news,
     add_quiz,
@@ -34,7 +36,7 @@ from app.utils.info import (
     get_rules,
 )
 
-from app.database.actions import end_confirm, get_all_confirms, get_confirm
+from app.database.actions import end_confirm, get_all_confirms
 
 
 async def start_command(message: Message, is_subadmin: bool) -> None:
@@ -121,7 +123,8 @@ async def show_moderators_command(message: Message) -> None:
     Внутренний процесс:
     1. Получаем список модераторов с помощью функции get_full_moders().
     2. Если список модераторов пуст, отправляем сообщение о том, что модераторов нет.
-    3. Если модераторы найдены, формируем текст сообщения с их ID, именами.
+    3. Если модераторы найдены, формируем текст сообщения с их ID, именами
+       и количеством открытых вопросов в очереди.
     4. Отправляем сообщение с данными модераторов.
     """
     moders = await get_full_moders()
@@ -129,8 +132,14 @@ async def show_moderators_command(message: Message) -> None:
         await message.answer("Нет модераторов")
         return
 
+    await refresh_loads()
     text = "Модераторы:\n\n"
-    text += "\n".join([f"ID: {moder[0]} - @{moder[1]}" for moder in moders])
+    text += "\n".join(
+        [
+            f"ID: {moder[0]} - @{moder[1]} - вопросов: {get_queue_depth(moder[0])}"
+            for moder in moders
+        ]
+    )
     await message.answer(text)
 
 
@@ -365,7 +374,7 @@ async def send_mailing_command(
     Внутренний процесс:
     1. Получаем аргументы команды.
     2. Если аргументов меньше 1, выводим ошибку.
-    3. Если аргументы правильные, то отправляем рассылку.
+    3. Если аргументы правильные, то ставим рассылку в очередь.
     """
     text = command.args
     if not text:
@@ -375,9 +384,9 @@ async def send_mailing_command(
     result = await make_mailing(text, bot)
 
     if result:
-        await message.answer("Рассылка выполнена")
+        await message.answer("Рассылка запущена")
     else:
-        await message.answer("Рассылка не выполнена. Произошла ошибка")
+        await message.answer("Рассылка не запущена. Произошла ошибка")
 
 
 async def del_chat_command(message: Message) -> None:
@@ -409,7 +418,7 @@ async def show_confirms_command(message: Message) -> None:
     2. Если рассылки с подтверждением нет, выводим сообщение об этом.
     3. Если рассылки с подтверждением есть, выводим список рассылок с подтверждением.
     """
-    confirms = get_all_confirms()
+    confirms = await get_all_confirms()
     if not confirms:
         await message.answer("Нет рассылок с подтверждением")
         return
@@ -431,7 +440,8 @@ async def show_confirm_command(message: Message, command: CommandObject) -> None
     Внутренний процесс:
     1. Проверяем, есть ли рассылка с подтверждением.
     2. Если рассылка с подтверждением нет, выводим сообщение об этом.
-    3. Если рассылка с подтверждением есть, выводим рассылку с подтверждением.
+    3. Если рассылка с подтверждением есть, выводим первую страницу ее участников
+       с кнопками перехода к следующим.
     """
     args = command.args
     try:
@@ -446,24 +456,14 @@ async def show_confirm_command(message: Message, command: CommandObject) -> None
 
     id = args[0]
 
-    confirm = get_confirm(id)
+    page = await render_confirm_page(id)
 
-    if not confirm:
-        await message.answer("Рассылка с подтверждением не найдена")
+    if not page:
+        await message.answer("Рассылка с подтверждением не найдена")
         return
-    description, users = confirm
+    text, kb = page
 
-    description: str
-    users: List[Tuple[int, str]]
-
-    text = (
-        f"Рассылка с подтверждением:\n\n"
-        f"ID: {id}\n"
-        f"Текст: {description}\nУчастники:\n"
-    )
-    text += "\n".join(f"ID: {id} - @{username}" for id, username in users)
-
-    await message.answer(text)
+    await message.answer(text, reply_markup=kb)
 
 
 async def add_confirm_command(
@@ -491,9 +491,9 @@ async def add_confirm_command(
     result = await make_confirm_mailing(text, bot)
 
     if result:
-        await message.answer("Рассылка с подтверждением выполнена")
+        await message.answer("Рассылка с подтверждением запущена")
     else:
-        await message.answer("Рассылка с подтверждением не выполнена. Произошла ошибка")
+        await message.answer("Рассылка с подтверждением не запущена. Произошла ошибка")
 
 
 async def del_confirm_command(message: Message, command: CommandObject) -> None:
@@ -522,9 +522,10 @@ async def del_confirm_command(message: Message, command: CommandObject) -> None:
 
     id = args[0]
 
-    result = end_confirm(id)
+    result = await end_confirm(id)
 
     if result:
+        await forget_confirm(int(id))
         await message.answer("Рассылка с подтверждением закончена")
     else:
         await message.answer("Рассылка с подтверждением не закончена. Произошла ошибка")
@@ -316,7 +316,7 @@ async def add_confirm_state(message: Message, state: FSMContext) -> None:
     text = message.text
 
     try:
-        result = add_confirm(text)
+        result = await add_confirm(text)
 
         if result:
             await message.answer(
@@ -1,6 +1,7 @@
 from aiogram import F, Bot, Router
 from aiogram.types import CallbackQuery
 from app.keyboards.moder import get_chat_kb, get_moder_kb
+from app.utils.assignment import get_queue_depth, refresh_loads
 from app.utils.ranks import get_chat_link
 
 
@@ -18,11 +19,14 @@ async def start_callback(callback: CallbackQuery) -> None:
     :return: None
 
     Внутренний процесс:
-    1. Изменяем текст сообщения на инструкцию.
-    2. Отправляем сообщение с клавиатурой.
+    1. Пересчитываем очереди модераторов.
+    2. Изменяем текст сообщения на инструкцию с размером очереди модератора
+       и клавиатурой.
     """
+    await refresh_loads()
     await callback.message.edit_text(
-        "Пока что у тебя есть возможность только отвечать на вопросы в чате",
+        "Пока что у тебя есть возможность только отвечать на вопросы в чате\n"
+        f"Вопросов в твоей очереди: {get_queue_depth(callback.from_user.id)}",
         reply_markup=get_moder_kb(),
     )
 
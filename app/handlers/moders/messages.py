@@ -3,6 +3,7 @@ from aiogram.types import Message
 from aiogram.filters import Command
 
 from app.keyboards.moder import get_moder_kb
+from app.utils.assignment import get_queue_depth, refresh_loads
 
 
 router = Router(name="moder_messages")
@@ -18,10 +19,13 @@ async def start_command(message: Message, bot: Bot) -> None:
     :return: None
 
     Внутренний процесс:
-    1. Отправляем приветственное сообщение модератору.
+    1. Пересчитываем очереди модераторов.
+    2. Отправляем приветственное сообщение модератору с размером его очереди.
     """
+    await refresh_loads()
     await message.answer(
-        "Пока что у тебя есть возможность только отвечать на вопросы в чате",
+        "Пока что у тебя есть возможность только отвечать на вопросы в чате\n"
+        f"Вопросов в твоей очереди: {get_queue_depth(message.from_user.id)}",
         reply_markup=get_moder_kb(),
     )
 
@@ -123,8 +123,13 @@ async def show_confirms_callback_root(
 
 
 @router.callback_query(F.data.startswith("show_confirm_"))
-async def del_confirm_callback_root(callback: CallbackQuery, state: FSMContext) -> None:
-    await del_confirm_callback(callback, state)
+async def show_confirm_callback_root(callback: CallbackQuery, state: FSMContext) -> None:
+    await show_confirm_callback(callback, state)
+
+
+@router.callback_query(F.data.startswith("confirm_page_"))
+async def confirm_page_callback_root(callback: CallbackQuery, state: FSMContext) -> None:
+    await confirm_page_callback(callback, state)
 
 
 @router.callback_query(F.data == "add_confirm")
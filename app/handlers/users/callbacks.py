@@ -2,15 +2,9 @@ from aiogram import F, Router
 from aiogram.types import CallbackQuery
 from aiogram.fsm.context import FSMContext
 
-from app.database.actions import add_confirm_user_mailing
 from app.keyboards.user import get_user_kb, get_back_kb
-from app.utils.info import (
-    get_about_quiz,
-    get_faq,
-    get_news_user,
-    get_quizzes_user,
-    get_rules,
-)
+from app.utils.pages import show_page
+from app.utils.participation import participate
 from app.states.user import User
 
 
@@ -47,20 +41,10 @@ async def about_quiz_callback(callback: CallbackQuery) -> None:
     :return: None
 
     Внутренний процесс:
-    1. Получаем информацию о викторине из базы данных с помощью функции get_about_quiz().
-    2. Если информация не найдена, отправляем сообщение о том, что информация не найдена.
-    3. Если информация найдена, формируем текст сообщения с ее данными.
-    4. Отправляем сообщение с данными викторины и клавиатурой с возможными действиями.
+    1. Показываем заранее отрисованную страницу о викторине с помощью функции show_page().
+    2. Если сообщение уже показывает ее текущую версию, оно не редактируется.
     """
-    about_quiz = await get_about_quiz()
-
-    if not about_quiz:
-        await callback.message.edit_text(
-            "Информация о викторине не найдена", reply_markup=get_back_kb()
-        )
-        return
-
-    await callback.message.edit_text(about_quiz, reply_markup=get_back_kb())
+    await show_page(callback, "quiz_info", get_back_kb())
 
 
 @router.callback_query(F.data == "faq")
@@ -74,20 +58,10 @@ async def faq_callback(callback: CallbackQuery) -> None:
     :return: None
 
     Внутренний процесс:
-    1. Получаем информацию о частых вопросах из базы данных с помощью функции get_faq().
-    2. Если информация не найдена, отправляем сообщение о том, что информация не найдена.
-    3. Если информация найдена, формируем текст сообщения с ее данными.
-    4. Отправляем сообщение с данными частых вопросов и клавиатурой с возможными действиями.
+    1. Показываем заранее отрисованную страницу частых вопросов с помощью функции show_page().
+    2. Если сообщение уже показывает ее текущую версию, оно не редактируется.
     """
-    faq = await get_faq()
-
-    if not faq:
-        await callback.message.edit_text(
-            "Информация о частых вопросах не найдена", reply_markup=get_back_kb()
-        )
-        return
-
-    await callback.message.edit_text(faq, reply_markup=get_back_kb())
+    await show_page(callback, "faq", get_back_kb())
 
 
 @router.callback_query(F.data == "quizzes")
@@ -101,22 +75,10 @@ async def quizzes_callback(callback: CallbackQuery) -> None:
     :return: None
 
     Внутренний процесс:
-    1. Получаем список предстоящих викторин из базы данных с помощью функции get_quizzes_user().
-    2. Если список викторин пуст, отправляем сообщение о том, что викторин нет.
-    3. Если викторины найдены, формируем текст сообщения с их ID и текстом.
-    4. Отправляем сообщение с данными викторин.
+    1. Показываем заранее отрисованную страницу предстоящих викторин с помощью функции show_page().
+    2. Если сообщение уже показывает ее текущую версию, оно не редактируется.
     """
-    quizzes = await get_quizzes_user()
-
-    if not quizzes:
-        await callback.message.edit_text(
-            "Нет предстоящих викторин", reply_markup=get_back_kb()
-        )
-        return
-
-    text = "\n".join(quizzes)
-
-    await callback.message.edit_text(text, reply_markup=get_back_kb())
+    await show_page(callback, "quizzes", get_back_kb())
 
 
 @router.callback_query(F.data == "news")
@@ -130,20 +92,10 @@ async def news_callback(callback: CallbackQuery) -> None:
     :return: None
 
     Внутренний процесс:
-    1. Получаем список новостей из базы данных с помощью функции get_news_user().
-    2. Если список новостей пуст, отправляем сообщение о том, что новостей нет.
-    3. Если новости найдены, формируем текст сообщения с ними.
-    4. Отправляем сообщение с данными новостей.
+    1. Показываем заранее отрисованную страницу новостей с помощью функции show_page().
+    2. Если сообщение уже показывает ее текущую версию, оно не редактируется.
     """
-    news = await get_news_user()
-
-    if not news:
-        await callback.message.edit_text("Нет новостей", reply_markup=get_back_kb())
-        return
-
-    text = "\n".join(news)
-
-    await callback.message.edit_text(text, reply_markup=get_back_kb())
+    await show_page(callback, "news", get_back_kb())
 
 
 @router.callback_query(F.data == "rules")
@@ -157,19 +109,10 @@ async def rules_callback(callback: CallbackQuery) -> None:
     :return: None
 
     Внутренний процесс:
-    1. Получаем текст правил из базы данных с помощью функции get_rules().
-    2. Если текст правил не найден, отправляем сообщение о том, что правил не найдены.
-    3. Если правила найдены, отправляем сообщение с данными правил.
+    1. Показываем заранее отрисованную страницу правил с помощью функции show_page().
+    2. Если сообщение уже показывает ее текущую версию, оно не редактируется.
     """
-    rules = await get_rules()
-
-    if not rules:
-        await callback.message.edit_text(
-            "Правила не выставлены", reply_markup=get_back_kb()
-        )
-        return
-
-    await callback.message.edit_text(rules, reply_markup=get_back_kb())
+    await show_page(callback, "rules", get_back_kb())
 
 
 @router.callback_query(F.data == "ask_question")
@@ -206,18 +149,30 @@ async def participate_callback(callback: CallbackQuery, state: FSMContext) -> No
 
     Внутренний процесс:
     1. Добавляем ID пользователя в список участников конкурса.
-    2. Удаляем сообщение с инструкцией для участия в конкурсе.
-    3. В случае ошибки оповещаем, что пользователь уже участвует в конкурсе.
+       Запись в БД происходит позже, пачкой с другими участниками.
+    2. Если участников конкурса не удалось прочитать, просим нажать кнопку
+       еще раз позже и оставляем сообщение.
+    3. Иначе оповещаем пользователя об участии, о том, что он уже участвует,
+       или о том, что конкурс завершен, и удаляем сообщение с инструкцией.
     """
     _, id = callback.data.split("_")
     try:
-        await add_confirm_user_mailing(callback.from_user.id, int(id))
-        await callback.message.delete()
-        await callback.answer("Вы успешно участвуете в конкурсе", show_alert=True)
+        result = await participate(callback.from_user.id, int(id))
     except Exception as e:
         print(e)
+        await callback.answer(
+            "Не получилось записать участие. Попробуйте еще раз позже",
+            show_alert=True,
+        )
+        return
+
+    if result:
+        await callback.answer("Вы успешно участвуете в конкурсе", show_alert=True)
+    elif result is False:
         await callback.answer("Вы уже участвуете в конкурсе", show_alert=True)
-        await callback.message.delete()
+    else:
+        await callback.answer("Конкурс уже завершен", show_alert=True)
+    await callback.message.delete()
 
 
 @router.callback_query(F.data == "not_participate")
@@ -3,8 +3,8 @@ from aiogram.filters import Command
 from aiogram.types import Message
 from aiogram.fsm.context import FSMContext
 
-from app.database.actions import update_user
 from app.keyboards.user import get_user_kb
+from app.utils.users import register_user
 
 
 router = Router(name="user_messages")
@@ -22,7 +22,7 @@ async def start_command(message: Message, state: FSMContext) -> None:
     await message.answer(
         f"Добро пожаловать, @{message.from_user.username}!", reply_markup=get_user_kb()
     )
-    update_user(message.from_user.id, message.from_user.username)
+    await register_user(message.from_user.id, message.from_user.username)
 
 
 @router.message()
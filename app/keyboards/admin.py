@@ -2,7 +2,10 @@ from typing import List, Optional
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
+from app.keyboards.cache import cached_keyboard, static_keyboard
 
+
+@static_keyboard
 def get_user_kb() -> InlineKeyboardMarkup:
     kb = InlineKeyboardBuilder()
 
@@ -23,6 +26,7 @@ def get_user_kb() -> InlineKeyboardMarkup:
     return kb.as_markup()
 
 
+@static_keyboard
 def get_back_user_kb() -> InlineKeyboardMarkup:
     kb = InlineKeyboardBuilder()
 
@@ -31,6 +35,7 @@ def get_back_user_kb() -> InlineKeyboardMarkup:
     return kb.as_markup()
 
 
+@cached_keyboard
 def get_admin_kb(is_subadmin: bool = True) -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     builder.add(
@@ -78,6 +83,7 @@ def get_moders_kb(active_ids: Optional[List[str]] = None) -> InlineKeyboardMarku
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_moder_kb(moder_id: str) -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     builder.row(
@@ -89,12 +95,14 @@ def get_moder_kb(moder_id: str) -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@static_keyboard
 def get_add_moder_kb() -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     builder.row(InlineKeyboardButton(text="Отмена", callback_data="start"))
     return builder.as_markup()
 
 
+@static_keyboard
 def get_del_moder_kb() -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     builder.row(
@@ -106,6 +114,7 @@ def get_del_moder_kb() -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_subadmin_kb(subadmin_id: str) -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     builder.row(
@@ -137,6 +146,7 @@ def get_subadmins_kb(active_ids: Optional[List[str]] = None) -> InlineKeyboardMa
     return builder.as_markup()
 
 
+@static_keyboard
 def get_del_subadmin_kb() -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     builder.row(
@@ -148,12 +158,14 @@ def get_del_subadmin_kb() -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@static_keyboard
 def get_add_subadmin_kb() -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     builder.row(InlineKeyboardButton(text="Отмена", callback_data="start"))
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_del_chat_kb(confirm: bool) -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     if confirm:
@@ -213,18 +225,21 @@ def get_news_kb(active_ids: Optional[List[str]] = None) -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@static_keyboard
 def get_add_quiz_kb() -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     builder.row(InlineKeyboardButton(text="Отмена", callback_data="show_quizzes"))
     return builder.as_markup()
 
 
+@static_keyboard
 def get_add_news_kb() -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     builder.row(InlineKeyboardButton(text="Отмена", callback_data="show_news"))
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_edit_quiz_kb(quiz_id: str) -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     builder.row(
@@ -233,6 +248,7 @@ def get_edit_quiz_kb(quiz_id: str) -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_edit_news_kb(news_id: str) -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     builder.row(
@@ -241,24 +257,28 @@ def get_edit_news_kb(news_id: str) -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@static_keyboard
 def get_del_quiz_kb() -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     builder.row(InlineKeyboardButton(text="Назад", callback_data="show_quizzes"))
     return builder.as_markup()
 
 
+@static_keyboard
 def get_del_news_kb() -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     builder.row(InlineKeyboardButton(text="Назад", callback_data="show_all_news"))
     return builder.as_markup()
 
 
+@static_keyboard
 def get_end_confirm_kb() -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     builder.row(InlineKeyboardButton(text="Назад", callback_data="show_confirms"))
     return builder.as_markup()
 
 
+@static_keyboard
 def get_back_kb() -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
 
@@ -267,6 +287,7 @@ def get_back_kb() -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_chat_kb(chat_link: Optional[str]) -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     if chat_link:
@@ -275,14 +296,33 @@ def get_chat_kb(chat_link: Optional[str]) -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@static_keyboard
 def get_mailing_kb() -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     builder.row(InlineKeyboardButton(text="Отмена рассылки", callback_data="start"))
     return builder.as_markup()
 
 
-def get_confirm_kb(active_id: Optional[str] = None) -> InlineKeyboardMarkup:
+@cached_keyboard
+def get_confirm_kb(
+    active_id: Optional[str] = None, prev_before: int = 0, next_after: int = 0
+) -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
+    pages = []
+    if prev_before:
+        pages.append(
+            InlineKeyboardButton(
+                text="<", callback_data=f"confirm_page_{active_id}_p_{prev_before}"
+            )
+        )
+    if next_after:
+        pages.append(
+            InlineKeyboardButton(
+                text=">", callback_data=f"confirm_page_{active_id}_n_{next_after}"
+            )
+        )
+    if pages:
+        builder.row(*pages)
     if active_id:
         builder.row(
             InlineKeyboardButton(
@@ -293,12 +333,14 @@ def get_confirm_kb(active_id: Optional[str] = None) -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@static_keyboard
 def get_add_confirm_kb() -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     builder.row(InlineKeyboardButton(text="Отмена", callback_data="show_confirms"))
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_quiz_kb(id: str | int) -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     builder.row(
@@ -313,6 +355,7 @@ def get_quiz_kb(id: str | int) -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_news_one_kb(news_id: str) -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     builder.row(
@@ -0,0 +1,109 @@
+from copy import deepcopy
+from functools import lru_cache, wraps
+from os import environ
+from typing import Callable, TypeVar
+
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+from pydantic import ConfigDict
+
+
+# Сколько клавиатур с параметрами хранится в каждом кэше
+KEYBOARD_CACHE_SIZE = int(environ.get("KEYBOARD_CACHE_SIZE", 1024))
+
+
+F = TypeVar("F", bound=Callable[..., InlineKeyboardMarkup])
+
+
+class _FrozenRows(list):
+    """
+    Список строк (или кнопок в строке) общей клавиатуры, который нельзя
+    изменить. Он остается списком, поэтому aiogram сериализует его как обычно.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Клавиатура из кэша общая, постройте новую через __wrapped__")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+
+    def __deepcopy__(self, memo: dict) -> list:
+        return [deepcopy(item, memo) for item in self]
+
+    def __reduce_ex__(self, protocol):
+        return list, (list(self),)
+
+
+class FrozenInlineKeyboardButton(InlineKeyboardButton):
+    """Кнопка общей клавиатуры: присваивание полей запрещено."""
+
+    model_config = ConfigDict(frozen=True)
+
+
+class FrozenInlineKeyboardMarkup(InlineKeyboardMarkup):
+    """Общая клавиатура из кэша: ни поля, ни строки, ни кнопки не изменяются."""
+
+    model_config = ConfigDict(frozen=True)
+
+    def __eq__(self, other: object) -> bool:
+        # pydantic считает модели разных классов неравными, а клавиатуру
+        # из кэша сравнивают с клавиатурой сообщения (InlineKeyboardMarkup)
+        if isinstance(other, InlineKeyboardMarkup):
+            return self.model_dump() == other.model_dump()
+        return NotImplemented
+
+
+def _freeze(markup: InlineKeyboardMarkup) -> FrozenInlineKeyboardMarkup:
+    """
+    Возвращает неизменяемую копию клавиатуры. В aiogram клавиатура и кнопки
+    изменяемые, а общий объект из кэша не должен меняться у всех сразу.
+    """
+    frozen = FrozenInlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                FrozenInlineKeyboardButton(**button.model_dump(exclude_unset=True))
+                for button in row
+            ]
+            for row in markup.inline_keyboard
+        ]
+    )
+    # Присваивание полей запрещено, поэтому списки подменяем напрямую
+    frozen.__dict__["inline_keyboard"] = _FrozenRows(
+        _FrozenRows(row) for row in frozen.inline_keyboard
+    )
+    return frozen
+
+
+def static_keyboard(
+    build: Callable[[], InlineKeyboardMarkup]
+) -> Callable[[], InlineKeyboardMarkup]:
+    """
+    Декоратор для клавиатур без параметров: клавиатура строится один раз
+    при импорте модуля, и дальше все вызовы возвращают один и тот же
+    неизменяемый объект.
+
+    Исходная функция доступна как __wrapped__.
+    """
+    markup = _freeze(build())
+
+    @wraps(build)
+    def get() -> InlineKeyboardMarkup:
+        return markup
+
+    return get
+
+
+def cached_keyboard(build: F) -> F:
+    """
+    Декоратор для клавиатур с параметрами: одинаковые параметры возвращают
+    уже построенную неизменяемую клавиатуру, кэш ограничен KEYBOARD_CACHE_SIZE.
+
+    Исходная функция доступна как __wrapped__.
+    """
+
+    @lru_cache(maxsize=KEYBOARD_CACHE_SIZE)
+    @wraps(build)
+    def get(*args, **kwargs) -> InlineKeyboardMarkup:
+        return _freeze(build(*args, **kwargs))
+
+    get.__wrapped__ = build
+    return get
@@ -2,7 +2,10 @@ from typing import List, Optional
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
+from app.keyboards.cache import cached_keyboard, static_keyboard
 
+
+@static_keyboard
 def get_moder_kb() -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
 
@@ -13,6 +16,7 @@ def get_moder_kb() -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@static_keyboard
 def get_back_kb() -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
 
@@ -21,6 +25,7 @@ def get_back_kb() -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_chat_kb(chat_link: Optional[str] = "") -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     if chat_link:
@@ -29,6 +34,7 @@ def get_chat_kb(chat_link: Optional[str] = "") -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@static_keyboard
 def get_question_kb() -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     builder.row(
@@ -1,7 +1,10 @@
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
+from app.keyboards.cache import cached_keyboard, static_keyboard
 
+
+@static_keyboard
 def get_user_kb() -> InlineKeyboardMarkup:
     kb = InlineKeyboardBuilder()
 
@@ -19,6 +22,7 @@ def get_user_kb() -> InlineKeyboardMarkup:
     return kb.as_markup()
 
 
+@cached_keyboard
 def get_confirm_mailing_kb(active_id: str) -> InlineKeyboardMarkup:
     kb = InlineKeyboardBuilder()
     kb.row(
@@ -30,6 +34,7 @@ def get_confirm_mailing_kb(active_id: str) -> InlineKeyboardMarkup:
     return kb.as_markup()
 
 
+@static_keyboard
 def get_back_kb() -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
 
@@ -0,0 +1,4 @@
+from .role import RoleMiddleware
+from .throttling import ThrottlingMiddleware, get_throttle_stats
+
+__all__ = ["RoleMiddleware", "ThrottlingMiddleware", "get_throttle_stats"]
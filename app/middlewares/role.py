@@ -0,0 +1,41 @@
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import CallbackQuery, Message, TelegramObject
+
+from app.utils.ranks import get_role
+
+
+class RoleMiddleware(BaseMiddleware):
+    """
+    Внешний middleware, который один раз определяет роль отправителя
+    и кладет ее в данные обработчиков под ключом "role".
+
+    Фильтры роутеров сравнивают уже вычисленную роль, поэтому стоимость
+    выбора роутера не зависит от их количества и порядка.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        """
+        :param handler: Следующий обработчик в цепочке.
+        :param event: Сообщение или callback-запрос.
+        :param data: Данные, передаваемые обработчикам.
+        :return: Результат обработчика.
+        """
+        if isinstance(event, Message):
+            chat, user = event.chat, event.from_user
+        elif isinstance(event, CallbackQuery) and event.message:
+            chat, user = event.message.chat, event.from_user
+        else:
+            chat, user = None, None
+
+        if chat is not None and user is not None:
+            data["role"] = get_role(chat.type, chat.id, user.id)
+        else:
+            data["role"] = None
+        return await handler(event, data)
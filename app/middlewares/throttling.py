@@ -0,0 +1,151 @@
+from os import environ
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from aiogram import BaseMiddleware
+from aiogram.types import CallbackQuery, Message, TelegramObject
+from cachetools import TTLCache
+
+from app.utils.ranks import ROLE_ADMIN, ROLE_MODER, ROLE_SUBADMIN
+
+
+# Скорость пополнения (событий в секунду) и емкость корзины для каждого типа обновлений
+THROTTLE_MESSAGE_RATE = float(environ.get("THROTTLE_MESSAGE_RATE", 1))
+THROTTLE_MESSAGE_BURST = int(environ.get("THROTTLE_MESSAGE_BURST", 5))
+THROTTLE_CALLBACK_RATE = float(environ.get("THROTTLE_CALLBACK_RATE", 2))
+THROTTLE_CALLBACK_BURST = int(environ.get("THROTTLE_CALLBACK_BURST", 10))
+# Сколько корзин хранить и через сколько секунд без событий забывать корзину
+THROTTLE_CACHE_SIZE = int(environ.get("THROTTLE_CACHE_SIZE", 100000))
+THROTTLE_TTL = int(environ.get("THROTTLE_TTL", 60))
+# Как часто (в секундах) в лог пишется количество отброшенных обновлений
+THROTTLE_REPORT_INTERVAL = int(environ.get("THROTTLE_REPORT_INTERVAL", 60))
+
+# Сотрудники вводят многошаговые диалоги (рассылки, конкурсы), их не ограничиваем
+STAFF_ROLES = frozenset((ROLE_ADMIN, ROLE_SUBADMIN, ROLE_MODER))
+
+THROTTLE_WARNING = "Слишком много запросов. Подождите немного"
+
+throttle_stats = {"message": 0, "callback_query": 0}
+
+
+class _Bucket:
+    """Корзина токенов одного пользователя для одного типа обновлений."""
+
+    __slots__ = ("tokens", "updated", "warned")
+
+    def __init__(self, tokens: float, updated: float) -> None:
+        self.tokens = tokens
+        self.updated = updated
+        self.warned = False
+
+
+def get_throttle_stats() -> Dict[str, int]:
+    """
+    Возвращает количество отброшенных обновлений по типам.
+    """
+    return dict(throttle_stats)
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """
+    Внешний middleware, который ограничивает частоту сообщений
+    и callback-запросов каждого пользователя в личном чате.
+
+    У каждой пары (пользователь, тип обновления) есть корзина токенов;
+    обновление без токена отбрасывается до обработчиков. Корзины хранятся
+    в TTLCache и забываются после THROTTLE_TTL секунд без событий.
+    Администраторы, субадминистраторы и модераторы не ограничиваются;
+    middleware должен стоять после RoleMiddleware.
+
+    Корзины у каждого процесса свои, поэтому при WORKERS > 1 пользователь,
+    чьи обновления попадают в разные процессы, получает до WORKERS раз
+    больше заданного лимита. Для защиты от флуда этого достаточно,
+    а общее хранилище стоило бы запроса на каждое обновление.
+    """
+
+    def __init__(self) -> None:
+        self._buckets: TTLCache = TTLCache(THROTTLE_CACHE_SIZE, THROTTLE_TTL)
+        self._reported = monotonic()
+
+    def _take(
+        self, key: Tuple[int, str], rate: float, burst: int
+    ) -> Optional[_Bucket]:
+        """
+        Пополняет корзину за прошедшее время и забирает из нее токен.
+
+        :return: None, если токен забран и обновление можно обработать;
+            иначе корзина, в которой нет токенов.
+        """
+        now = monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = _Bucket(burst, now)
+        else:
+            bucket.tokens = min(burst, bucket.tokens + (now - bucket.updated) * rate)
+            bucket.updated = now
+        if bucket.tokens >= 1:
+            bucket.tokens -= 1
+            bucket.warned = False
+            allowed = True
+        else:
+            allowed = False
+        # Повторная запись продлевает срок жизни корзины
+        self._buckets[key] = bucket
+        return None if allowed else bucket
+
+    def _report(self) -> None:
+        """
+        Пишет в лог счетчики отброшенных обновлений не чаще,
+        чем раз в THROTTLE_REPORT_INTERVAL секунд.
+        """
+        now = monotonic()
+        if now - self._reported < THROTTLE_REPORT_INTERVAL:
+            return
+        self._reported = now
+        stats = get_throttle_stats()
+        print(
+            "Отброшено слишком частых обновлений: "
+            f"сообщений {stats['message']}, "
+            f"callback-запросов {stats['callback_query']}"
+        )
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        """
+        :param handler: Следующий обработчик в цепочке.
+        :param event: Сообщение или callback-запрос.
+        :param data: Данные, передаваемые обработчикам.
+        :return: Результат обработчика или None, если обновление отброшено.
+        """
+        if isinstance(event, Message):
+            chat, kind = event.chat, "message"
+            rate, burst = THROTTLE_MESSAGE_RATE, THROTTLE_MESSAGE_BURST
+        elif isinstance(event, CallbackQuery) and event.message:
+            chat, kind = event.message.chat, "callback_query"
+            rate, burst = THROTTLE_CALLBACK_RATE, THROTTLE_CALLBACK_BURST
+        else:
+            return await handler(event, data)
+
+        if chat.type != "private" or event.from_user is None:
+            return await handler(event, data)
+        if data.get("role") in STAFF_ROLES:
+            return await handler(event, data)
+
+        bucket = self._take((event.from_user.id, kind), rate, burst)
+        if bucket is None:
+            return await handler(event, data)
+
+        throttle_stats[kind] += 1
+        self._report()
+        if isinstance(event, CallbackQuery):
+            # Без ответа у пользователя крутится индикатор загрузки на кнопке
+            await event.answer(THROTTLE_WARNING)
+        elif not bucket.warned:
+            # Предупреждаем один раз, пока пользователь не перестанет спешить
+            await event.answer(THROTTLE_WARNING)
+        bucket.warned = True
+        return None
@@ -0,0 +1,285 @@
+import asyncio
+import json
+from os import environ
+from typing import Any, Dict, NamedTuple, Optional, Protocol
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import (
+    BaseStorage,
+    DefaultKeyBuilder,
+    StateType,
+    StorageKey,
+)
+from aiogram.fsm.storage.memory import MemoryStorage
+from cachetools import TTLCache
+from redis.asyncio import Redis
+
+from app.config.workers import WORKERS
+from app.database.actions import (
+    delete_expired_fsm_records,
+    get_fsm_record,
+    save_fsm_records,
+)
+from app.utils.notify import get_redis
+
+
+# Где хранятся состояния: memory, mysql или redis.
+# По умолчанию redis, если задан REDIS_URL, иначе memory.
+FSM_STORAGE = environ.get("FSM_STORAGE", "redis" if get_redis() else "memory")
+# Через сколько секунд без изменений брошенный диалог забывается
+FSM_TTL = int(environ.get("FSM_TTL", 24 * 3600))
+# Как часто (в секундах) накопленные изменения записываются в хранилище
+FSM_FLUSH_INTERVAL = float(environ.get("FSM_FLUSH_INTERVAL", 0.2))
+# Сколько секунд состояние читается из локального кэша
+FSM_CACHE_TTL = float(environ.get("FSM_CACHE_TTL", 60))
+FSM_CACHE_SIZE = int(environ.get("FSM_CACHE_SIZE", 10000))
+# Как часто (в секундах) из MySQL удаляются устаревшие состояния
+FSM_PURGE_INTERVAL = float(environ.get("FSM_PURGE_INTERVAL", 3600))
+
+
+class Record(NamedTuple):
+    """Состояние пользователя и данные диалога."""
+
+    state: Optional[str]
+    data: Dict[str, Any]
+
+
+EMPTY = Record(None, {})
+
+
+class Backend(Protocol):
+    """Хранилище, в которое BufferedStorage пишет пачками."""
+
+    async def read(self, key: str) -> Record: ...
+
+    async def write_many(self, records: Dict[str, Record]) -> bool: ...
+
+    async def close(self) -> None: ...
+
+
+class MySQLBackend:
+    """
+    Состояния в таблице fsm_states, доступ через общий пул aiomysql.
+    Просроченные записи не читаются и периодически удаляются.
+    """
+
+    def __init__(self, ttl: int = FSM_TTL) -> None:
+        self.ttl = ttl
+
+    async def read(self, key: str) -> Record:
+        record = await get_fsm_record(key)
+        if not record:
+            return EMPTY
+        state, data = record
+        return Record(state, json.loads(data) if data else {})
+
+    async def write_many(self, records: Dict[str, Record]) -> bool:
+        return await save_fsm_records(
+            [
+                (key, record.state, json.dumps(record.data))
+                for key, record in records.items()
+            ],
+            self.ttl,
+        )
+
+    async def purge(self) -> None:
+        await delete_expired_fsm_records()
+
+    async def close(self) -> None:
+        pass  # Пул соединений закрывается вместе с приложением
+
+
+class RedisBackend:
+    """
+    Состояния в Redis: по ключу на состояние и на данные, с TTL.
+    Пачка изменений записывается одним pipeline.
+    """
+
+    def __init__(self, redis: Redis, ttl: int = FSM_TTL) -> None:
+        self.redis = redis
+        self.ttl = ttl
+
+    async def read(self, key: str) -> Record:
+        state, data = await self.redis.mget(f"{key}:state", f"{key}:data")
+        return Record(
+            state.decode() if state else None,
+            json.loads(data) if data else {},
+        )
+
+    async def write_many(self, records: Dict[str, Record]) -> bool:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key, record in records.items():
+                if record.state is None:
+                    pipe.delete(f"{key}:state")
+                else:
+                    pipe.set(f"{key}:state", record.state, ex=self.ttl)
+                if record.data:
+                    data = json.dumps(record.data)
+                    pipe.set(f"{key}:data", data, ex=self.ttl)
+                else:
+                    pipe.delete(f"{key}:data")
+            await pipe.execute()
+        return True
+
+    async def close(self) -> None:
+        pass  # Клиент Redis общий, его закрывает app.utils.notify
+
+
+class BufferedStorage(BaseStorage):
+    """
+    Хранилище FSM с локальным кэшем чтения и пакетной записью.
+
+    Чтение берет состояние из кэша, а при промахе загружает состояние
+    и данные одним запросом. Запись сразу обновляет кэш, а в хранилище
+    изменения уходят пачкой раз в FSM_FLUSH_INTERVAL секунд; при остановке
+    бота несохраненные изменения записываются.
+
+    Если процессов несколько (write_through), следующее обновление
+    пользователя может попасть в другой процесс. Тогда кэш не используется,
+    а каждое изменение записывается в хранилище до возврата из set_state
+    и set_data.
+    """
+
+    def __init__(
+        self,
+        backend: Backend,
+        flush_interval: float = FSM_FLUSH_INTERVAL,
+        cache_ttl: float = FSM_CACHE_TTL,
+        cache_size: int = FSM_CACHE_SIZE,
+        write_through: bool = WORKERS > 1,
+    ) -> None:
+        self.backend = backend
+        self.flush_interval = flush_interval
+        self.write_through = write_through
+        self.key_builder = DefaultKeyBuilder(with_destiny=True)
+        self._cache: TTLCache = TTLCache(cache_size, cache_ttl)
+        self._dirty: Dict[str, Record] = {}
+        self._flusher: Optional[asyncio.Task] = None
+
+    async def _get(self, key: StorageKey) -> Record:
+        id = self.key_builder.build(key)
+        if id in self._dirty:
+            return self._dirty[id]
+        if self.write_through:
+            return await self.backend.read(id)
+        record = self._cache.get(id)
+        if record is None:
+            record = await self.backend.read(id)
+            self._cache[id] = record
+        return record
+
+    async def _put(self, key: StorageKey, record: Record) -> None:
+        id = self.key_builder.build(key)
+        if self.write_through:
+            try:
+                if await self.backend.write_many({id: record}):
+                    # Более старое несохраненное изменение больше не нужно
+                    self._dirty.pop(id, None)
+                    return
+            except Exception as e:
+                print(e)
+            # Не теряем изменение: повторим запись в фоне
+            print("Не удалось сохранить состояние, повторим позже")
+        else:
+            self._cache[id] = record
+        self._dirty[id] = record
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        # Изменения, пришедшие во время записи, попадут в следующую пачку
+        self._flusher = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """
+        Записывает накопленные изменения в хранилище одной пачкой.
+        Если запись не удалась, изменения остаются в очереди
+        до следующей попытки.
+        """
+        if not self._dirty:
+            return
+        batch, self._dirty = self._dirty, {}
+        try:
+            saved = await self.backend.write_many(batch)
+        except Exception as e:
+            print(e)
+            saved = False
+        if not saved:
+            print("Не удалось сохранить состояния, повторим позже")
+            # Более новые изменения, пришедшие во время записи, важнее
+            self._dirty = {**batch, **self._dirty}
+            if self._flusher is None or self._flusher.done():
+                self._flusher = asyncio.create_task(self._flush_later())
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        record = await self._get(key)
+        state = state.state if isinstance(state, State) else state
+        await self._put(key, Record(state, record.data))
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        return (await self._get(key)).state
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        record = await self._get(key)
+        await self._put(key, Record(record.state, data.copy()))
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        return (await self._get(key)).data.copy()
+
+    async def close(self) -> None:
+        if self._flusher is not None and not self._flusher.done():
+            self._flusher.cancel()
+        await self.flush()
+        await self.backend.close()
+
+
+async def _purge_expired(backend: MySQLBackend) -> None:
+    while True:
+        await backend.purge()
+        await asyncio.sleep(FSM_PURGE_INTERVAL)
+
+
+_purger: Optional[asyncio.Task] = None
+
+
+async def start_fsm_purger(dispatcher) -> None:
+    """
+    Запускает периодическое удаление устаревших состояний из MySQL.
+    Вызывается при старте диспетчера; для остальных хранилищ ничего не делает.
+    """
+    global _purger
+    storage = dispatcher.storage
+    if isinstance(storage, BufferedStorage) and isinstance(
+        storage.backend, MySQLBackend
+    ):
+        if _purger is None or _purger.done():
+            _purger = asyncio.create_task(_purge_expired(storage.backend))
+
+
+async def stop_fsm_purger() -> None:
+    global _purger
+    if _purger is not None:
+        _purger.cancel()
+        await asyncio.gather(_purger, return_exceptions=True)
+        _purger = None
+
+
+def get_storage() -> BaseStorage:
+    """
+    Возвращает хранилище состояний FSM, выбранное переменной FSM_STORAGE.
+
+    mysql и redis доступны всем процессам бота и переживают перезапуск,
+    memory хранит состояния только в памяти текущего процесса.
+    """
+    if FSM_STORAGE == "mysql":
+        return BufferedStorage(MySQLBackend())
+    if FSM_STORAGE == "redis":
+        redis = get_redis()
+        if redis is None:
+            raise Exception(
+                "Для FSM_STORAGE=redis нужна переменная окружения 'REDIS_URL'"
+            )
+        return BufferedStorage(RedisBackend(redis))
+    return MemoryStorage()
@@ -1,6 +1,8 @@
 from aiogram import Bot
 
 from app.keyboards.moder import get_question_kb
+from app.utils.assignment import choose_moder, notify_moder, track_question
+from app.utils.questions import register_question
 from app.utils.ranks import get_chat_id
 
 
@@ -21,17 +23,28 @@ async def ask_question(
     1. Получаем ID чата поддержки с помощью функции get_chat_id().
     2. Если ID чата поддержки не найден, возвращаем False.
     3. Отправляем сообщение в чат поддержки, используя объект бота.
-       - Форматируем текст сообщения, включая ID чата, ID сообщения и имя пользователя.
+       - Форматируем текст сообщения, включая имя пользователя.
        - Добавляем клавиатуру с возможными действиями с помощью функции get_question_kb().
-    4. Возвращаем True, если сообщение отправлено успешно.
+    4. Выбираем модератора с помощью функции choose_moder().
+    5. Регистрируем вопрос: сообщение в чате поддержки -> чат и сообщение пользователя
+       и назначенный модератор. Если вопрос не сохранился, удаляем сообщение,
+       на которое нельзя будет ответить.
+    6. Уведомляем назначенного модератора и возвращаем True.
     """
     chat = await get_chat_id()
     if not chat:
         return False
 
-    await bot.send_message(
+    sent = await bot.send_message(
         chat,
-        f"Вопрос[{chat_id}, {msg_id}]:\nВопрос от {username}:\n{text}",
+        f"Вопрос от {username}:\n{text}",
         reply_markup=get_question_kb(),
     )
+    moder_id = await choose_moder()
+    if not await register_question(chat, sent.message_id, chat_id, msg_id, moder_id):
+        await sent.delete()
+        return False
+    track_question(chat, sent.message_id, moder_id)
+    if moder_id is not None:
+        await notify_moder(bot, moder_id, chat, sent.message_id)
     return True
@@ -0,0 +1,191 @@
+import asyncio
+from os import environ
+from typing import Dict, List, Optional, Tuple
+
+from aiogram import Bot
+
+from app.config.workers import is_primary_worker
+from app.database.actions import (
+    assign_question,
+    get_open_question_loads,
+    get_stale_questions,
+)
+from app.utils.ranks import get_moders
+
+
+# Как выбирать модератора для нового вопроса: least_loaded или round_robin
+QUESTION_ASSIGN_STRATEGY = environ.get("QUESTION_ASSIGN_STRATEGY", "least_loaded")
+# Через сколько секунд без ответа вопрос передается другому модератору
+QUESTION_REASSIGN_AFTER = int(environ.get("QUESTION_REASSIGN_AFTER", 600))
+# Как часто (в секундах) проверяются неотвеченные вопросы
+QUESTION_QUEUE_INTERVAL = int(environ.get("QUESTION_QUEUE_INTERVAL", 60))
+QUESTION_REASSIGN_BATCH = 100  # Сколько вопросов переназначается за одну проверку
+# Как часто (в секундах) каждый процесс сверяет очереди модераторов с БД
+QUESTION_LOADS_INTERVAL = int(environ.get("QUESTION_LOADS_INTERVAL", 30))
+
+# Открытые вопросы каждого модератора. Другие процессы тоже назначают
+# и закрывают вопросы, поэтому каждый процесс раз в QUESTION_LOADS_INTERVAL
+# секунд сверяет счетчики с БД, а между сверками они приблизительные
+_loads: Dict[int, int] = {}
+# Вопросы, назначенные этим процессом: (id чата поддержки, id сообщения) -> модератор
+_assigned: Dict[Tuple[int, int], int] = {}
+_next = 0
+_worker: Optional[asyncio.Task] = None
+_loads_worker: Optional[asyncio.Task] = None
+
+
+async def choose_moder(exclude: Optional[int] = None) -> Optional[int]:
+    """
+    Выбирает модератора для вопроса.
+
+    :param exclude: ID модератора, которому вопрос передавать не нужно.
+    :return: ID модератора или None, если модераторов нет.
+
+    Внутренний процесс:
+    1. Берем модераторов из кэша рангов, кроме exclude.
+    2. round_robin: выбираем модераторов по очереди.
+       least_loaded: выбираем модератора с наименьшим числом открытых вопросов;
+       при равенстве - по очереди, чтобы вопросы не доставались одному.
+    """
+    global _next
+    moders: List[int] = [int(id) for id in await get_moders() if int(id) != exclude]
+    if not moders:
+        return None
+
+    _next += 1
+    if QUESTION_ASSIGN_STRATEGY == "round_robin":
+        return moders[_next % len(moders)]
+    start = _next % len(moders)
+    rotated = moders[start:] + moders[:start]
+    return min(rotated, key=lambda id: _loads.get(id, 0))
+
+
+def track_question(
+    support_chat_id: int, support_message_id: int, moder_id: Optional[int]
+) -> None:
+    """
+    Учитывает назначенный вопрос в очереди модератора.
+    """
+    if moder_id is None:
+        return
+    _assigned[(support_chat_id, support_message_id)] = moder_id
+    _loads[moder_id] = _loads.get(moder_id, 0) + 1
+
+
+def release_question(support_chat_id: int, support_message_id: int) -> None:
+    """
+    Убирает закрытый вопрос из очереди модератора.
+    """
+    moder_id = _assigned.pop((support_chat_id, support_message_id), None)
+    if moder_id is not None and _loads.get(moder_id, 0) > 0:
+        _loads[moder_id] -= 1
+
+
+def get_queue_depth(moder_id: int | str) -> int:
+    """
+    Возвращает количество открытых вопросов, назначенных модератору.
+    """
+    return _loads.get(int(moder_id), 0)
+
+
+async def refresh_loads() -> None:
+    """
+    Пересчитывает очереди модераторов по БД.
+    """
+    global _loads
+    _loads = {moder_id: count for moder_id, count in await get_open_question_loads()}
+
+
+async def notify_moder(
+    bot: Bot, moder_id: int, support_chat_id: int, support_message_id: int
+) -> None:
+    """
+    Присылает модератору копию назначенного ему вопроса.
+    Ответить на вопрос по-прежнему нужно в чате поддержки.
+    """
+    try:
+        await bot.send_message(
+            moder_id,
+            f"Вам назначен вопрос. Очередь: {get_queue_depth(moder_id)}",
+        )
+        await bot.copy_message(moder_id, support_chat_id, support_message_id)
+    except Exception as e:
+        # Модератор мог не запускать бота
+        print(e)
+        print("Не удалось уведомить модератора", moder_id)
+
+
+async def reassign_stale_questions(bot: Bot) -> int:
+    """
+    Передает другим модераторам вопросы, которые не назначены
+    или остались без ответа дольше QUESTION_REASSIGN_AFTER секунд.
+
+    :param bot: Объект бота, который уведомляет модераторов.
+    :return: Количество переназначенных вопросов.
+    """
+    await refresh_loads()
+    reassigned = 0
+    for support_chat_id, support_message_id, moder_id in await get_stale_questions(
+        QUESTION_REASSIGN_AFTER, QUESTION_REASSIGN_BATCH
+    ):
+        new_moder = await choose_moder(exclude=moder_id)
+        if new_moder is None:
+            continue
+        if not await assign_question(
+            support_chat_id, support_message_id, new_moder, moder_id
+        ):
+            continue  # вопрос закрыт или уже переназначен
+        if moder_id is not None and _loads.get(moder_id, 0) > 0:
+            _loads[moder_id] -= 1
+        track_question(support_chat_id, support_message_id, new_moder)
+        await notify_moder(bot, new_moder, support_chat_id, support_message_id)
+        reassigned += 1
+    return reassigned
+
+
+async def _queue_worker(bot: Bot) -> None:
+    while True:
+        await asyncio.sleep(QUESTION_QUEUE_INTERVAL)
+        try:
+            reassigned = await reassign_stale_questions(bot)
+            if reassigned:
+                print("Переназначено вопросов:", reassigned)
+        except Exception as e:
+            print(e)
+            print("Не получилось переназначить вопросы")
+
+
+async def _refresh_loads_worker() -> None:
+    while True:
+        await asyncio.sleep(QUESTION_LOADS_INTERVAL)
+        try:
+            await refresh_loads()
+        except Exception as e:
+            print(e)
+            print("Не получилось обновить очереди модераторов")
+
+
+async def start_question_queue(bot: Bot) -> None:
+    """
+    Загружает очереди модераторов и запускает их периодическую сверку с БД
+    в каждом процессе. Переназначение неотвеченных вопросов выполняет только
+    основной процесс. Вызывается при старте диспетчера.
+    """
+    global _worker, _loads_worker
+    await refresh_loads()
+    if _loads_worker is None or _loads_worker.done():
+        _loads_worker = asyncio.create_task(_refresh_loads_worker())
+    if is_primary_worker() and (_worker is None or _worker.done()):
+        _worker = asyncio.create_task(_queue_worker(bot))
+
+
+async def stop_question_queue() -> None:
+    """
+    Останавливает сверку очередей и переназначение вопросов.
+    """
+    global _worker, _loads_worker
+    for task in (_worker, _loads_worker):
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+    _worker = _loads_worker = None
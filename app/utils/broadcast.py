@@ -0,0 +1,283 @@
+import asyncio
+from collections import deque
+from os import environ
+from time import monotonic
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from aiogram import Bot
+from aiogram.exceptions import (
+    TelegramBadRequest,
+    TelegramForbiddenError,
+    TelegramRetryAfter,
+)
+from aiogram.types import InlineKeyboardMarkup
+
+
+MAILING_RATE = float(environ.get("MAILING_RATE", 28))  # Сообщений в секунду
+MAILING_WORKERS = int(environ.get("MAILING_WORKERS", 16))  # Параллельных отправителей
+MAILING_RETRIES = int(environ.get("MAILING_RETRIES", 5))  # Попыток на одно сообщение
+# Сколько секунд после flood-wait скорость остается сниженной
+MAILING_FLOOD_COOLDOWN = float(environ.get("MAILING_FLOOD_COOLDOWN", 30))
+# Как часто (в секундах) сохраняется прогресс рассылки
+MAILING_CHECKPOINT = float(environ.get("MAILING_CHECKPOINT", 5))
+
+
+class TokenBucket:
+    """
+    Ограничитель скорости по алгоритму token bucket.
+
+    Токены пополняются со скоростью rate в секунду, но не более capacity.
+    Каждая отправка забирает один токен; если токенов нет, отправитель ждет.
+
+    После сигнала flood-wait от Telegram ограничитель приостанавливает всех
+    отправителей на указанное время и вдвое снижает скорость. Если в течение
+    cooldown секунд новых сигналов не было, скорость плавно возвращается
+    к исходной.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        cooldown: float = MAILING_FLOOD_COOLDOWN,
+    ) -> None:
+        """
+        :param rate: Скорость пополнения токенов (в секунду).
+        :param capacity: Максимальное количество накопленных токенов.
+        :param cooldown: Время после flood-wait, в течение которого скорость снижена.
+        """
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.cooldown = cooldown
+        self._tokens = self.capacity
+        self._updated = monotonic()
+        self._paused_until = 0.0
+        self._last_flood = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = monotonic()
+        elapsed = now - self._updated
+        if self.rate < self.base_rate and now - self._last_flood > self.cooldown:
+            # Аддитивно возвращаем скорость: +1 сообщение/с за каждую секунду
+            self.rate = min(self.base_rate, self.rate + elapsed)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def penalize(self, retry_after: float) -> None:
+        """
+        Обрабатывает flood-wait: приостанавливает выдачу токенов
+        на retry_after секунд и снижает скорость.
+
+        :param retry_after: Время ожидания, которое вернул Telegram (в секундах).
+        """
+        now = monotonic()
+        self._paused_until = max(self._paused_until, now + retry_after)
+        if now - self._last_flood > retry_after:
+            # Несколько отправителей могут получить один и тот же сигнал,
+            # снижаем скорость только один раз на каждую паузу
+            self.rate = max(1.0, self.rate / 2)
+        self._last_flood = now
+        self._tokens = 0
+
+    async def acquire(self) -> None:
+        """
+        Ожидает, пока не освободится токен, и забирает его.
+        Ожидающие обслуживаются в порядке очереди.
+        """
+        async with self._lock:
+            while True:
+                pause = self._paused_until - monotonic()
+                if pause > 0:
+                    await asyncio.sleep(pause)
+                    self._updated = monotonic()
+                    continue
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+# Общий на весь процесс ограничитель: лимит Telegram действует на бота целиком,
+# поэтому одновременные рассылки делят его между собой.
+limiter = TokenBucket(MAILING_RATE)
+
+ProgressCallback = Callable[["Broadcast"], Awaitable[None]]
+Recipients = Union[Iterable[int], AsyncIterable[int]]
+
+
+async def _iterate(ids: Recipients) -> AsyncIterator[int]:
+    """
+    Позволяет одинаково перебирать обычные и асинхронные источники id.
+    """
+    if hasattr(ids, "__aiter__"):
+        async for id in ids:
+            yield id
+    else:
+        for id in ids:
+            yield id
+
+
+class Broadcast:
+    """
+    Рассылка одного сообщения пулом параллельных отправителей.
+
+    Получатели обрабатываются в порядке возрастания id. Атрибут cursor
+    хранит наибольший id, до которого включительно все получатели уже
+    обработаны, - по нему рассылку можно продолжить после перезапуска.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        text: str,
+        reply_markup: Optional[InlineKeyboardMarkup] = None,
+        workers: int = MAILING_WORKERS,
+    ) -> None:
+        """
+        :param bot: Объект бота, который отправляет сообщение.
+        :param text: Текст сообщения.
+        :param reply_markup: Клавиатура сообщения.
+        :param workers: Количество параллельных отправителей.
+        """
+        self.bot = bot
+        self.text = text
+        self.reply_markup = reply_markup
+        self.workers = workers
+        self.sent = 0
+        self.failed = 0
+        self.cursor = 0
+        self._dispatched: deque = deque()
+        self._done: Set[int] = set()
+
+    def _complete(self, id: int) -> None:
+        """
+        Отмечает получателя обработанным и сдвигает курсор
+        по непрерывному префиксу обработанных id.
+        """
+        self._done.add(id)
+        while self._dispatched and self._dispatched[0] in self._done:
+            self.cursor = self._dispatched.popleft()
+            self._done.discard(self.cursor)
+
+    async def _send(self, id: int) -> None:
+        """
+        Отправляет сообщение одному получателю, соблюдая общий лимит скорости.
+        При flood-wait сообщение повторяется после паузы, а не теряется.
+        """
+        try:
+            for _ in range(MAILING_RETRIES):
+                await limiter.acquire()
+                try:
+                    await self.bot.send_message(
+                        id, self.text, reply_markup=self.reply_markup
+                    )
+                    self.sent += 1
+                    return
+                except TelegramRetryAfter as e:
+                    # Ставим всю рассылку на паузу и повторяем это же сообщение
+                    limiter.penalize(e.retry_after)
+            print("Превышено число попыток отправки пользователю с id =", id)
+            self.failed += 1
+        except (TelegramForbiddenError, TelegramBadRequest):
+            # Пользователь заблокировал бота или чат не найден
+            self.failed += 1
+        except Exception as e:
+            print(e)
+            print("Не получилось отправить сообщение пользователю с id =", id)
+            self.failed += 1
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        while True:
+            id = await queue.get()
+            try:
+                await self._send(id)
+            except asyncio.CancelledError:
+                # Отправка прервана: получатель не обработан, и курсор
+                # не должен сдвинуться дальше него
+                queue.task_done()
+                raise
+            self._complete(id)
+            queue.task_done()
+
+    async def _checkpoints(self, on_progress: ProgressCallback) -> None:
+        while True:
+            await asyncio.sleep(MAILING_CHECKPOINT)
+            try:
+                await on_progress(self)
+            except Exception as e:
+                print(e)
+                print("Не получилось сохранить прогресс рассылки")
+
+    async def run(
+        self, ids: Recipients, on_progress: Optional[ProgressCallback] = None
+    ) -> Tuple[int, int]:
+        """
+        Отправляет сообщение всем получателям из ids.
+
+        Args:
+            ids (Iterable[int] | AsyncIterable[int]): id получателей
+                в порядке возрастания.
+            on_progress: корутина, которая раз в MAILING_CHECKPOINT секунд
+                и по завершении получает эту рассылку для сохранения прогресса.
+
+        Returns:
+            Tuple[int, int]: количество доставленных и недоставленных сообщений.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.workers * 2)
+
+        tasks = [
+            asyncio.create_task(self._worker(queue)) for _ in range(self.workers)
+        ]
+        if on_progress:
+            tasks.append(asyncio.create_task(self._checkpoints(on_progress)))
+        try:
+            async for id in _iterate(ids):
+                self._dispatched.append(id)
+                await queue.put(id)
+            await queue.join()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if on_progress:
+            await on_progress(self)
+
+        return self.sent, self.failed
+
+
+async def broadcast(
+    bot: Bot,
+    ids: Recipients,
+    text: str,
+    reply_markup: Optional[InlineKeyboardMarkup] = None,
+    workers: int = MAILING_WORKERS,
+) -> Tuple[int, int]:
+    """
+    Отправляет сообщение всем пользователям из ids пулом
+    из workers параллельных отправителей.
+
+    Args:
+        bot (Bot): объект бота, который отправляет сообщение.
+        ids (Iterable[int] | AsyncIterable[int]): id получателей.
+        text (str): текст сообщения.
+        reply_markup (InlineKeyboardMarkup | None): клавиатура сообщения.
+        workers (int): количество параллельных отправителей.
+
+    Returns:
+        Tuple[int, int]: количество доставленных и недоставленных сообщений.
+    """
+    return await Broadcast(bot, text, reply_markup, workers).run(ids)
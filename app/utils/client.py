@@ -1,10 +1,15 @@
+import asyncio
 from os import environ
-from typing import Iterable, List
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, TypeVar
+from cachetools import TTLCache
 from pyrogram import Client
+from pyrogram.errors import FloodWait, PeerIdInvalid, UserIdInvalid
 from pyrogram.raw.functions.contacts import ResolveUsername
 from pyrogram.raw.functions.users.get_users import GetUsers
 from pyrogram.raw.base.contacts import ResolvedPeer
 
+from app.config.workers import get_worker_id
+
 
 def init_client():
     try:
@@ -24,24 +29,292 @@ def init_client():
         exit(code=403)
 
 
-async def get_usernames_by_ids(ids: List[str]):
+T = TypeVar("T")
+
+USERNAME_CACHE_SIZE = int(environ.get("USERNAME_CACHE_SIZE", 10000))
+USERNAME_CACHE_TTL = float(environ.get("USERNAME_CACHE_TTL", 3600))  # В секундах
+
+# Двунаправленный кэш id <-> username. Отсутствие username у пользователя
+# тоже кэшируется (значение None), а ненайденный username - нет.
+_usernames: TTLCache = TTLCache(USERNAME_CACHE_SIZE, USERNAME_CACHE_TTL)
+_ids: TTLCache = TTLCache(USERNAME_CACHE_SIZE, USERNAME_CACHE_TTL)
+# Запросы, которые уже выполняются: повторные обращения за тем же ключом
+# ждут их результата, а не идут в сеть
+_pending_usernames: Dict[int, asyncio.Future] = {}
+_pending_ids: Dict[str, asyncio.Future] = {}
+cache_stats = {"hits": 0, "misses": 0}
+
+# users.GetUsers принимает не больше 200 id за запрос
+GET_USERS_CHUNK = int(environ.get("GET_USERS_CHUNK", 200))
+# Сколько запросов users.GetUsers может выполняться одновременно
+GET_USERS_CONCURRENCY = int(environ.get("GET_USERS_CONCURRENCY", 4))
+_get_users_semaphore = asyncio.Semaphore(GET_USERS_CONCURRENCY)
+# Дольше скольких секунд FloodWait не ждем, а отказываемся от запроса
+GET_USERS_MAX_FLOOD_WAIT = int(environ.get("GET_USERS_MAX_FLOOD_WAIT", 60))
+# Ошибки, которые вызывает один недоступный id, а не пачка целиком
+PER_ID_ERRORS = (PeerIdInvalid, UserIdInvalid, KeyError)
+
+# Общий MTProto-клиент процесса: соединение и сессия открываются один раз
+_client: Optional[Client] = None
+_client_lock = asyncio.Lock()
+
+
+async def _start_client() -> Client:
+    """
+    Создает и запускает новый MTProto-клиент, закрывая предыдущий.
+    """
+    global _client
+    if _client is not None:
+        try:
+            await _client.stop()
+        except ConnectionError:
+            pass  # Клиент уже остановлен
+    # no_updates: обновления получает aiogram, MTProto-клиенту они не нужны
+    worker_id = get_worker_id()
+    if worker_id == 0:
+        client = Client("bot_distributor", no_updates=True)
+    else:
+        # Файл сессии SQLite нельзя делить между процессами,
+        # поэтому у каждого процесса своя сессия
+        client = Client(
+            f"bot_distributor_{worker_id}",
+            api_id=environ["API_ID"],
+            api_hash=environ["API_HASH"],
+            bot_token=environ["BOT_TOKEN"],
+            no_updates=True,
+        )
+    await client.start()
+    _client = client
+    return client
+
+
+async def get_client() -> Client:
+    """
+    Возвращает общий MTProto-клиент, при необходимости (пере)подключая его.
+    """
+    if _client is not None and _client.is_connected:
+        return _client
+    async with _client_lock:
+        if _client is not None and _client.is_connected:
+            return _client
+        return await _start_client()
+
+
+async def _with_client(call: Callable[[Client], Awaitable[T]]) -> T:
+    """
+    Выполняет запрос через общий клиент. Если соединение оборвалось,
+    переподключается и повторяет запрос один раз.
+    """
+    client = await get_client()
+    try:
+        return await call(client)
+    except (ConnectionError, OSError) as e:
+        print(e)
+        print("Соединение с MTProto API потеряно, переподключаемся")
+        async with _client_lock:
+            if _client is client:
+                await _start_client()
+        return await call(await get_client())
+
+
+async def start_client() -> None:
+    """
+    Запускает общий MTProto-клиент. Вызывается при старте диспетчера.
+    """
     try:
-        async with Client("bot_distributor") as client:
-            ids = [int(id.replace("\n", "")) for id in ids]
-            users = await client.get_users(ids)
-            return (
-                [user.username for user in users]
-                if isinstance(ids, Iterable)
-                else users.username
-            )
+        await get_client()
     except Exception as e:
         print(e)
-        return []
+        print("Не удалось подключиться к MTProto API, повторим при первом запросе")
+
+
+async def stop_client() -> None:
+    """
+    Останавливает общий MTProto-клиент. Вызывается при остановке диспетчера.
+    """
+    global _client
+    async with _client_lock:
+        if _client is not None:
+            try:
+                await _client.stop()
+            except ConnectionError:
+                pass
+            _client = None
+
+
+def _remember(id: int, username: Optional[str]) -> None:
+    """
+    Запоминает соответствие id и username в обе стороны.
+    """
+    _usernames[id] = username
+    if username:
+        _ids[username.lower()] = id
+
+
+def get_cache_stats() -> Dict[str, int]:
+    """
+    Возвращает количество попаданий и промахов кэша id <-> username.
+    """
+    return dict(cache_stats, size=len(_usernames) + len(_ids))
+
+
+def _fail(future: asyncio.Future, e: Exception) -> None:
+    """
+    Передает ошибку ждущим запроса. Ошибка помечается полученной, чтобы
+    asyncio не ругался на нее, если ждущих не было.
+    """
+    future.set_exception(e)
+    future.exception()
+
+
+async def _fetch_usernames(ids: List[int]) -> Dict[int, Optional[str]]:
+    """
+    Запрашивает username для ids одним запросом и кладет результат в кэш.
+    """
+    async with _get_users_semaphore:
+        users = await _with_client(lambda client: client.get_users(ids))
+    if not isinstance(users, list):
+        users = [users]
+    found = {}
+    for user in users:
+        _remember(user.id, user.username)
+        found[user.id] = user.username
+    return found
+
+
+async def _resolve_chunk(ids: List[int]) -> Dict[int, Optional[str]]:
+    """
+    Запрашивает username для одной пачки id. Если запрос не удался из-за
+    недоступного id, делит пачку пополам и повторяет, чтобы потерять только
+    проблемные id. При FloodWait ждет и повторяет пачку целиком, а прочие
+    ошибки (сеть, долгий FloodWait) пробрасывает: дробление их не исправит.
+    """
+    while True:
+        try:
+            return await _fetch_usernames(ids)
+        except FloodWait as e:
+            if e.value > GET_USERS_MAX_FLOOD_WAIT:
+                raise
+            print(e)
+            print(f"Повторим запрос username через {e.value} с")
+            await asyncio.sleep(e.value)
+        except PER_ID_ERRORS as e:
+            if len(ids) == 1:
+                print(e)
+                print("Не удалось получить username пользователя с id =", ids[0])
+                return {}
+            break
+    middle = len(ids) // 2
+    halves = await asyncio.gather(
+        _resolve_chunk(ids[:middle]), _resolve_chunk(ids[middle:])
+    )
+    return {**halves[0], **halves[1]}
+
+
+async def _wait_pending(id: int, future: asyncio.Future) -> Dict[int, Optional[str]]:
+    try:
+        return {id: await asyncio.shield(future)}
+    except Exception:
+        return {}  # Ошибку уже залогировал тот, кто выполнял запрос
+
+
+async def resolve_usernames(ids: Iterable[int | str]) -> Dict[int, Optional[str]]:
+    """
+    Возвращает словарь id -> username для ids.
+
+    Найденные в кэше id не запрашиваются, а id, которые уже запрашиваются
+    другим обработчиком, ждут его результата. Остальные id делятся на пачки
+    по GET_USERS_CHUNK, которые запрашиваются параллельно, но не более
+    GET_USERS_CONCURRENCY одновременно. id, которые не удалось получить,
+    в словарь не попадают; у пользователей без username значение None.
+    """
+    found: Dict[int, Optional[str]] = {}
+    waiting = {}
+    futures: Dict[int, asyncio.Future] = {}
+    loop = asyncio.get_running_loop()
+    for id in dict.fromkeys(int(str(id).strip()) for id in ids):
+        if id in _usernames:
+            cache_stats["hits"] += 1
+            found[id] = _usernames[id]
+        elif id in _pending_usernames:
+            cache_stats["hits"] += 1
+            waiting[id] = _pending_usernames[id]
+        else:
+            cache_stats["misses"] += 1
+            # Регистрируем запрос до первого await, чтобы одновременные
+            # обращения за тем же id ждали его, а не шли в сеть
+            futures[id] = _pending_usernames[id] = loop.create_future()
+
+    missing = list(futures)
+    try:
+        results = await asyncio.gather(
+            *(
+                _resolve_chunk(missing[i : i + GET_USERS_CHUNK])
+                for i in range(0, len(missing), GET_USERS_CHUNK)
+            ),
+            *(_wait_pending(id, future) for id, future in waiting.items()),
+            return_exceptions=True,
+        )
+        errors = {}
+        for i, result in enumerate(results):
+            if isinstance(result, BaseException):
+                if not isinstance(result, Exception):
+                    raise result
+                print(result)
+                print("Не удалось получить username для пачки id")
+                chunk = missing[i * GET_USERS_CHUNK : (i + 1) * GET_USERS_CHUNK]
+                errors.update(dict.fromkeys(chunk, result))
+            else:
+                found.update(result)
+        for id, future in futures.items():
+            if id in found:
+                future.set_result(found[id])
+            else:
+                _fail(future, errors.get(id) or LookupError(id))
+        return found
+    except Exception as e:
+        for future in futures.values():
+            if not future.done():
+                _fail(future, e)
+        raise
+    finally:
+        for id, future in futures.items():
+            if not future.done():
+                future.cancel()  # Запрос отменен, ждущие не должны зависнуть
+            _pending_usernames.pop(id, None)
 
 
 async def get_id_by_username(username: str) -> str | None:
-    async with Client("bot_distributor") as client:
-        result: ResolvedPeer = await client.invoke(ResolveUsername(username=username))
+    """
+    Возвращает id пользователя по username или None, если он не найден.
+    Одновременные запросы одного username выполняются один раз.
+    """
+    key = username.lstrip("@").lower()
+    if key in _ids:
+        cache_stats["hits"] += 1
+        return _ids[key]
+    if key in _pending_ids:
+        cache_stats["hits"] += 1
+        return await asyncio.shield(_pending_ids[key])
+
+    cache_stats["misses"] += 1
+    future = asyncio.get_running_loop().create_future()
+    _pending_ids[key] = future
+    try:
+        result: ResolvedPeer = await _with_client(
+            lambda client: client.invoke(ResolveUsername(username=key))
+        )
+        id = None
         if result.users:
-            return result.users[0].id
-        return None
+            user = result.users[0]
+            id = user.id
+            _remember(id, user.username or key)
+        future.set_result(id)
+        return id
+    except Exception as e:
+        _fail(future, e)
+        raise
+    finally:
+        if not future.done():
+            future.cancel()
+        _pending_ids.pop(key, None)
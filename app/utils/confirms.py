@@ -0,0 +1,49 @@
+from typing import Optional, Tuple
+
+from aiogram.types import InlineKeyboardMarkup
+
+from app.database.actions import get_confirm
+from app.keyboards.admin import get_confirm_kb
+
+
+async def render_confirm_page(
+    id: str, after: int = 0, before: int = 0
+) -> Optional[Tuple[str, InlineKeyboardMarkup]]:
+    """
+    Формирует страницу рассылки с подтверждением: текст рассылки,
+    участников страницы и кнопки перехода к соседним страницам.
+
+    :param id: ID рассылки с подтверждением.
+    :param after: Показать участников с ID больше after (следующая страница).
+    :param before: Если не 0, показать участников с ID меньше before
+        (предыдущая страница).
+    :return: Текст и клавиатура страницы или None, если рассылка не найдена.
+
+    Внутренний процесс:
+    1. Получаем одну страницу участников с помощью функции get_confirm().
+    2. Определяем, есть ли страницы до и после текущей: в направлении
+       выборки это сообщает get_confirm(), а в обратном направлении страница
+       есть, если мы пришли с нее.
+    3. Формируем текст и клавиатуру с кнопками перехода.
+    """
+    data = await get_confirm(id, after, before)
+    if not data:
+        return None
+    description, users, has_more = data
+
+    if before:
+        has_prev, has_next = has_more, True
+    else:
+        has_prev, has_next = after > 0, has_more
+    prev_before = users[0][0] if users and has_prev else 0
+    next_after = users[-1][0] if users and has_next else 0
+
+    text = f"Рассылка с подтверждением:\n\nID: {id}\nТекст: {description}\n\n"
+    if users:
+        text += "Участники:\n"
+        text += "\n".join(
+            f"ID: {user_id} - @{username}" for user_id, username in users
+        )
+    else:
+        text += "Участников нет"
+    return text, get_confirm_kb(id, prev_before, next_after)
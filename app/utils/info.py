@@ -1,8 +1,40 @@
+import asyncio
+from typing import Dict, NamedTuple
+
 from asynctinydb import TinyDB
 
+from app.utils.notify import notify, on_change
+
 
 DB_PATH = "app/data/database.json"  # Путь к базе данных
 
+CONTENT_TABLES = ("quiz_info", "rules", "faq", "news", "quizzes")
+
+# Копия таблиц контента в памяти: имя таблицы -> {ID записи: текст}.
+# Записи идут в порядке возрастания ID, как в TinyDB.
+# Чтение идет только из памяти, изменения записываются в файл и сразу в кэш.
+_cache: Dict[str, Dict[int, str]] = {}
+_lock = asyncio.Lock()
+
+# Текст страницы, если таблица пуста
+EMPTY_PAGES = {
+    "quiz_info": "Информация о викторине не найдена",
+    "rules": "Правила не выставлены",
+    "faq": "Информация о частых вопросах не найдена",
+    "news": "Нет новостей",
+    "quizzes": "Нет предстоящих викторин",
+}
+
+
+class Page(NamedTuple):
+    """Готовый к отправке текст страницы."""
+
+    text: str
+
+
+# Отрисованные страницы: имя таблицы -> Page
+_pages: Dict[str, Page] = {}
+
 
 def get_db() -> TinyDB:
     """Создает и возвращает объект базы данных TinyDB.
@@ -13,6 +45,119 @@ def get_db() -> TinyDB:
     return TinyDB(DB_PATH)
 
 
+async def load_content() -> None:
+    """Загружает все таблицы контента в память.
+
+    Вызывается при старте диспетчера, чтобы первое обращение
+    пользователя тоже обслуживалось из памяти.
+    """
+    async with _lock:
+        async with get_db() as db:
+            for name in CONTENT_TABLES:
+                records = await db.table(name).all()
+                _cache[name] = {item.doc_id: item["text"] for item in records}
+                _render(name)
+
+
+def _render(name: str) -> None:
+    """Перерисовывает страницу таблицы. Вызывается после каждого изменения."""
+    text = "\n".join(_cache[name].values()) or EMPTY_PAGES[name]
+    _pages[name] = Page(text)
+
+
+async def get_page(name: str) -> Page:
+    """Возвращает отрисованную страницу таблицы контента.
+
+    Args:
+        name (str): Имя таблицы из CONTENT_TABLES.
+
+    Returns:
+        Page: Текст страницы.
+    """
+    await _get_table(name)
+    return _pages[name]
+
+
+# Другой процесс изменил database.json: перечитываем таблицы
+on_change("content", load_content)
+
+
+async def _get_table(name: str) -> Dict[int, str]:
+    """Возвращает таблицу из кэша, загружая ее при первом обращении."""
+    if name not in _cache:
+        await load_content()
+    return _cache[name]
+
+
+async def _get_single(name: str) -> str | None:
+    """Возвращает текст единственной записи таблицы."""
+    return next(iter((await _get_table(name)).values()), None)
+
+
+async def _set_single(name: str, text: str) -> bool:
+    """Заменяет единственную запись таблицы."""
+    await _get_table(name)
+    async with _lock:
+        async with get_db() as db:
+            table = db.table(name)
+            await table.truncate()
+            doc_id = await table.insert({"text": text})
+        _cache[name] = {doc_id: text}
+        _render(name)
+        await notify("content")
+        return bool(doc_id)
+
+
+async def _add_limited(name: str, text: str, limit: int = 5) -> int:
+    """Добавляет запись в таблицу, удаляя самую старую, если их не меньше limit."""
+    await _get_table(name)
+    async with _lock:
+        records = _cache[name]
+        async with get_db() as db:
+            table = db.table(name)
+            if len(records) >= limit:
+                oldest_id = next(iter(records))
+                await table.remove(doc_ids=[oldest_id])
+                records.pop(oldest_id, None)
+            doc_id = await table.insert({"text": text})
+        records[doc_id] = text
+        _render(name)
+        await notify("content")
+        return doc_id
+
+
+async def _edit_record(name: str, id: int, text: str) -> bool:
+    """Изменяет текст записи по ID."""
+    await _get_table(name)
+    async with _lock:
+        records = _cache[name]
+        if id not in records:
+            return False
+        async with get_db() as db:
+            updated_ids = await db.table(name).update({"text": text}, doc_ids=[id])
+        for doc_id in updated_ids:
+            records[doc_id] = text
+        _render(name)
+        await notify("content")
+        return bool(updated_ids)
+
+
+async def _del_record(name: str, id: int) -> bool:
+    """Удаляет запись по ID."""
+    await _get_table(name)
+    async with _lock:
+        records = _cache[name]
+        if id not in records:
+            return False
+        async with get_db() as db:
+            removed_ids = await db.table(name).remove(doc_ids=[id])
+        for doc_id in removed_ids:
+            records.pop(doc_id, None)
+        _render(name)
+        await notify("content")
+        return bool(removed_ids)
+
+
 async def edit_about_quiz(text: str) -> bool:
     """Редактирует единственную запись about_quiz.
 
@@ -22,10 +167,7 @@ async def edit_about_quiz(text: str) -> bool:
     Returns:
         bool: True, если запись была успешно добавлена, иначе False.
     """
-    async with get_db() as db:
-        quiz_info = db.table("quiz_info")
-        await quiz_info.truncate()
-        return bool(await quiz_info.insert({"text": text}))
+    return await _set_single("quiz_info", text)
 
 
 async def get_about_quiz() -> str | None:
@@ -34,10 +176,7 @@ async def get_about_quiz() -> str | None:
     Returns:
         str|None: Текст about_quiz, если запись существует, иначе None.
     """
-    async with get_db() as db:
-        quiz_info = db.table("quiz_info")
-        records = await quiz_info.all()
-        return records[0].get("text") if records else None
+    return await _get_single("quiz_info")
 
 
 async def edit_rules(text: str) -> bool:
@@ -49,10 +188,7 @@ async def edit_rules(text: str) -> bool:
     Returns:
         bool: True, если запись была успешно добавлена, иначе False.
     """
-    async with get_db() as db:
-        rules = db.table("rules")
-        await rules.truncate()
-        return bool(await rules.insert({"text": text}))
+    return await _set_single("rules", text)
 
 
 async def get_rules() -> str | None:
@@ -61,10 +197,7 @@ async def get_rules() -> str | None:
     Returns:
         str|None: Текст rules, если запись существует, иначе None.
     """
-    async with get_db() as db:
-        rules = db.table("rules")
-        records = await rules.all()
-        return records[0].get("text") if records else None
+    return await _get_single("rules")
 
 
 async def edit_faq(text: str) -> bool:
@@ -76,10 +209,7 @@ async def edit_faq(text: str) -> bool:
     Returns:
         bool: True, если запись была успешно добавлена, иначе False.
     """
-    async with get_db() as db:
-        faq = db.table("faq")
-        await faq.truncate()
-        return bool(await faq.insert({"text": text}))
+    return await _set_single("faq", text)
 
 
 async def get_faq() -> str | None:
@@ -88,10 +218,7 @@ async def get_faq() -> str | None:
     Returns:
         str|None: Текст FAQ, если запись существует, иначе None.
     """
-    async with get_db() as db:
-        faq = db.table("faq")
-        records = await faq.all()
-        return records[0].get("text") if records else None
+    return await _get_single("faq")
 
 
 async def add_news(text: str) -> int:
@@ -103,18 +230,7 @@ async def add_news(text: str) -> int:
     Returns:
         int: ID добавленной новости.
     """
-    async with get_db() as db:
-        news_table = db.table("news")
-
-        # Проверяем количество новостей
-        if len(await news_table.all()) >= 5:
-            # Удаляем самую старую новость
-            oldest_news = await news_table.all()
-            await news_table.remove(doc_ids=[oldest_news[0].doc_id])
-
-        # Добавляем новую новость
-        news_id = await news_table.insert({"text": text})
-        return news_id
+    return await _add_limited("news", text)
 
 
 async def edit_news(id: int, text: str) -> bool:
@@ -127,10 +243,7 @@ async def edit_news(id: int, text: str) -> bool:
     Returns:
         bool: True, если новость была успешно обновлена, иначе False.
     """
-    async with get_db() as db:
-        news = db.table("news")
-        updated_ids = await news.update({"text": text}, doc_ids=[int(id)])
-        return bool(updated_ids)  # Проверка на наличие обновленных записей
+    return await _edit_record("news", int(id), text)
 
 
 async def get_news_admin() -> list:
@@ -139,9 +252,7 @@ async def get_news_admin() -> list:
     Returns:
         list: Список всех записей новостей. Элемент списка - кортеж (ID, текст новости).
     """
-    async with get_db() as db:
-        news = db.table("news")
-        return [(item.doc_id, item["text"]) for item in await news.all()]
+    return list((await _get_table("news")).items())
 
 
 async def get_news_user() -> list:
@@ -150,9 +261,7 @@ async def get_news_user() -> list:
     Returns:
         list: Список всех записей новостей. Элемент списка - текст новости.
     """
-    async with get_db() as db:
-        news = db.table("news")
-        return [item["text"] for item in await news.all()]
+    return list((await _get_table("news")).values())
 
 
 async def get_news_one(id: int | str) -> str | None:
@@ -164,10 +273,8 @@ async def get_news_one(id: int | str) -> str | None:
     Returns:
         str|None: Текст новости, если запись существует, иначе None.
     """
-    async with get_db() as db:
-        news = db.table("news")
-        records = await news.get(doc_id=int(id))
-        return (records.doc_id, records.get("text")) if records else None
+    text = (await _get_table("news")).get(int(id))
+    return (int(id), text) if text is not None else None
 
 
 async def del_news(id: int) -> bool:
@@ -179,10 +286,7 @@ async def del_news(id: int) -> bool:
     Returns:
         bool: True, если новость была успешно удалена, иначе False.
     """
-    async with get_db() as db:
-        news = db.table("news")
-        removed_ids = await news.remove(doc_ids=[int(id)])
-        return bool(removed_ids)  # Проверка на наличие удаленных записей
+    return await _del_record("news", int(id))
 
 
 async def get_quizzes_admin() -> list:
@@ -191,9 +295,7 @@ async def get_quizzes_admin() -> list:
     Returns:
         list: Список всех записей викторин. Элемент списка - кортеж (ID, текст викторины).
     """
-    async with get_db() as db:
-        quizzes = db.table("quizzes")
-        return [(item.doc_id, item["text"]) for item in await quizzes.all()]
+    return list((await _get_table("quizzes")).items())
 
 
 async def get_quizzes_user() -> list:
@@ -202,9 +304,7 @@ async def get_quizzes_user() -> list:
     Returns:
         list: Список всех записей викторин. Элемент списка - текст викторины.
     """
-    async with get_db() as db:
-        quizzes = db.table("quizzes")
-        return [item["text"] for item in await quizzes.all()]
+    return list((await _get_table("quizzes")).values())
 
 
 async def get_quiz(id: int) -> str | None:
@@ -216,10 +316,7 @@ async def get_quiz(id: int) -> str | None:
     Returns:
         str|None: Текст викторины, если запись существует, иначе None.
     """
-    async with get_db() as db:
-        quizzes = db.table("quizzes")
-        records = await quizzes.get(doc_id=int(id))
-        return records.get("text") if records else None
+    return (await _get_table("quizzes")).get(int(id))
 
 
 async def add_quiz(text: str) -> int:
@@ -231,18 +328,7 @@ async def add_quiz(text: str) -> int:
     Returns:
         int: ID добавленной викторины.
     """
-    async with get_db() as db:
-        quizzes_table = db.table("quizzes")
-
-        # Проверяем количество викторин
-        if len(await quizzes_table.all()) >= 5:
-            # Удаляем самую старую викторину
-            oldest_quiz = await quizzes_table.all()
-            await quizzes_table.remove(doc_ids=[oldest_quiz[0].doc_id])
-
-        # Добавляем новую викторину
-        quiz_id = await quizzes_table.insert({"text": text})
-        return quiz_id
+    return await _add_limited("quizzes", text)
 
 
 async def edit_quiz(id: int, text: str) -> bool:
@@ -255,10 +341,7 @@ async def edit_quiz(id: int, text: str) -> bool:
     Returns:
         bool: True, если викторина была успешно обновлена, иначе False.
     """
-    async with get_db() as db:
-        quizzes = db.table("quizzes")
-        updated_ids = await quizzes.update({"text": text}, doc_ids=[int(id)])
-        return bool(updated_ids)  # Проверка на наличие обновленных записей
+    return await _edit_record("quizzes", int(id), text)
 
 
 async def del_quiz(id: int) -> bool:
@@ -270,7 +353,4 @@ async def del_quiz(id: int) -> bool:
     Returns:
         bool: True, если викторина была успешно удалена, иначе False.
     """
-    async with get_db() as db:
-        quizzes = db.table("quizzes")
-        removed_ids = await quizzes.remove(doc_ids=[int(id)])
-        return bool(removed_ids)  # Проверка на наличие удаленных записей
+    return await _del_record("quizzes", int(id))
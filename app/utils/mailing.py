@@ -1,14 +1,39 @@
+import asyncio
+from typing import Optional
+
 from aiogram import Bot
-from aiogram.types import InlineKeyboardMarkup
 
 
-from app.database.actions import add_confirm, get_all_ids
+from app.config.workers import is_primary_worker
+from app.database.actions import (
+    add_confirm,
+    add_mailing_job,
+    get_unfinished_mailing_jobs,
+    iter_user_ids,
+    update_mailing_job,
+)
 from app.keyboards.user import get_confirm_mailing_kb
+from app.utils.broadcast import Broadcast
+from app.utils.notify import notify, on_change
+
+
+MAILING_POLL_INTERVAL = 60  # Как часто (в секундах) проверяется очередь без сигнала
+
+_wakeup = asyncio.Event()
+_worker: Optional[asyncio.Task] = None
+
+
+async def _wake_worker() -> None:
+    # Другой процесс поставил рассылку в очередь
+    _wakeup.set()
+
+
+on_change("mailing", _wake_worker)
 
 
 async def make_mailing(text: str, bot: Bot) -> bool:
     """
-    Отправляет сообщение с текстом text
+    Ставит в очередь рассылку сообщения с текстом text
     всем зарегистрированным пользователям.
 
     Args:
@@ -16,14 +41,14 @@ async def make_mailing(text: str, bot: Bot) -> bool:
         bot (Bot): объект бота, который отправляет сообщение.
 
     Returns:
-        bool: флаг успешности отправки.
+        bool: флаг успешной постановки рассылки в очередь.
     """
     try:
-        ids = get_all_ids()
-
-        for id in ids:
-            await bot.send_message(id, text)
+        if not await add_mailing_job(text):
+            return False
 
+        _wakeup.set()
+        await notify("mailing")  # Очередь обрабатывает основной процесс
         return True
 
     except Exception as e:
@@ -34,29 +59,123 @@ async def make_mailing(text: str, bot: Bot) -> bool:
 
 async def make_confirm_mailing(text: str, bot: Bot) -> bool:
     """
-    Отправляет сообщение с текстом text
-    всем зарегистрированным пользователям.
+    Создает рассылку с подтверждением и ставит в очередь
+    ее отправку всем зарегистрированным пользователям.
 
     Args:
         text (str): текст сообщения.
         bot (Bot): объект бота, который отправляет сообщение.
 
     Returns:
-        bool: флаг успешности отправки.
+        bool: флаг успешной постановки рассылки в очередь.
     """
     try:
-        ids = get_all_ids()
-
-        mailing_id: int = add_confirm(text)
-
-        kb: InlineKeyboardMarkup = get_confirm_mailing_kb(mailing_id)
+        mailing_id: int = await add_confirm(text)
+        if not mailing_id:
+            return False
 
-        for id in ids:
-            await bot.send_message(id, text, reply_markup=kb)
+        if not await add_mailing_job(text, mailing_id):
+            return False
 
+        _wakeup.set()
+        await notify("mailing")  # Очередь обрабатывает основной процесс
         return True
 
     except Exception as e:
         print(e)
         print("Не получилось отправить сообщение всем пользователям")
         return False
+
+
+async def _save_progress(job_id: int, mailing: Broadcast) -> None:
+    """
+    Сохраняет курсор и счетчики рассылки в задание.
+    """
+    await update_mailing_job(job_id, mailing.cursor, mailing.sent, mailing.failed)
+
+
+async def _run_job(
+    bot: Bot,
+    job_id: int,
+    text: str,
+    confirm_id: Optional[int],
+    last_user_id: int,
+    sent: int,
+    failed: int,
+) -> None:
+    """
+    Выполняет задание рассылки, начиная с пользователя
+    после last_user_id.
+    """
+    kb = get_confirm_mailing_kb(confirm_id) if confirm_id else None
+
+    mailing = Broadcast(bot, text, reply_markup=kb)
+    mailing.cursor, mailing.sent, mailing.failed = last_user_id, sent, failed
+
+    try:
+        await mailing.run(
+            iter_user_ids(after_id=last_user_id),
+            on_progress=lambda m: _save_progress(job_id, m),
+        )
+    except (asyncio.CancelledError, Exception):
+        # Остановка бота или ошибка (например, БД при чтении получателей):
+        # сохраняем, докуда дошли, и оставляем задание незавершенным,
+        # чтобы продолжить с курсора при следующем проходе очереди
+        await _save_progress(job_id, mailing)
+        raise
+    await update_mailing_job(
+        job_id, mailing.cursor, mailing.sent, mailing.failed, "done"
+    )
+    print(
+        f"Рассылка {job_id} завершена: "
+        f"доставлено {mailing.sent}, не доставлено {mailing.failed}"
+    )
+
+
+async def _mailing_worker(bot: Bot) -> None:
+    """
+    Фоновый обработчик очереди рассылок.
+
+    Выполняет незавершенные задания по порядку и засыпает до сигнала
+    о новом задании. Прерванные перезапуском задания продолжаются
+    с сохраненного курсора.
+    """
+    while True:
+        _wakeup.clear()
+        for job in await get_unfinished_mailing_jobs():
+            try:
+                await _run_job(bot, *job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(e)
+                print("Не получилось выполнить рассылку с id =", job[0])
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=MAILING_POLL_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def start_mailing_worker(bot: Bot) -> None:
+    """
+    Запускает фоновый обработчик очереди рассылок.
+    Вызывается при старте диспетчера. Если бот запущен в нескольких
+    процессах, обработчик работает только в основном из них.
+    """
+    global _worker
+    if not is_primary_worker():
+        return
+    if _worker is None or _worker.done():
+        _worker = asyncio.create_task(_mailing_worker(bot))
+
+
+async def stop_mailing_worker() -> None:
+    """
+    Останавливает фоновый обработчик очереди рассылок.
+    Прогресс текущей рассылки остается в базе данных.
+    """
+    global _worker
+    if _worker is not None:
+        _worker.cancel()
+        await asyncio.gather(_worker, return_exceptions=True)
+        _worker = None
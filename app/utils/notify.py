@@ -0,0 +1,117 @@
+import asyncio
+from os import environ
+from typing import Awaitable, Callable, Dict, List, Optional
+from uuid import uuid4
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+
+# Адрес Redis-совместимого сервера, общего для всех процессов бота.
+# Без него бот работает в одном процессе и уведомления не рассылаются.
+REDIS_URL = environ.get("REDIS_URL", "")
+CHANNEL_PREFIX = environ.get("REDIS_PREFIX", "mailing_bot") + ":changes:"
+
+Handler = Callable[[], Awaitable[None]]
+
+# Уникальный id процесса: собственные уведомления процесс пропускает,
+# так как его кэши уже обновлены
+_sender = uuid4().hex
+_handlers: Dict[str, List[Handler]] = {}
+_redis: Optional[Redis] = None
+_listener: Optional[asyncio.Task] = None
+
+
+def get_redis() -> Optional[Redis]:
+    """
+    Возвращает клиент общего Redis или None, если REDIS_URL не задан.
+    """
+    global _redis
+    if _redis is None and REDIS_URL:
+        _redis = Redis.from_url(REDIS_URL)
+    return _redis
+
+
+def on_change(channel: str, handler: Handler) -> None:
+    """
+    Подписывает handler на уведомления об изменениях в канале channel,
+    присланные другими процессами.
+
+    :param channel: Имя канала, например "ranks" или "content".
+    :param handler: Корутина без аргументов, которая обновляет локальный кэш.
+    """
+    _handlers.setdefault(channel, []).append(handler)
+
+
+async def notify(channel: str) -> None:
+    """
+    Сообщает остальным процессам, что данные канала channel изменились.
+    Без REDIS_URL ничего не делает.
+
+    :param channel: Имя канала.
+    """
+    redis = get_redis()
+    if redis is None:
+        return
+    try:
+        await redis.publish(CHANNEL_PREFIX + channel, _sender)
+    except RedisError as e:
+        print(e)
+        print("Не удалось отправить уведомление об изменении", channel)
+
+
+async def _run_handlers(channel: str) -> None:
+    for handler in _handlers.get(channel, []):
+        try:
+            await handler()
+        except Exception as e:
+            print(e)
+            print("Не удалось обработать уведомление", channel)
+
+
+async def _listen() -> None:
+    reconnect = False
+    while True:
+        try:
+            async with get_redis().pubsub() as pubsub:
+                await pubsub.psubscribe(CHANNEL_PREFIX + "*")
+                if reconnect:
+                    # Пока соединения не было, уведомления могли потеряться
+                    for channel in list(_handlers):
+                        await _run_handlers(channel)
+                async for message in pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+                    if message["data"].decode() == _sender:
+                        continue
+                    channel = message["channel"].decode()[len(CHANNEL_PREFIX) :]
+                    await _run_handlers(channel)
+        except RedisError as e:
+            print(e)
+            print("Соединение с Redis потеряно, переподключаемся")
+            reconnect = True
+            await asyncio.sleep(1)
+
+
+async def start_notifications() -> None:
+    """
+    Запускает прием уведомлений от других процессов.
+    Вызывается при старте диспетчера.
+    """
+    global _listener
+    if get_redis() is not None and (_listener is None or _listener.done()):
+        _listener = asyncio.create_task(_listen())
+
+
+async def stop_notifications() -> None:
+    """
+    Останавливает прием уведомлений и закрывает соединение с Redis.
+    """
+    global _listener, _redis
+    if _listener is not None:
+        _listener.cancel()
+        await asyncio.gather(_listener, return_exceptions=True)
+        _listener = None
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
@@ -0,0 +1,29 @@
+from aiogram.types import CallbackQuery, InlineKeyboardMarkup
+
+from app.utils.info import get_page
+
+
+async def show_page(
+    callback: CallbackQuery, name: str, reply_markup: InlineKeyboardMarkup
+) -> None:
+    """
+    Показывает страницу контента в сообщении callback-запроса.
+
+    Если сообщение уже показывает эту страницу с той же клавиатурой
+    (например, при повторном нажатии кнопки), сообщение не редактируется.
+    Проверка идет по самому сообщению, а не по памяти процесса, поэтому
+    она верна и тогда, когда сообщение редактировал другой процесс.
+
+    :param callback: Объект CallbackQuery, представляющий callback-запрос.
+    :param name: Имя страницы (таблицы контента в app.utils.info).
+    :param reply_markup: Клавиатура страницы.
+    :return: None
+    """
+    page = await get_page(name)
+    message = callback.message
+    # Telegram обрезает пробелы по краям текста сообщения
+    if message.text == page.text.strip() and message.reply_markup == reply_markup:
+        await callback.answer()
+        return
+
+    await message.edit_text(page.text, reply_markup=reply_markup)
@@ -0,0 +1,141 @@
+import asyncio
+from os import environ
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.database.actions import add_confirm_users, get_confirm_user_ids
+from app.utils.notify import notify, on_change
+from app.utils.users import flush_users
+
+
+# Через сколько миллисекунд после первого нажатия буфер сохраняется в БД
+PARTICIPATION_FLUSH_INTERVAL = int(environ.get("PARTICIPATION_FLUSH_INTERVAL", 500))
+# При скольких подтверждениях в буфере он сохраняется, не дожидаясь интервала
+PARTICIPATION_FLUSH_SIZE = int(environ.get("PARTICIPATION_FLUSH_SIZE", 1000))
+
+# id рассылки -> id подтвердивших ее пользователей; загружается из БД
+# при первом нажатии кнопки этой рассылки
+_participants: Dict[int, Set[int]] = {}
+_loading: Dict[int, asyncio.Future] = {}
+# (id пользователя, id рассылки), еще не сохраненные в БД
+_pending: List[Tuple[int, int]] = []
+_flusher: Optional[asyncio.Task] = None
+_flush_lock = asyncio.Lock()
+
+
+async def _forget_all() -> None:
+    # Другой процесс завершил рассылку
+    _participants.clear()
+
+
+on_change("confirms", _forget_all)
+
+
+async def _get_participants(confirm_id: int) -> Optional[Set[int]]:
+    """
+    Возвращает участников рассылки из памяти, при первом обращении
+    загружая их из БД. Одновременные загрузки одной рассылки объединяются.
+    """
+    if confirm_id in _participants:
+        return _participants[confirm_id]
+    if confirm_id in _loading:
+        return await asyncio.shield(_loading[confirm_id])
+
+    future = asyncio.get_running_loop().create_future()
+    _loading[confirm_id] = future
+    try:
+        participants = await get_confirm_user_ids(confirm_id)
+        if participants is not None:
+            # Нажатия, ожидающие записи, уже есть в буфере
+            participants |= {
+                user_id for user_id, id in _pending if id == confirm_id
+            }
+            _participants[confirm_id] = participants
+        future.set_result(participants)
+        return participants
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()
+        raise
+    finally:
+        del _loading[confirm_id]
+
+
+async def participate(user_id: int, confirm_id: int) -> Optional[bool]:
+    """
+    Записывает пользователя в участники рассылки с подтверждением.
+
+    Повторное участие определяется по памяти, поэтому ответ на нажатие
+    кнопки не ждет БД. Сами записи копятся в буфере и сохраняются пачками
+    INSERT IGNORE через PARTICIPATION_FLUSH_INTERVAL мс или
+    по PARTICIPATION_FLUSH_SIZE записей.
+
+    :param user_id: ID пользователя.
+    :param confirm_id: ID рассылки с подтверждением.
+    :return: True, если пользователь записан; False, если он уже участвует;
+        None, если рассылка завершена.
+    :raises Error: Если участников рассылки не удалось прочитать из БД.
+    """
+    global _flusher
+    participants = await _get_participants(confirm_id)
+    if participants is None:
+        return None
+    if user_id in participants:
+        return False
+
+    participants.add(user_id)
+    _pending.append((user_id, confirm_id))
+    if len(_pending) >= PARTICIPATION_FLUSH_SIZE:
+        await flush_participants()
+    elif _flusher is None or _flusher.done():
+        _flusher = asyncio.create_task(_flush_later())
+    return True
+
+
+async def _flush_later() -> None:
+    global _flusher
+    await asyncio.sleep(PARTICIPATION_FLUSH_INTERVAL / 1000)
+    _flusher = None
+    await flush_participants()
+
+
+async def flush_participants() -> None:
+    """
+    Сохраняет накопленные подтверждения пачками по PARTICIPATION_FLUSH_SIZE.
+    Если сохранить не удалось, подтверждения возвращаются в буфер
+    и сохранение повторяется позже. Вызывается также при остановке бота.
+    """
+    global _pending, _flusher
+    async with _flush_lock:
+        # Пользователь мог нажать кнопку раньше, чем сохранилась его регистрация
+        await flush_users()
+        while _pending:
+            batch = _pending[:PARTICIPATION_FLUSH_SIZE]
+            del _pending[: len(batch)]
+            if await add_confirm_users(batch):
+                continue
+            _pending = batch + _pending
+            if _flusher is None or _flusher.done():
+                _flusher = asyncio.create_task(_flush_later())
+            return
+
+
+async def forget_confirm(confirm_id: int) -> None:
+    """
+    Забывает участников завершенной рассылки в этом и других процессах.
+    """
+    global _pending
+    _participants.pop(confirm_id, None)
+    _pending = [record for record in _pending if record[1] != confirm_id]
+    await notify("confirms")
+
+
+async def stop_participation_flusher() -> None:
+    """
+    Останавливает отложенное сохранение и сохраняет буфер.
+    """
+    global _flusher
+    if _flusher is not None and not _flusher.done():
+        _flusher.cancel()
+        await asyncio.gather(_flusher, return_exceptions=True)
+    _flusher = None
+    await flush_participants()
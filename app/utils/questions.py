@@ -0,0 +1,133 @@
+from os import environ
+from typing import NamedTuple, Optional, Tuple
+
+from aiomysql import Error
+from cachetools import LRUCache
+
+from app.database.actions import add_question, get_question, set_question_status
+
+
+QUESTION_OPEN = "open"
+QUESTION_ANSWERED = "answered"
+QUESTION_DECLINED = "declined"
+
+# Сколько последних вопросов держать в памяти
+QUESTIONS_CACHE_SIZE = int(environ.get("QUESTIONS_CACHE_SIZE", 10000))
+
+
+class Question(NamedTuple):
+    """Куда отвечать на вопрос: чат пользователя и его сообщение."""
+
+    chat_id: int
+    msg_id: int
+
+
+# (id чата поддержки, id сообщения в нем) -> вопрос.
+# Чат и сообщение пользователя не меняются, поэтому кэш не устаревает;
+# статус хранится только в БД, где его меняет set_question_status.
+_questions: LRUCache = LRUCache(QUESTIONS_CACHE_SIZE)
+
+
+async def register_question(
+    support_chat_id: int,
+    support_message_id: int,
+    chat_id: int,
+    msg_id: int,
+    moder_id: Optional[int] = None,
+) -> bool:
+    """
+    Запоминает, на какое сообщение пользователя отвечать,
+    когда модератор ответит на сообщение в чате поддержки.
+
+    :param support_chat_id: ID чата поддержки.
+    :param support_message_id: ID сообщения с вопросом в чате поддержки.
+    :param chat_id: ID чата пользователя.
+    :param msg_id: ID сообщения пользователя с вопросом.
+    :param moder_id: ID модератора, которому назначен вопрос.
+    :return: True, если вопрос сохранен в БД.
+    """
+    if not await add_question(
+        support_chat_id, support_message_id, chat_id, msg_id, moder_id
+    ):
+        return False
+    _questions[(support_chat_id, support_message_id)] = Question(chat_id, msg_id)
+    return True
+
+
+def _parse_legacy(text: Optional[str]) -> Optional[Question]:
+    # Вопросы, отправленные до появления таблицы questions,
+    # хранят "[chat_id, msg_id]" в тексте сообщения
+    try:
+        data = text.split("]", maxsplit=1)[0].split("[", maxsplit=1)[1]
+        chat_id, msg_id = data.split(", ")
+        return Question(int(chat_id), int(msg_id))
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+async def find_question(
+    support_chat_id: int, support_message_id: int, text: Optional[str] = None
+) -> Optional[Question]:
+    """
+    Находит вопрос по сообщению в чате поддержки: сначала в памяти, затем в БД.
+
+    :param support_chat_id: ID чата поддержки.
+    :param support_message_id: ID сообщения с вопросом в чате поддержки.
+    :param text: Текст сообщения; нужен только для старых вопросов,
+        которых нет в БД.
+    :return: Вопрос или None, если сообщение не является вопросом.
+    :raises Error: Если вопрос не удалось прочитать из БД.
+    """
+    key = (support_chat_id, support_message_id)
+    question = _questions.get(key)
+    if question is not None:
+        return question
+
+    record = await get_question(*key)
+    if record:
+        question = Question(record[0], record[1])
+    else:
+        question = _parse_legacy(text)
+        if question is None:
+            return None
+    _questions[key] = question
+    return question
+
+
+async def close_question(
+    support_chat_id: int, support_message_id: int, status: str
+) -> bool:
+    """
+    Закрывает открытый вопрос со статусом status.
+
+    :param support_chat_id: ID чата поддержки.
+    :param support_message_id: ID сообщения с вопросом в чате поддержки.
+    :param status: QUESTION_ANSWERED или QUESTION_DECLINED.
+    :return: True, если вопрос закрыт этим вызовом; False, если он уже закрыт
+        другим модератором. Старые вопросы без записи в БД всегда закрываются.
+    :raises Error: Если обратиться к БД не удалось; тогда вопрос
+        не считается закрытым.
+    """
+    key: Tuple[int, int] = (support_chat_id, support_message_id)
+    if await set_question_status(*key, status, QUESTION_OPEN):
+        return True
+    return await get_question(*key) is None
+
+
+async def reopen_question(
+    support_chat_id: int, support_message_id: int, status: str
+) -> None:
+    """
+    Возвращает закрытый вопрос в открытые, например если ответ
+    не удалось доставить пользователю.
+
+    :param support_chat_id: ID чата поддержки.
+    :param support_message_id: ID сообщения с вопросом в чате поддержки.
+    :param status: Статус, с которым вопрос был закрыт.
+    """
+    try:
+        await set_question_status(
+            support_chat_id, support_message_id, QUESTION_OPEN, status
+        )
+    except Error:
+        pass  # ошибка уже выведена; исходная ошибка доставки важнее
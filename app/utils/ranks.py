@@ -1,10 +1,187 @@
+import asyncio
+import fcntl
 from datetime import UTC, datetime, timedelta
-from typing import List, Tuple
+from os import path
+from typing import Dict, List, Optional, Set, Tuple
 
 import aiofiles
 from aiogram import Bot
 
-from app.utils.client import get_id_by_username, get_usernames_by_ids
+from app.utils.client import get_id_by_username, resolve_usernames
+from app.utils.notify import notify, on_change
+
+
+ADMIN_FILE = "app/data/admin.txt"
+MODERS_FILE = "app/data/moders.txt"
+SUBADMINS_FILE = "app/data/subadmins.txt"
+CHAT_FILE = "app/data/chat.txt"
+
+RANKS_WATCH_INTERVAL = 5  # Как часто (в секундах) проверяются изменения файлов рангов
+
+# Роли, которые RoleMiddleware кладет в данные обработчиков
+ROLE_ADMIN = "admin"
+ROLE_SUBADMIN = "subadmin"
+ROLE_MODER = "moder"
+ROLE_USER = "user"
+ROLE_CHAT = "chat"  # Чат поддержки
+PRIVATE_ROLES = frozenset((ROLE_ADMIN, ROLE_SUBADMIN, ROLE_MODER, ROLE_USER))
+
+# Кэш рангов в памяти: проверка роли не обращается к диску
+_admin: int = 0
+_moders: Set[int] = set()
+_subadmins: Set[int] = set()
+_chat_id: int = 0
+
+_mtimes: Dict[str, float] = {}
+_write_lock = asyncio.Lock()
+_watcher: Optional[asyncio.Task] = None
+
+
+def _read_ids(file: str) -> Set[int]:
+    """
+    Читает id из файла ранга, по одному на строку, пропуская пустые строки.
+    """
+    with open(file, mode="r") as f:
+        fcntl.flock(f, fcntl.LOCK_SH)  # Не читаем файл посреди чужой записи
+        return {int(line) for line in (line.strip() for line in f) if line.isdigit()}
+
+
+def _load_rank_file(file: str) -> None:
+    """
+    Загружает один файл рангов в кэш и запоминает время его изменения.
+    """
+    global _admin, _moders, _subadmins, _chat_id
+
+    _mtimes[file] = path.getmtime(file)
+    if file == ADMIN_FILE:
+        _admin = next(iter(_read_ids(file)), 0)
+    elif file == MODERS_FILE:
+        _moders = _read_ids(file)
+    elif file == SUBADMINS_FILE:
+        _subadmins = _read_ids(file)
+    elif file == CHAT_FILE:
+        # id группы отрицательный, поэтому читаем его без _read_ids
+        with open(file, mode="r") as f:
+            chat_id = f.read().strip()
+        _chat_id = int(chat_id) if chat_id else 0
+
+
+def load_ranks() -> None:
+    """
+    Загружает все файлы рангов в кэш. Вызывается при старте приложения.
+    """
+    for file in (ADMIN_FILE, MODERS_FILE, SUBADMINS_FILE, CHAT_FILE):
+        _load_rank_file(file)
+
+
+def reload_changed_ranks() -> None:
+    """
+    Перечитывает файлы рангов, которые изменились на диске
+    с момента последней загрузки (например, при ручном редактировании).
+    """
+    for file, mtime in list(_mtimes.items()):
+        try:
+            if path.getmtime(file) != mtime:
+                _load_rank_file(file)
+        except (OSError, ValueError) as e:
+            print(e)
+            print("Не удалось перечитать файл рангов", file)
+
+
+def _update_ids_locked(file: str, id: int, add: bool) -> Tuple[Set[int], bool]:
+    """
+    Добавляет id в файл ранга или удаляет его оттуда. Файл перечитывается
+    под межпроцессной блокировкой, поэтому одновременные изменения из
+    разных процессов не затирают друг друга.
+
+    :return: Множество id из файла после изменения и флаг, изменился ли файл.
+    """
+    with open(file, mode="r+") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)  # Снимается при закрытии файла
+        ids = {int(line) for line in (line.strip() for line in f) if line.isdigit()}
+        if (id in ids) == add:
+            return ids, False
+        ids = ids | {id} if add else ids - {id}
+        f.seek(0)
+        f.truncate()
+        f.write("".join(f"{id}\n" for id in sorted(ids)))
+    return ids, True
+
+
+async def _update_ids(file: str, id: int, add: bool) -> Tuple[Set[int], bool]:
+    """
+    Изменяет файл ранга (см. _update_ids_locked) и обновляет запомненное
+    время изменения, чтобы наблюдатель не перечитывал собственную запись.
+    """
+    async with _write_lock:
+        ids, changed = await asyncio.to_thread(_update_ids_locked, file, id, add)
+        _mtimes[file] = path.getmtime(file)
+    if changed:
+        await notify("ranks")
+    return ids, changed
+
+
+async def _reload_ranks() -> None:
+    # Другой процесс изменил файлы рангов
+    load_ranks()
+
+
+on_change("ranks", _reload_ranks)
+
+
+async def _watch_rank_files() -> None:
+    while True:
+        await asyncio.sleep(RANKS_WATCH_INTERVAL)
+        reload_changed_ranks()
+
+
+async def start_ranks_watcher() -> None:
+    """
+    Запускает фоновую проверку изменений файлов рангов.
+    Вызывается при старте диспетчера.
+    """
+    global _watcher
+    if _watcher is None or _watcher.done():
+        _watcher = asyncio.create_task(_watch_rank_files())
+
+
+async def stop_ranks_watcher() -> None:
+    """
+    Останавливает фоновую проверку изменений файлов рангов.
+    """
+    global _watcher
+    if _watcher is not None:
+        _watcher.cancel()
+        await asyncio.gather(_watcher, return_exceptions=True)
+        _watcher = None
+
+
+def get_role(chat_type: str, chat_id: int, user_id: int) -> Optional[str]:
+    """
+    Определяет роль отправителя обновления по кэшу рангов.
+
+    :param chat_type: Тип чата, из которого пришло обновление.
+    :param chat_id: ID чата.
+    :param user_id: ID отправителя.
+    :return: Одна из ролей ROLE_*; None, если обновление пришло из чужой группы
+        или канала.
+
+    Внутренний процесс:
+    1. В личном чате возвращаем старшую роль пользователя:
+       администратор, субадминистратор, модератор или обычный пользователь.
+    2. В группе возвращаем ROLE_CHAT, если это чат поддержки.
+    """
+    if chat_type == "private":
+        if user_id == _admin:
+            return ROLE_ADMIN
+        if user_id in _subadmins:
+            return ROLE_SUBADMIN
+        if user_id in _moders:
+            return ROLE_MODER
+        return ROLE_USER
+    if chat_type in ("group", "supergroup") and chat_id == _chat_id:
+        return ROLE_CHAT
+    return None
 
 
 def init_rank_files(admin) -> None:
@@ -12,91 +189,69 @@ def init_rank_files(admin) -> None:
     Инициализирует файлы рангов, если они не существуют.
 
     :return: None
-    Инициализирует файлы рангов, если они не существуют.
+    Инициализирует файлы рангов, если они не существуют, и загружает их в кэш.
     --admin <ID> - ID администратора, который будет добавлен в файл admin.txt.
     Если параметр --admin не указан, то файл admin.txt будет создан,
     но ничего в него не будет записано.
     """
     if admin:
-        with open("app/data/admin.txt", mode="w") as f:
+        with open(ADMIN_FILE, mode="w") as f:
             f.write(str(admin))
     else:
-        with open("app/data/admin.txt", mode="a") as f:
+        with open(ADMIN_FILE, mode="a") as f:
             pass
-    with open("app/data/moders.txt", mode="a") as f:
+    with open(MODERS_FILE, mode="a") as f:
         pass
-    with open("app/data/chat.txt", mode="a") as f:
+    with open(CHAT_FILE, mode="a") as f:
         pass
-    with open("app/data/subadmins.txt", mode="a") as f:
+    with open(SUBADMINS_FILE, mode="a") as f:
         pass
 
+    load_ranks()
+
 
 async def get_moders() -> List[str]:
     """
-    Эта функция получает список модераторов из текстового файла.
-
-    Она открывает файл 'moders.txt' в асинхронном режиме чтения, читает все строки
-    и возвращает их в виде списка кортежей, где каждый кортеж содержит ID и имя модератора.
+    Эта функция получает список модераторов из кэша рангов.
 
     :return: Список id модераторов (str).
-
-    Внутренний процесс:
-    1. Открываем файл 'moders.txt' в режиме чтения через aiofiles.
-    2. Читаем все строки из файла.
-    3. Возвращаем список id модераторов.
     """
-    try:
-        async with aiofiles.open("app/data/moders.txt", mode="r") as f:
-            return (id.strip() for id in await f.readlines())
-    except Exception as e:
-        print(e)
-        return []
+    return [str(id) for id in sorted(_moders)]
 
 
 async def get_full_moders() -> List[Tuple[str, str]]:
     """
-    Эта функция получает список модераторов из текстового файла.
-
-    Она открывает файл 'moders.txt' в асинхронном режиме чтения, читает все строки
-    и возвращает их в виде списка кортежей, где каждый кортеж содержит ID и имя модератора.
+    Эта функция получает список модераторов вместе с их никнеймами.
 
     :return: Список кортежей, где каждый кортеж состоит из ID и имени модератора (str, str).
 
     Внутренний процесс:
     1. Получаем список модераторов через функцию get_moders.
-    2. Получаем имена модераторов через функцию get_usernames_by_ids.
-    3. Возвращаем список кортежей, где каждый кортеж состоит из ID и имени модератора.
+    2. Получаем имена модераторов через функцию resolve_usernames.
+    3. Возвращаем список кортежей, где каждый кортеж состоит из ID и имени модератора;
+       если имя получить не удалось, вместо него пустая строка.
     """
     ids = await get_moders()
-    usernames = await get_usernames_by_ids(ids)
-    return list(zip(ids, usernames))
+    usernames = await resolve_usernames(ids)
+    return [(id, usernames.get(int(id)) or "") for id in ids]
 
 
 async def get_moder_username(id: int | str) -> str:
     """
-    Эта функция получает информацию о модераторе из текстового файла.
-
-    Она открывает файл 'moders.txt' в асинхронном режиме чтения, читает все строки,
-    находит строку, содержащую переданный ID, преобразует ее в кортеж (ID, имя)
-    и возвращает его.
+    Эта функция получает никнейм модератора по его ID.
 
     :param id: ID модератора, который будет найден.
-    :return: Кортеж, содержащий ID и имя модератора (str, str).
+    :return: Никнейм модератора или пустая строка.
 
     Внутренний процесс:
-    1. Открываем файл 'moders.txt' в режиме чтения через aiofiles.
-    2. Читаем все строки из файла.
-    3. Ищем строку, содержащую переданный ID, и преобразуем ее в кортеж.
-    4. Если модератор не найден, возвращаем пустой кортеж.
+    1. Проверяем по кэшу рангов, что пользователь является модератором.
+    2. Получаем никнейм через функцию resolve_usernames.
+    3. Если модератор не найден, возвращаем пустую строку.
     """
-    async with aiofiles.open("app/data/moders.txt", mode="r") as f:
-        ids = await f.readlines()
-        if str(id) in ids:
-            usernames = await get_usernames_by_ids([str(id)])
-            if usernames:
-                return usernames[0]
-            else:
-                return ""
+    if int(id) not in _moders:
+        return ""
+    usernames = await resolve_usernames([id])
+    return usernames.get(int(id)) or ""
 
 
 async def reset_chat() -> bool:
@@ -108,12 +263,18 @@ async def reset_chat() -> bool:
     Внутренний процесс:
     1. Открываем файл 'chat.txt' в режиме записи, чтобы очистить его содержимое.
     2. Записываем пустую строку в файл, чтобы удалить все данные.
-    3. Если операция проходит успешно, возвращаем True.
-    4. Если возникает ошибка, возвращаем False.
+    3. Сбрасываем ID чата в кэше рангов.
+    4. Если операция проходит успешно, возвращаем True.
+    5. Если возникает ошибка, возвращаем False.
     """
+    global _chat_id
     try:
-        async with aiofiles.open("app/data/chat.txt", mode="w") as f:
-            await f.write("")
+        async with _write_lock:
+            async with aiofiles.open(CHAT_FILE, mode="w") as f:
+                await f.write("")
+            _mtimes[CHAT_FILE] = path.getmtime(CHAT_FILE)
+            _chat_id = 0
+        await notify("ranks")
         return True
     except Exception:
         return False
@@ -121,22 +282,11 @@ async def reset_chat() -> bool:
 
 async def get_chat_id() -> int:
     """
-    Эта функция получает ID чата из текстового файла.
-
-    Она открывает файл 'chat.txt' в асинхронном режиме чтения, читает строку,
-    преобразует ее в целое число и возвращает его.
+    Эта функция получает ID чата из кэша рангов.
 
-    :return: ID чата (int).
-
-    Внутренний процесс:
-    1. Открываем файл 'chat.txt' в режиме чтения через aiofiles.
-    2. Читаем строку из файла.
-    3. Преобразуем строку в целое число.
-    4. Если файл пуст, возвращаем 0.
+    :return: ID чата (int) или 0, если чат не инициализирован.
     """
-    async with aiofiles.open("app/data/chat.txt", mode="r") as f:
-        chat_id = await f.read()
-        return int(chat_id) if chat_id else 0
+    return _chat_id
 
 
 async def set_chat_id(chat_id: int) -> None:
@@ -150,9 +300,15 @@ async def set_chat_id(chat_id: int) -> None:
     Внутренний процесс:
     1. Открываем файл 'chat.txt' в режиме записи.
     2. Записываем ID чата в файл.
+    3. Обновляем ID чата в кэше рангов.
     """
-    async with aiofiles.open("app/data/chat.txt", mode="w") as f:
-        await f.write(str(chat_id))
+    global _chat_id
+    async with _write_lock:
+        async with aiofiles.open(CHAT_FILE, mode="w") as f:
+            await f.write(str(chat_id))
+        _mtimes[CHAT_FILE] = path.getmtime(CHAT_FILE)
+        _chat_id = int(chat_id)
+    await notify("ranks")
 
 
 async def is_moder(user_id: int) -> bool:
@@ -163,13 +319,10 @@ async def is_moder(user_id: int) -> bool:
     :return: Возвращает True, если пользователь является модератором, иначе False.
 
     Внутренний процесс:
-    1. Получаем список модераторов с помощью функции get_moders().
-    2. Преобразуем каждый ID модератора в целое число.
-    3. Проверяем, содержится ли переданный ID пользователя в списке ID модераторов.
-    4. Если ID пользователя найден, возвращаем True; в противном случае — False.
+    1. Проверяем, содержится ли переданный ID пользователя в кэше модераторов.
+    2. Если ID пользователя найден, возвращаем True; в противном случае — False.
     """
-    moders = await get_moders()
-    return user_id in moders
+    return int(user_id) in _moders
 
 
 async def is_admin(user_id: int) -> bool:
@@ -182,12 +335,11 @@ async def is_admin(user_id: int) -> bool:
     :return: Возвращает True, если пользователь является администратором, иначе False.
 
     Внутренний процесс:
-    1. Получаем ID администратора с помощью функции get_admin().
+    1. Берем ID администратора из кэша рангов.
     2. Сравниваем ID пользователя с ID администратора.
     3. Если они совпадают, возвращаем True; в противном случае — False.
     """
-    admin = await get_admin()
-    return user_id == admin
+    return int(user_id) == _admin
 
 
 async def get_chat_link(bot: Bot) -> str:
@@ -227,31 +379,27 @@ async def add_moder(username: str) -> int:
     """
     Функция для добавления модератора в список.
 
-    Она принимает ID и имя пользователя модератора, проверяет, существует ли
+    Она принимает имя пользователя модератора, проверяет, существует ли
     он уже в списке модераторов, и добавляет его, если не существует.
 
-    :param id: ID пользователя, который будет добавлен в список модераторов.
     :param username: Имя пользователя, который будет добавлен в список модераторов.
-    :return: Возвращает True, если модератор был успешно добавлен, иначе False.
+    :return: Возвращает 1, если модератор был успешно добавлен, иначе -1 или -2.
 
     Внутренний процесс:
-    1. Открываем файл 'moders.txt' в режиме добавления и чтения.
-    2. Читаем текущий список модераторов из файла.
-    3. Получаем ID пользователя по его никнейму.
-    4. Проверяем, есть ли ID пользователя в списке модераторов.
-    5. Если ID пользователя нет в списке модераторов, добавляем его и возвращаем 1.
-    6. Если ID пользователя уже есть в списке модераторов, возвращаем -1.
-    7. Если возникает ошибка, возвращаем -2.
-    """
+    1. Получаем ID пользователя по его никнейму.
+    2. Под блокировкой файла перечитываем его и проверяем, есть ли в нем ID пользователя.
+    3. Если ID пользователя нет в списке модераторов, добавляем его в файл
+       'moders.txt' и в кэш и возвращаем 1.
+    4. Если ID пользователя уже есть в списке модераторов, возвращаем -1.
+    5. Если возникает ошибка, возвращаем -2.
+    """
+    global _moders
     try:
-        async with aiofiles.open("app/data/moders.txt", mode="a+") as f:
-            moders = await f.readlines()
-            id = await get_id_by_username(username)
-            if str(id) in moders:
-                return -1
-            else:
-                await f.write(f"{id}\n")
-                return 1
+        id = await get_id_by_username(username)
+        if id is None:
+            return -2
+        _moders, changed = await _update_ids(MODERS_FILE, int(id), add=True)
+        return 1 if changed else -1
     except Exception as e:
         print(e)
         print("Не удалось добавить модератора")
@@ -269,28 +417,23 @@ async def del_moder(id_or_username: str) -> bool:
     :return: Возвращает True, если модератор был успешно удален, иначе False.
 
     Внутренний процесс:
-    1. Открываем файл 'moders.txt' в режиме записи.
-    2. Читаем текущий список модераторов из файла.
-    3. Получаем ID пользователя по его никнейму.
-    4. Проверяем, есть ли ID пользователя в списке модераторов.
-    5. Если ID пользователя есть в списке модераторов, удаляем его и возвращаем 1.
-    6. Если ID пользователя нет в списке модераторов, возвращаем -1.
-    7. Если возникает ошибка, возвращаем -2.
-    """
+    1. Получаем ID пользователя по его никнейму, если выдан никнейм.
+    2. Под блокировкой файла перечитываем его и проверяем, есть ли в нем ID пользователя.
+    3. Если ID пользователя есть в списке модераторов, удаляем его из файла
+       'moders.txt' и из кэша и возвращаем 1.
+    4. Если ID пользователя нет в списке модераторов, возвращаем -1.
+    5. Если возникает ошибка, возвращаем -2.
+    """
+    global _moders
     try:
-        async with aiofiles.open("app/data/moders.txt", mode="r+") as f:
-            if id_or_username.isdigit():
-                id = id_or_username
-            else:
-                id = await get_id_by_username(id_or_username)
-            ids = [id.strip() for id in await f.readlines()]
-            if str(id) in ids:
-                await f.seek(0)
-                await f.truncate()
-                await f.write("\n".join([_id for _id in ids if str(_id) != str(id)]))
-                return 1
-            else:
-                return -1
+        if id_or_username.isdigit():
+            id = id_or_username
+        else:
+            id = await get_id_by_username(id_or_username)
+        if id is None:
+            return -1
+        _moders, changed = await _update_ids(MODERS_FILE, int(id), add=False)
+        return 1 if changed else -1
     except:
         return -2
 
@@ -299,38 +442,24 @@ async def get_admin() -> int:
     """
     Функция для получения ID администратора.
 
-    Она ничего не принимает и возвращает ID администратора.
+    Она ничего не принимает и возвращает ID администратора из кэша рангов.
     Если администратор не существует, возвращает 0.
 
     :return: ID администратора.
-
-    Внутренний процесс:
-    1. Открываем файл 'admin.txt' в режиме чтения.
-    2. Читаем ID администратора из файла.
-    3. Если ID существует, преобразуем его в целое число и возвращаем.
-    4. Если ID не существует, возвращаем 0.
     """
-
-    async with aiofiles.open("app/data/admin.txt", mode="r") as f:
-        admin = await f.read()
-        return int(admin) if admin else 0
+    return _admin
 
 
 async def get_subadmins() -> list:
     """
     Функция для получения списка ID субадминистраторов.
 
-    Она ничего не принимает и возвращает список ID субадминистраторов.
-
-    :return: Список ID субадминистраторов.
+    Она ничего не принимает и возвращает список ID субадминистраторов
+    из кэша рангов.
 
-    Внутренний процесс:
-    1. Открываем файл 'subadmins.txt' в режиме чтения.
-    2. Читаем список ID субадминистраторов из файла.
-    3. Возвращаем список ID субадминистраторов.
+    :return: Список ID субадминистраторов (str).
     """
-    async with aiofiles.open("app/data/subadmins.txt", mode="r") as f:
-        return [id.strip() for id in await f.readlines()]
+    return [str(id) for id in sorted(_subadmins)]
 
 
 async def get_full_subadmins() -> list:
@@ -343,12 +472,13 @@ async def get_full_subadmins() -> list:
 
     Внутренний процесс:
     1. Получаем список ID субадминистраторов с помощью функции get_subadmins().
-    2. Получаем список имён субадминистраторов с помощью функции get_usernames_by_ids().
-    3. Возвращаем список кортежей ID и имени субадминистраторов.
+    2. Получаем имена субадминистраторов с помощью функции resolve_usernames().
+    3. Возвращаем список кортежей ID и имени субадминистраторов;
+       если имя получить не удалось, вместо него пустая строка.
     """
     ids = await get_subadmins()
-    usernames = await get_usernames_by_ids(ids)
-    return list(zip(ids, usernames))
+    usernames = await resolve_usernames(ids)
+    return [(id, usernames.get(int(id)) or "") for id in ids]
 
 
 async def del_subadmin(id_or_username: str) -> int:
@@ -361,28 +491,23 @@ async def del_subadmin(id_or_username: str) -> int:
     :return: Возвращает 1, если субадминистратор был успешно удален, иначе -1 или -2.
 
     Внутренний процесс:
-    1. Открываем файл 'subadmins.txt' в режиме добавления и чтения.
-    2. Читаем текущий список субадминистраторов из файла.
-    3. Получаем ID пользователя по его никнейму, если выдан никнейм.
-    4. Проверяем, есть ли ID пользователя в списке субадминистраторов.
-    5. Если ID пользователя есть в списке субадминистраторов, удаляем его и возвращаем 1.
-    6. Если ID пользователя нет в списке субадминистраторов, возвращаем -1.
-    7. Если возникает ошибка, возвращаем -2.
-    """
+    1. Получаем ID пользователя по его никнейму, если выдан никнейм.
+    2. Под блокировкой файла перечитываем его и проверяем, есть ли в нем ID пользователя.
+    3. Если ID пользователя есть в списке субадминистраторов, удаляем его из файла
+       'subadmins.txt' и из кэша и возвращаем 1.
+    4. Если ID пользователя нет в списке субадминистраторов, возвращаем -1.
+    5. Если возникает ошибка, возвращаем -2.
+    """
+    global _subadmins
     try:
-        async with aiofiles.open("app/data/subadmins.txt", mode="r+") as f:
-            if id_or_username.isdigit():
-                id = id_or_username
-            else:
-                id = await get_id_by_username(id_or_username)
-            ids = [id.strip() for id in await f.readlines()]
-            if str(id) in ids:
-                await f.seek(0)
-                await f.truncate()
-                await f.write("\n".join([_id for _id in ids if str(_id) != str(id)]))
-                return 1
-            else:
-                return -1
+        if id_or_username.isdigit():
+            id = id_or_username
+        else:
+            id = await get_id_by_username(id_or_username)
+        if id is None:
+            return -1
+        _subadmins, changed = await _update_ids(SUBADMINS_FILE, int(id), add=False)
+        return 1 if changed else -1
     except:
         return -2
 
@@ -391,29 +516,26 @@ async def add_subadmin(username: str) -> int:
     """
     Функция для добавления субадминистратора в список субадминистраторов.
 
-    Она принимает ID и имя пользователя субадминистратора, который будет добавлен.
+    Она принимает имя пользователя субадминистратора, который будет добавлен.
 
     :param username: Имя пользователя субадминистратора.
     :return: Возвращает 1, если субадминистратор был успешно добавлен, иначе -1 или -2.
 
     Внутренний процесс:
-    1. Открываем файл 'subadmins.txt' в режиме добавления и чтения.
-    2. Читаем текущий список субадминистраторов из файла.
-    3. Получаем ID пользователя по его никнейму.
-    4. Проверяем, есть ли ID пользователя в списке субадминистраторов.
-    5. Если ID пользователя нет в списке субадминистраторов, добавляем его и возвращаем 1.
-    6. Если ID пользователя уже есть в списке субадминистраторов, возвращаем -1.
-    7. Если возникает ошибка, возвращаем -2.
-    """
+    1. Получаем ID пользователя по его никнейму.
+    2. Под блокировкой файла перечитываем его и проверяем, есть ли в нем ID пользователя.
+    3. Если ID пользователя нет в списке субадминистраторов, добавляем его в файл
+       'subadmins.txt' и в кэш и возвращаем 1.
+    4. Если ID пользователя уже есть в списке субадминистраторов, возвращаем -1.
+    5. Если возникает ошибка, возвращаем -2.
+    """
+    global _subadmins
     try:
-        async with aiofiles.open("app/data/subadmins.txt", mode="a+") as f:
-            moders = await f.readlines()
-            id = await get_id_by_username(username)
-            if str(id) in moders:
-                return -1
-            else:
-                await f.write(f"{id}\n")
-                return 1
+        id = await get_id_by_username(username)
+        if id is None:
+            return -2
+        _subadmins, changed = await _update_ids(SUBADMINS_FILE, int(id), add=True)
+        return 1 if changed else -1
     except Exception as e:
         print(e)
         print("Не удалось добавить модератора")
@@ -430,23 +552,17 @@ async def is_subadmin(id: str) -> bool:
     :return: Возвращает True, если пользователь является субадминистратором, иначе False.
 
     Внутренний процесс:
-    1. Получаем список ID субадминистраторов с помощью функции get_subadmins().
-    2. Проверяем, есть ли переданный ID в списке субадминистраторов.
-    3. Если ID пользователя есть в списке субадминистраторов, возвращаем True; в противном случае — False.
+    1. Проверяем, есть ли переданный ID в кэше субадминистраторов.
+    2. Если ID пользователя есть в списке субадминистраторов, возвращаем True; в противном случае — False.
     """
-    ids = await get_subadmins()
-    return str(id) in ids
+    return int(id) in _subadmins
 
 
 async def get_subadmin_username(id: str) -> str:
-    async with aiofiles.open("app/data/subadmins.txt", mode="r") as f:
-        ids = await f.readlines()
-        if str(id) in ids:
-            usernames = await get_usernames_by_ids([str(id)])
-            if usernames:
-                return usernames[0]
-            else:
-                return ""
+    if int(id) not in _subadmins:
+        return ""
+    usernames = await resolve_usernames([id])
+    return usernames.get(int(id)) or ""
 
 
 async def is_able_to_answer(user_id: int) -> bool:
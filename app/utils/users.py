@@ -0,0 +1,78 @@
+import asyncio
+from os import environ
+from typing import Dict, Optional
+
+from app.database.actions import save_users
+
+
+# Через сколько миллисекунд после первой регистрации буфер сохраняется в БД
+USERS_FLUSH_INTERVAL = int(environ.get("USERS_FLUSH_INTERVAL", 500))
+# При скольких пользователях в буфере он сохраняется, не дожидаясь интервала
+USERS_FLUSH_SIZE = int(environ.get("USERS_FLUSH_SIZE", 500))
+
+# id пользователя -> никнейм. Повторный /start того же пользователя
+# до сохранения только обновляет никнейм в буфере
+_pending: Dict[int, Optional[str]] = {}
+_flusher: Optional[asyncio.Task] = None
+_flush_lock = asyncio.Lock()
+
+
+async def register_user(id: int, username: Optional[str]) -> None:
+    """
+    Ставит пользователя в очередь на сохранение в БД.
+
+    Пользователи сохраняются пачками: через USERS_FLUSH_INTERVAL мс после
+    первой регистрации в пачке или сразу, когда в ней USERS_FLUSH_SIZE
+    пользователей. Поток /start после рекламного поста стоит несколько
+    запросов к БД, а не по одному на пользователя.
+
+    :param id: ID пользователя.
+    :param username: Никнейм пользователя.
+    """
+    global _flusher
+    _pending[int(id)] = username
+    if len(_pending) >= USERS_FLUSH_SIZE:
+        await flush_users()
+    elif _flusher is None or _flusher.done():
+        _flusher = asyncio.create_task(_flush_later())
+
+
+async def _flush_later() -> None:
+    global _flusher
+    await asyncio.sleep(USERS_FLUSH_INTERVAL / 1000)
+    _flusher = None
+    await flush_users()
+
+
+async def flush_users() -> None:
+    """
+    Сохраняет накопленных пользователей одним запросом на пачку.
+    Если сохранить не удалось, пользователи возвращаются в буфер
+    и сохранение повторяется позже. Вызывается также при остановке бота.
+    """
+    global _flusher
+    async with _flush_lock:
+        while _pending:
+            batch = dict(list(_pending.items())[:USERS_FLUSH_SIZE])
+            for id in batch:
+                del _pending[id]
+            if await save_users(list(batch.items())):
+                continue
+            # Более свежие никнеймы, пришедшие во время записи, важнее
+            for id, username in batch.items():
+                _pending.setdefault(id, username)
+            if _flusher is None or _flusher.done():
+                _flusher = asyncio.create_task(_flush_later())
+            return
+
+
+async def stop_users_flusher() -> None:
+    """
+    Останавливает отложенное сохранение и сохраняет буфер.
+    """
+    global _flusher
+    if _flusher is not None and not _flusher.done():
+        _flusher.cancel()
+        await asyncio.gather(_flusher, return_exceptions=True)
+    _flusher = None
+    await flush_users()
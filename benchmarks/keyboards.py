@@ -0,0 +1,39 @@
+"""
+Микробенчмарк клавиатур: сравнивает построение клавиатуры заново
+(исходная функция, __wrapped__) с получением ее из кэша.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.keyboards
+"""
+
+from timeit import timeit
+
+from app.keyboards.admin import get_admin_kb, get_quiz_kb
+from app.keyboards.moder import get_question_kb
+from app.keyboards.user import get_back_kb, get_confirm_mailing_kb, get_user_kb
+
+
+NUMBER = 10000  # Вызовов на каждый замер
+
+CASES = [
+    ("get_user_kb()", get_user_kb, ()),
+    ("get_back_kb()", get_back_kb, ()),
+    ("get_question_kb()", get_question_kb, ()),
+    ("get_admin_kb(False)", get_admin_kb, (False,)),
+    ("get_quiz_kb(7)", get_quiz_kb, (7,)),
+    ("get_confirm_mailing_kb(42)", get_confirm_mailing_kb, (42,)),
+]
+
+
+def main() -> None:
+    print(f"{'клавиатура':<30}{'без кэша, мкс':>16}{'с кэшем, мкс':>16}{'ускорение':>12}")
+    for name, keyboard, args in CASES:
+        build = keyboard.__wrapped__
+        built = timeit(lambda: build(*args), number=NUMBER) / NUMBER * 1e6
+        cached = timeit(lambda: keyboard(*args), number=NUMBER) / NUMBER * 1e6
+        print(f"{name:<30}{built:>16.2f}{cached:>16.3f}{built / cached:>11.0f}x")
+
+
+if __name__ == "__main__":
+    main()
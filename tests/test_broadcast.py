@@ -0,0 +1,65 @@
+import asyncio
+import random
+
+import pytest
+
+from app.utils import broadcast
+from app.utils.broadcast import Broadcast, TokenBucket
+
+
+class FakeBot:
+    """Бот, который "отправляет" сообщения со случайной задержкой."""
+
+    def __init__(self) -> None:
+        self.sent = set()
+
+    async def send_message(self, chat_id, text, reply_markup=None) -> None:
+        await asyncio.sleep(random.uniform(0, 0.02))
+        self.sent.add(chat_id)
+
+
+@pytest.fixture(autouse=True)
+def fast_limiter(monkeypatch):
+    monkeypatch.setattr(broadcast, "limiter", TokenBucket(100000))
+
+
+def test_cancelled_run_does_not_skip_unsent_ids():
+    bot = FakeBot()
+    mailing = Broadcast(bot, "text", workers=16)
+
+    async def main() -> None:
+        task = asyncio.create_task(mailing.run(range(1, 10001)))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+
+    assert 0 < mailing.cursor < 10000
+    assert all(id in bot.sent for id in range(1, mailing.cursor + 1))
+
+
+def test_source_error_does_not_skip_unsent_ids():
+    bot = FakeBot()
+    mailing = Broadcast(bot, "text", workers=16)
+
+    async def recipients():
+        for id in range(1, 201):
+            yield id
+        raise RuntimeError("БД недоступна")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(mailing.run(recipients()))
+
+    assert all(id in bot.sent for id in range(1, mailing.cursor + 1))
+
+
+def test_finished_run_moves_cursor_to_last_id():
+    bot = FakeBot()
+    mailing = Broadcast(bot, "text", workers=4)
+
+    asyncio.run(mailing.run(range(1, 51)))
+
+    assert mailing.cursor == 50
+    assert mailing.sent == 50
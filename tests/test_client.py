@@ -0,0 +1,88 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.utils import client
+
+
+class FakeClient:
+    def __init__(self):
+        self.calls = []
+
+    async def get_users(self, ids):
+        self.calls.append(list(ids))
+        await asyncio.sleep(0.01)
+        return [SimpleNamespace(id=id, username=f"user{id}") for id in ids]
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    fake = FakeClient()
+
+    async def with_client(call):
+        return await call(fake)
+
+    monkeypatch.setattr(client, "_with_client", with_client)
+    client._usernames.clear()
+    client._ids.clear()
+    client._pending_usernames.clear()
+    client.cache_stats.update(hits=0, misses=0)
+    return fake
+
+
+def test_concurrent_lookups_share_one_request(fake_client):
+    async def run():
+        return await asyncio.gather(
+            *(client.resolve_usernames([5]) for _ in range(5))
+        )
+
+    results = asyncio.run(run())
+
+    assert results == [{5: "user5"}] * 5
+    assert fake_client.calls == [[5]]
+    assert client.cache_stats["misses"] == 1
+    assert not client._pending_usernames
+
+
+def test_invalid_id_splits_chunk(fake_client, monkeypatch):
+    async def get_users(ids):
+        fake_client.calls.append(list(ids))
+        if 3 in ids:
+            raise client.PeerIdInvalid()
+        return [SimpleNamespace(id=id, username=f"user{id}") for id in ids]
+
+    monkeypatch.setattr(fake_client, "get_users", get_users)
+
+    result = asyncio.run(client.resolve_usernames([1, 2, 3, 4]))
+
+    assert result == {1: "user1", 2: "user2", 4: "user4"}
+
+
+def test_connection_error_does_not_split_chunk(fake_client, monkeypatch):
+    async def get_users(ids):
+        fake_client.calls.append(list(ids))
+        raise ConnectionError()
+
+    monkeypatch.setattr(fake_client, "get_users", get_users)
+
+    result = asyncio.run(client.resolve_usernames([1, 2, 3, 4]))
+
+    assert result == {}
+    assert fake_client.calls == [[1, 2, 3, 4]]
+    assert not client._pending_usernames
+
+
+def test_flood_wait_retries_whole_chunk(fake_client, monkeypatch):
+    async def get_users(ids):
+        fake_client.calls.append(list(ids))
+        if len(fake_client.calls) == 1:
+            raise client.FloodWait(value=0)
+        return [SimpleNamespace(id=id, username=f"user{id}") for id in ids]
+
+    monkeypatch.setattr(fake_client, "get_users", get_users)
+
+    result = asyncio.run(client.resolve_usernames([1, 2]))
+
+    assert result == {1: "user1", 2: "user2"}
+    assert fake_client.calls == [[1, 2], [1, 2]]
@@ -0,0 +1,30 @@
+import pytest
+from aiogram.types import InlineKeyboardMarkup
+from pydantic import ValidationError
+
+from app.keyboards.admin import get_quiz_kb
+from app.keyboards.user import get_user_kb
+
+
+@pytest.mark.parametrize("keyboard", [get_user_kb, lambda: get_quiz_kb(7)])
+def test_shared_keyboard_cannot_be_changed(keyboard):
+    markup = keyboard()
+
+    with pytest.raises(TypeError):
+        markup.inline_keyboard.append([])
+    with pytest.raises(TypeError):
+        markup.inline_keyboard[0].pop()
+    with pytest.raises(ValidationError):
+        markup.inline_keyboard = []
+    with pytest.raises(ValidationError):
+        markup.inline_keyboard[0][0].text = "changed"
+    assert keyboard() is markup
+
+
+def test_shared_keyboard_equals_built_one():
+    built = get_quiz_kb.__wrapped__(7)
+
+    assert get_quiz_kb(7) == built
+    assert built == get_quiz_kb(7)
+    assert InlineKeyboardMarkup.model_validate(built.model_dump()) == get_quiz_kb(7)
+    assert get_quiz_kb(8) != built
@@ -0,0 +1,25 @@
+from multiprocessing import Pool
+
+from app.utils import ranks
+
+
+def test_concurrent_updates_from_processes_are_not_lost(tmp_path):
+    file = tmp_path / "moders.txt"
+    file.write_text("")
+
+    with Pool(8) as pool:
+        pool.starmap(
+            ranks._update_ids_locked, [(str(file), id, True) for id in range(200)]
+        )
+
+    assert ranks._read_ids(str(file)) == set(range(200))
+
+
+def test_update_reports_unchanged_file(tmp_path):
+    file = tmp_path / "moders.txt"
+    file.write_text("1\n2\n")
+
+    assert ranks._update_ids_locked(str(file), 2, True) == ({1, 2}, False)
+    assert ranks._update_ids_locked(str(file), 3, False) == ({1, 2}, False)
+    assert ranks._update_ids_locked(str(file), 1, False) == ({2}, True)
+    assert file.read_text() == "2\n"